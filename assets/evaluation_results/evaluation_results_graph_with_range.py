@@ -1,27 +1,25 @@
-import json
-
 import matplotlib.pyplot as plt
+import numpy as np
 
-file = open("performance_results_of_rl_rrt_prm.json", "r+")
-results_raw = json.loads(file.read())
+from roborl_navigator.utils import (
+    read_results,
+    results_to_arrays,
+)
 
-plt.figure(figsize=(10, 6))
+# .jsonl results store of evaluation_all_methods.py, legacy .json results are converted while reading
+path = "performance_results_of_rl_rrt_prm.json"
 
-results = []
-for ep, res in results_raw.items():
-    if 'rrt' in res:
-        results.append(res)
-episodes = list(range(1, len(results) + 1))
+plt.figure(figsize=(10, 6))
 
-for planner in ['rrt']:
-    min_times = [episode[planner]['min'] for episode in results]
-    max_times = [max(episode[planner]['all'] or [1000]) for episode in results]
-    mean_times = [episode[planner]['mean'] for episode in results]
+rrt = results_to_arrays(read_results(path, 'rrt'), ["min", "max", "mean"])
+rl = results_to_arrays(read_results(path, 'rl'), ["total"])
+rl_total = rl["total"][np.isin(rl["episode"], rrt["episode"])]  # episodes with a planner result
+episodes = list(range(1, len(rrt["episode"]) + 1))
 
-    plt.plot(episodes, mean_times, label=f'RRTConnect Mean', marker='o')
-    plt.fill_between(episodes, min_times, max_times, alpha=0.2, label='RRTConnect Range (min-max)')
+plt.plot(episodes, rrt["mean"], label=f'RRTConnect Mean', marker='o')
+plt.fill_between(episodes, rrt["min"], rrt["max"], alpha=0.2, label='RRTConnect Range (min-max)')
 
-plt.plot(episodes, [episode['rl']['total'] for episode in results], label=f'Reinforcement Learning', marker='^')
+plt.plot(episodes, rl_total, label=f'Reinforcement Learning', marker='^')
 
 
 plt.xlabel('Episode')
@@ -1,26 +1,29 @@
 import numpy as np
 import time
-from stable_baselines3 import (
-    HerReplayBuffer,
-    TD3,
-)
 
 from roborl_navigator.environment.env_panda_ros import PandaROSEnv
+from roborl_navigator.policy import (
+    load_policy,
+    process_uptime,
+)
 from roborl_navigator.robot.ros_panda_robot import ROSRobot
 from roborl_navigator.simulation.ros import ROSSim
+from roborl_navigator.utils import tracer
 
 from ros_controller import ROSController
 
+trace_path = "real_full_pipeline_trace.json"  # open in chrome://tracing or ui.perfetto.dev
+tracer.enable()
+
 env = PandaROSEnv(
     orientation_task=False,
     distance_threshold=0.025,
     demonstration=True,
     real_robot=True,
 )
-model = TD3.load(
-    '/home/franka/dev/RoboRL-Navigator/models/roborl-navigator/TD3_Bullet_0.05_Threshold_200K/model.zip',
-    env=env,
-    replay_buffer_class=HerReplayBuffer,
+# deterministic actor exported next to the model.zip, memory mapped and warmed
+model = load_policy(
+    '/home/franka/dev/RoboRL-Navigator/models/roborl-navigator/TD3_Bullet_0.05_Threshold_200K/model.zip'
 )
 sim = ROSSim(orientation_task=False)
 robot = ROSRobot(sim=sim, orientation_task=False, real_robot=False)
@@ -39,17 +42,15 @@ ros_controller.view_image()
 
 # Send Request to Contact Graspnet Server
 saved_file_path = ros_controller.request_graspnet_result(remote_ip=remote_ip)
-# Parse Responded File
-target_pose_by_camera = ros_controller.process_grasping_results(path=saved_file_path)
+# Parse Responded File, keep the best reachable grasp in Panda Base frame
+grasp_candidates = ros_controller.process_grasping_candidates(path=saved_file_path, k=10)
 
-if target_pose_by_camera is None:
+if grasp_candidates is None:
     print("Process killed, Pose is empty!")
+    tracer.save(trace_path)
     exit()
 
-# Transform Frame to Panda Base
-target_pose = ros_controller.transform_camera_to_world(target_pose_by_camera)
-# Convert Pose to Array
-target_pose_array = ros_controller.pose_to_array(target_pose)
+target_pose_array = grasp_candidates[0][0]
 
 print(f"Desired Goal: {target_pose_array[:3]}")
 
@@ -58,8 +59,12 @@ ros_controller.go_to_home_position()
 observation = env.reset(options={"goal": np.array(target_pose_array[:3]).astype(np.float32)})[0]
 
 for _ in range(10):
-    action = model.predict(observation)
-    observation, reward, terminated, truncated, info = env.step(np.array(action[0]).astype(np.float32))
+    with tracer.span("policy", "policy"):
+        action = model.predict(observation)
+    if _ == 0:
+        print(f"Time to first action: {process_uptime():.2f} s after process start")
+    with tracer.span("env.step", "env"):
+        observation, reward, terminated, truncated, info = env.step(np.array(action[0]).astype(np.float32))
     if terminated or info.get('is_success', False):
         print("Reached destination!")
         break
@@ -70,3 +75,5 @@ ros_controller.hand_grasp()
 ros_controller.go_to_release_position()
 time.sleep(1.5)
 ros_controller.hand_open()
+
+tracer.save(trace_path)
@@ -1,26 +1,29 @@
 import numpy as np
 import time
-from stable_baselines3 import (
-    HerReplayBuffer,
-    TD3,
-)
 
 from roborl_navigator.environment.env_panda_ros import PandaROSEnv
+from roborl_navigator.policy import (
+    load_policy,
+    process_uptime,
+)
 from roborl_navigator.robot.ros_panda_robot import ROSRobot
 from roborl_navigator.simulation.ros import ROSSim
+from roborl_navigator.utils import tracer
 
 from ros_controller import ROSController
 
+trace_path = "real_rl_pipeline_trace.json"  # open in chrome://tracing or ui.perfetto.dev
+tracer.enable()
+
 env = PandaROSEnv(
     orientation_task=False,
     distance_threshold=0.03,
     demonstration=True,
     real_robot=True,
 )
-model = TD3.load(
-    '/home/franka/dev/RoboRL-Navigator/models/roborl-navigator/TD3_Bullet_0.05_Threshold_200K/model.zip',
-    env=env,
-    replay_buffer_class=HerReplayBuffer,
+# deterministic actor exported next to the model.zip, memory mapped and warmed
+model = load_policy(
+    '/home/franka/dev/RoboRL-Navigator/models/roborl-navigator/TD3_Bullet_0.05_Threshold_200K/model.zip'
 )
 sim = ROSSim(orientation_task=False)
 robot = ROSRobot(sim=sim, orientation_task=False, real_robot=False)
@@ -38,8 +41,12 @@ ros_controller.go_to_home_position()
 observation = env.reset(options={"goal": np.array(target_pose_array[:3]).astype(np.float32)})[0]
 
 for _ in range(10):
-    action = model.predict(observation)
-    observation, reward, terminated, truncated, info = env.step(np.array(action[0]).astype(np.float32))
+    with tracer.span("policy", "policy"):
+        action = model.predict(observation)
+    if _ == 0:
+        print(f"Time to first action: {process_uptime():.2f} s after process start")
+    with tracer.span("env.step", "env"):
+        observation, reward, terminated, truncated, info = env.step(np.array(action[0]).astype(np.float32))
     if terminated or info.get('is_success', False):
         print("Reached destination!")
         break
@@ -50,3 +57,5 @@ ros_controller.hand_grasp()
 ros_controller.go_to_release_position()
 time.sleep(1.5)
 ros_controller.hand_open()
+
+tracer.save(trace_path)
@@ -1,8 +1,8 @@
-import math
 import os
 import time
 from typing import (
     Any,
+    Dict,
     List,
     Optional,
     Tuple,
@@ -27,12 +27,41 @@ from sensor_msgs.msg import (
     Image,
 )
 from tf import TransformListener
-from tf.transformations import quaternion_from_euler
+from tf.transformations import quaternion_matrix
+
+from roborl_navigator.robot.ik_planner import IKPlanner
+from roborl_navigator.robot.planner_portfolio import (
+    PLANNER_IDS,
+    PlannerPortfolio,
+)
+from roborl_navigator.task.reachability import ReachabilityIndex
+from roborl_navigator.utils import (
+    GraspResultCache,
+    crop_capture,
+    goal_range_bounds,
+    grasps_to_poses,
+    load_grasp_predictions,
+    poses_to_grasps,
+    select_grasp_candidates,
+    top_k_grasps,
+    traced,
+    tracer,
+    transform_grasps,
+    workspace_roi,
+)
 
 
 class ROSController:
 
-    def __init__(self, real_robot: bool = False):
+    def __init__(
+        self,
+        real_robot: bool = False,
+        goal_range: float = 0.3,
+        grasp_cache: bool = False,
+        capture_roi: bool = False,
+        capture_downsample: int = 1,
+        reachability_index: Optional[str] = None,
+    ):
         self.real_robot = real_robot
         self.robot_name = "fr3" if real_robot else "panda"
         rospy.init_node("panda_controller", anonymous=True)
@@ -53,29 +82,45 @@ class ROSController:
         self.camera_info = None
 
         self.latest_capture_path = None
+        self.latest_capture_key = None
+        self.camera_to_world = None  # 4x4 transform cached once per capture
         self.latest_grasp_result_path = None
         self.graspnet_url = "http://localhost:5000/run?path={path}"
+        self.goal_range_low, self.goal_range_high = goal_range_bounds(goal_range)
+        self.reachability_index = None
+        if reachability_index:
+            self.reachability_index = ReachabilityIndex.load(reachability_index, bullet_model=False)
+        self.capture_roi = capture_roi
+        self.capture_roi_margin = 0.1  # meters around the goal range, objects may stick out of it
+        self.capture_downsample = capture_downsample
+        self.grasp_cache = GraspResultCache(os.path.join(self.save_dir, 'grasp_cache')) if grasp_cache else None
 
         self.capture_joint_degrees = [0, -1.5, 0, -2.5, 0, 1.728, 0.7854]
         self.neutral_joint_values = [0.0, 0.4, 0.0, -1.78, 0.0, 2.24, 0.77]
         self.up_joints = [0.0, 0.0, 0.0, -1.78, 0.0, 2.24, 0.77]
         self.relase_joint_values = [1.39, 0.4, 0.0, -1.78, 0.0, 2.24, 0.77]
         self.set_model_state_proxy = rospy.ServiceProxy('/gazebo/set_model_state', SetModelState)
-        self.move_group.set_planning_time(1.9)
+        self.planning_time = 1.9
+        self.move_group.set_planning_time(self.planning_time)
+        self.ik_planner = IKPlanner(self.move_group)
+        self.planner_portfolio = None
         time.sleep(1)  # wait to fill buffer
 
     # GRIPPER OPERATIONS
 
+    @traced(category="moveit")
     def hand_open(self) -> None:
         # values -> {'panda_finger_joint1': 0.035, 'panda_finger_joint2': 0.035}
         self.hand_group.set_joint_value_target(self.hand_group.get_named_target_values("open"))
         self.hand_group.go(wait=True)
 
+    @traced(category="moveit")
     def hand_close(self) -> None:
         # values -> {'panda_finger_joint1': 0.0, 'panda_finger_joint2': 0.0}
         self.hand_group.set_joint_value_target(self.hand_group.get_named_target_values("close"))
         self.hand_group.go(wait=True)
 
+    @traced(category="moveit")
     def hand_grasp(self) -> None:
         target_values = {f'{self.robot_name}_finger_joint1': 0.006, f'{self.robot_name}_finger_joint2': 0.006}
         self.hand_group.set_joint_value_target(target_values)
@@ -111,11 +156,15 @@ class ROSController:
 
     # PLANNING OPERATIONS
 
+    @traced(category="moveit")
     def get_pose_goal_plan_with_duration(self, pose: Pose, planner: str) -> Tuple[Tuple, int]:
-        if planner.upper() == 'RRT':
-            self.move_group.set_planner_id("RRTConnect")
-        elif planner.upper() == 'PRM':
-            self.move_group.set_planner_id("PRMstar")
+        if planner.lower() == "ik":
+            start_time = time.time()
+            plan = self.ik_planner.plan(pose)
+            end_time = time.time()
+            return plan, round((end_time - start_time) * 1000)
+        if planner.lower() in PLANNER_IDS:
+            self.move_group.set_planner_id(PLANNER_IDS[planner.lower()])
         self.move_group.set_pose_target(pose)
         start_time = time.time()
         plan = self.move_group.plan()
@@ -123,27 +172,59 @@ class ROSController:
         planning_time = round((end_time - start_time) * 1000)  # in ms
         return plan, planning_time
 
+    def get_planner_portfolio(self) -> PlannerPortfolio:
+        if self.planner_portfolio is None:
+            self.planner_portfolio = PlannerPortfolio(
+                self.robot_name + "_manipulator",
+                list(PLANNER_IDS),
+                planning_time=self.planning_time,
+                local_planners={"ik": self.ik_planner},
+            )
+        return self.planner_portfolio
+
+    @traced(category="moveit")
+    def get_pose_goal_plan_portfolio(
+        self,
+        pose: Pose,
+        mode: str = "first",
+        deadline: Optional[float] = None,
+        planners: Optional[List[str]] = None,
+    ) -> Tuple[Optional[Tuple], int, Dict[str, Any]]:
+        """Plans with all portfolio planners in parallel, returns the first valid (or best) plan and its latency."""
+        plan, info = self.get_planner_portfolio().plan(pose, mode=mode, deadline=deadline, planners=planners)
+        planner_times = ", ".join(
+            f"{name} {timing['planning_time']:.0f} ms{'' if timing['success'] else ' (failed)'}"
+            for name, timing in info["planners"].items()
+        )
+        print(f"Portfolio picked {info['planner']} after {info['latency']:.0f} ms | {planner_times}")
+        return plan, round(info["latency"]), info
+
     # MOVEMENT OPERATIONS
 
+    @traced(category="moveit")
     def execute_plan(self, plan: Tuple) -> None:
         self.move_group.execute(plan, wait=True)
         self.move_group.stop()
         self.move_group.clear_pose_targets()
 
+    @traced(category="moveit")
     def go_to_capture_location(self) -> None:
         self.move_group.go(self.capture_joint_degrees, wait=True)
         self.move_group.stop()
         self.move_group.clear_pose_targets()
 
+    @traced(category="moveit")
     def go_to_pose_goal(self, pose: Pose) -> None:
         self.move_group.set_pose_target(pose)
         self.move_group.go(wait=True)
         self.move_group.stop()
         self.move_group.clear_pose_targets()
 
+    @traced(category="moveit")
     def go_to_home_position(self) -> None:
         self.move_group.go(self.neutral_joint_values, True)
 
+    @traced(category="moveit")
     def go_to_release_position(self) -> None:
         self.move_group.go(self.up_joints, True)
         self.move_group.go(self.relase_joint_values, True)
@@ -167,28 +248,56 @@ class ROSController:
         self.camera_info = np.array([
             [cam_info[0], 0.0, cam_info[2]],
             [0.0, cam_info[4], cam_info[5]],
-            [0.0, 0.0, 0.0],
+            [0.0, 0.0, 1.0],
         ])
         time.sleep(1)
 
+    @traced(category="capture")
     def capture_image_and_save_info(self) -> str:
         rospy.Subscriber("/camera/color/image_raw", Image, self.rgb_callback)
         rospy.Subscriber("/camera/aligned_depth_to_color/image_raw", Image, self.depth_callback)
         rospy.Subscriber("/camera/aligned_depth_to_color/camera_info", CameraInfo, self.camera_info_callback)
-        rospy.sleep(5)
+        with tracer.span("wait for camera", "capture"):
+            rospy.sleep(5)
+        self.camera_to_world = self.lookup_camera_to_world_transform()
         data_dict = {
             "rgb": np.array(self.rgb_array),
             "depth": np.array(self.depth_array) / 1000.0,
             "label": np.zeros((720, 1280), dtype=np.uint8),
             "K": self.camera_info,
         }
-        np.save(self.save_dir + '/data.npy', data_dict)
-        np.save(self.save_dir + "/rgb.npy", np.array(self.rgb_array))
-        np.save(self.save_dir + "/depth.npy", np.array(self.depth_array) / 1000.0)
+        if self.capture_roi or self.capture_downsample > 1:
+            data_dict = self.preprocess_capture(data_dict)
+        with tracer.span("save capture", "io"):
+            np.save(self.save_dir + '/data.npy', data_dict)
+            np.save(self.save_dir + "/rgb.npy", np.array(self.rgb_array))
+            np.save(self.save_dir + "/depth.npy", np.array(self.depth_array) / 1000.0)
         self.latest_capture_path = self.save_dir + '/data.npy'
+        if self.grasp_cache is not None:
+            self.latest_capture_key = self.grasp_cache.key(data_dict["rgb"], data_dict["depth"])
         print("Data saved on", self.latest_capture_path)
         return self.latest_capture_path
 
+    @traced(category="capture")
+    def preprocess_capture(self, data_dict: dict) -> dict:
+        """Crops the capture to the projected workspace, optionally downsamples it and adjusts K to match."""
+        height, width = data_dict["depth"].shape[:2]
+        roi = (0, 0, width, height)
+        if self.capture_roi:
+            world_to_camera = np.linalg.inv(self.get_camera_to_world_transform())
+            low = self.goal_range_low.copy()
+            low[2] = 0.0  # objects rest on the table
+            roi = workspace_roi(
+                low, self.goal_range_high, world_to_camera, data_dict["K"], (height, width), self.capture_roi_margin
+            )
+            if roi[2] - roi[0] < 2 or roi[3] - roi[1] < 2:
+                print("Workspace is not in the camera view, sending the full frame.")
+                roi = (0, 0, width, height)
+        result = crop_capture(data_dict, roi, self.capture_downsample)
+        print(f"Capture ROI {roi}, upload size {data_dict['depth'].nbytes + data_dict['rgb'].nbytes} -> "
+              f"{result['depth'].nbytes + result['rgb'].nbytes} bytes")
+        return result
+
     def view_image(self) -> None:
         file_path = self.save_dir + '/rgb.npy'
         data = np.load(file_path)
@@ -197,18 +306,33 @@ class ROSController:
 
     # CONTACT GRASPNET INTEGRATION
 
+    @traced(category="http")
     def request_graspnet_result(self, path: Optional[str] = None, remote_ip: Optional[str] = None) -> Optional[str]:
         if path is None:
             if self.latest_capture_path is None:
                 return None
             path = self.latest_capture_path
         print(f"REQUESTED PATH: {path}")
-        try:
-            if remote_ip:
-                files = {'file': ('data.npy', open(path, 'rb'))}
-                response = requests.get(remote_ip, files=files, timeout=30)
+
+        cache_key = None
+        if self.grasp_cache is not None:
+            if path == self.latest_capture_path and self.latest_capture_key is not None:
+                cache_key = self.latest_capture_key
             else:
-                response = requests.get(self.graspnet_url.format(path=path), timeout=30)
+                cache_key = self.grasp_cache.key_from_file(path)
+            cached_result_path = self.grasp_cache.get(cache_key)
+            if cached_result_path is not None:
+                print(f"Cached Result: {cached_result_path}")
+                self.latest_grasp_result_path = cached_result_path
+                return cached_result_path
+
+        try:
+            with tracer.span("graspnet request", "http", remote=bool(remote_ip)):
+                if remote_ip:
+                    files = {'file': ('data.npy', open(path, 'rb'))}
+                    response = requests.get(remote_ip, files=files, timeout=30)
+                else:
+                    response = requests.get(self.graspnet_url.format(path=path), timeout=30)
         except Exception as e:
             print(f"Request failed, please make sure Contact Graspnet Server is running!\n{e}")
             return None
@@ -217,60 +341,108 @@ class ROSController:
             return None
 
         if remote_ip:
-            temp_file_path = self.save_dir + "/predictions.npz"
-            with open(temp_file_path, 'wb') as target_file:
+            result_path = self.save_dir + "/predictions.npz"
+            with open(result_path, 'wb') as target_file:
                 target_file.write(response.content)
-            print(f"Results Saved: {temp_file_path}")
-            return temp_file_path
+            print(f"Results Saved: {result_path}")
         else:
             print(f"Response Text: {response.text}")
-            self.latest_grasp_result_path = response.text
-            return response.text
+            result_path = response.text
+
+        if cache_key is not None:
+            self.grasp_cache.put(cache_key, result_path)
+        self.latest_grasp_result_path = result_path
+        return result_path
 
+    @traced(category="io")
     def process_grasping_results(self, path: Optional[str] = None) -> Optional[np.ndarray]:
         if path is None:
             if self.latest_grasp_result_path is None:
                 return None
             path = self.latest_grasp_result_path
 
-        data = np.load(path, allow_pickle=True)
-        argmax = data['scores'].item()[-1].argmax()
-        pred_grasp = data['pred_grasps_cam'].item()[-1][argmax]
-        orientation = np.array((
-            math.atan2(pred_grasp[2][1], pred_grasp[2][2]),
-            math.asin(-pred_grasp[2][0]),
-            math.atan2(pred_grasp[1][0], pred_grasp[0][0]),
-        ))
-        position = np.array((
-            pred_grasp[0][3],
-            pred_grasp[1][3],
-            pred_grasp[2][3],
-        ))
-        result = np.concatenate((
-            position,
-            orientation,
-        ))
-        return result
+        grasps, scores = load_grasp_predictions(path)
+        if len(scores) == 0:
+            return None
+        best_grasp, _ = top_k_grasps(grasps, scores, k=1)
+        return grasps_to_poses(best_grasp)[0]
+
+    @traced(category="grasp")
+    def process_grasping_candidates(
+        self, path: Optional[str] = None, k: Optional[int] = 10, margin: float = 0.0
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Returns the top-k reachable grasps as (M, 7) position + quaternion poses in world frame, best first."""
+        if path is None:
+            if self.latest_grasp_result_path is None:
+                return None
+            path = self.latest_grasp_result_path
+
+        grasps, scores = load_grasp_predictions(path)
+        poses, scores = select_grasp_candidates(
+            grasps,
+            scores,
+            self.get_camera_to_world_transform(),
+            self.goal_range_low,
+            self.goal_range_high,
+            k=k,
+            margin=margin,
+            reachability_index=self.reachability_index,
+        )
+        if len(poses) == 0:
+            print("None of the grasp candidates are reachable!")
+            return None
+        return poses, scores
 
     # FRAME TRANSFORMATION
 
+    @traced(category="tf")
+    def lookup_camera_to_world_transform(self) -> np.ndarray:
+        self.tf_listener.waitForTransform("world", "camera_depth_optical_frame", rospy.Time(0), rospy.Duration(4.0))
+        translation, rotation = self.tf_listener.lookupTransform("world", "camera_depth_optical_frame", rospy.Time(0))
+        transform = quaternion_matrix(rotation)
+        transform[:3, 3] = translation
+        return transform
+
+    def get_camera_to_world_transform(self, refresh: bool = False) -> np.ndarray:
+        # The camera sits still at capture_joint_degrees while grasps are computed, one lookup per capture is enough
+        if refresh or self.camera_to_world is None:
+            self.camera_to_world = self.lookup_camera_to_world_transform()
+        return self.camera_to_world
+
+    def transform_camera_to_world_batch(
+        self, cv_poses: np.ndarray, as_pose_stamped: bool = False
+    ) -> Union[np.ndarray, List[PoseStamped]]:
+        """Transforms (N, 6) position + euler camera poses with one matrix multiply.
+
+        Returns (N, 7) position + quaternion world poses, or a list of PoseStamped if as_pose_stamped is set.
+        """
+        grasps = poses_to_grasps(np.asarray(cv_poses, dtype=np.float64))
+        grasps = transform_grasps(grasps, self.get_camera_to_world_transform())
+        poses = grasps_to_poses(grasps, quaternion=True)
+        if not as_pose_stamped:
+            return poses
+        return [self.array_to_pose_stamped(pose, "world") for pose in poses]
+
     def transform_camera_to_world(self, cv_pose: Union[np.ndarray, list]) -> PoseStamped:
-        base_pose = PoseStamped()
-        quaternion = quaternion_from_euler(np.double(cv_pose[3]), np.double(cv_pose[4]), np.double(cv_pose[5]))
-        base_pose.pose.position.x = cv_pose[0]
-        base_pose.pose.position.y = cv_pose[1]
-        base_pose.pose.position.z = cv_pose[2]
-        base_pose.pose.orientation.x = quaternion[0]
-        base_pose.pose.orientation.y = quaternion[1]
-        base_pose.pose.orientation.z = quaternion[2]
-        base_pose.pose.orientation.w = quaternion[3]
-        base_pose.header.frame_id = "camera_depth_optical_frame"
-
-        result = self.tf_listener.transformPose("world", base_pose)
-        return result
+        return self.transform_camera_to_world_batch(np.asarray(cv_pose)[None, :6], as_pose_stamped=True)[0]
+
+    @staticmethod
+    def array_to_pose_stamped(pose_array: np.ndarray, frame_id: str) -> PoseStamped:
+        pose = PoseStamped()
+        pose.header.frame_id = frame_id
+        pose.header.stamp = rospy.Time.now()
+        pose.pose.position.x = float(pose_array[0])
+        pose.pose.position.y = float(pose_array[1])
+        pose.pose.position.z = float(pose_array[2])
+        pose.pose.orientation.x = float(pose_array[3])
+        pose.pose.orientation.y = float(pose_array[4])
+        pose.pose.orientation.z = float(pose_array[5])
+        pose.pose.orientation.w = float(pose_array[6])
+        return pose
 
     # OBJECT CONTROLLER
 
+    @traced(category="gazebo")
     def set_base_pose(self, body: str, position: np.ndarray, orientation: np.ndarray) -> None:
         rospy.wait_for_service('/gazebo/set_model_state')
         for i in range(100):  # To avoid latency bug
@@ -1,30 +1,32 @@
-from collections import OrderedDict
-
 import numpy as np
 
 from production.ros_controller import ROSController
 import time
 
-from stable_baselines3 import (
-    HerReplayBuffer,
-    TD3,
-)
-import gymnasium as gym
 from roborl_navigator.robot.ros_panda_robot import ROSRobot
 from roborl_navigator.simulation.ros import ROSSim
-from roborl_navigator.utils import distance
+from roborl_navigator.utils import (
+    distance,
+    tracer,
+)
 from roborl_navigator.environment.env_panda_ros import PandaROSEnv
+from roborl_navigator.policy import (
+    load_policy,
+    process_uptime,
+)
+
 
+trace_path = "sim_full_pipeline_trace.json"  # open in chrome://tracing or ui.perfetto.dev
+tracer.enable()
 
 env = PandaROSEnv(
     orientation_task=False,
     distance_threshold=0.025,
     demonstration=True,
 )
-model = TD3.load(
-    '/home/basheer/RoboRL-Navigator/models/roborl-navigator/TD3_Bullet_0.05_Threshold_200K/model.zip',
-    env=env,
-    replay_buffer_class=HerReplayBuffer,
+# deterministic actor exported next to the model.zip, memory mapped and warmed
+model = load_policy(
+    '/home/basheer/RoboRL-Navigator/models/roborl-navigator/TD3_Bullet_0.05_Threshold_200K/model.zip'
 )
 sim = ROSSim(orientation_task=False)
 robot = ROSRobot(sim=sim, orientation_task=False)
@@ -42,16 +44,14 @@ ros_controller.view_image()
 
 # Send Request to Contact Graspnet Server
 ros_controller.request_graspnet_result(remote_ip=remote_ip)
-# Parse Responded File
-processed_pose = ros_controller.process_grasping_results()
+# Parse Responded File, keep the best reachable grasp in Panda Base frame
+grasp_candidates = ros_controller.process_grasping_candidates(k=10)
 
-if not processed_pose:
+if grasp_candidates is None:
+    tracer.save(trace_path)
     exit()
 
-# Transform Frame to Panda Base
-target_pose = ros_controller.transform_camera_to_world(processed_pose)
-# Convert Pose to Array
-target_pose_array = ros_controller.pose_to_array(target_pose)
+target_pose_array = grasp_candidates[0][0]
 
 print(f"Desired Goal: {target_pose_array[:3]}")
 
@@ -60,11 +60,17 @@ ros_controller.go_to_home_position()
 observation = env.reset(options={"goal": np.array(target_pose_array[:3]).astype(np.float32)})[0]
 
 for _ in range(50):
-    action = model.predict(observation)
-    observation, reward, terminated, truncated, info = env.step(np.array(action[0]).astype(np.float32))
+    with tracer.span("policy", "policy"):
+        action = model.predict(observation)
+    if _ == 0:
+        print(f"Time to first action: {process_uptime():.2f} s after process start")
+    with tracer.span("env.step", "env"):
+        observation, reward, terminated, truncated, info = env.step(np.array(action[0]).astype(np.float32))
     if terminated or info.get('is_success', False):
         print("Reached destination!")
         break
 
 # Close Gripper
 ros_controller.hand_close()
+
+tracer.save(trace_path)
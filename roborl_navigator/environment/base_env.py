@@ -34,14 +34,26 @@ class BaseEnv(gym.Env):
         self.action_space = self.robot.action_space
         self.compute_reward = self.task.compute_reward
         self._saved_goal = dict()
+        self.timer = self.sim.timer
+        self.task.timer = self.timer
+
+    def set_profiling(self, enabled: bool) -> None:
+        """Switches the phase timers of the env, its simulation and its task."""
+        self.timer.enabled = enabled
+        self.timer.reset()
+
+    def get_perf_stats(self) -> Dict[str, Dict[str, float]]:
+        """Rolling phase time statistics in ms, empty while profiling is disabled."""
+        return self.timer.stats()
 
     def _get_obs(self) -> Dict[str, np.ndarray]:
         obstacle_dist = self.sim.get_closest_dist(self.robot.get_ee_position())
 
-        robot_pos = self.robot.get_obs().astype(np.float32)
-        obstacle_dist_vector = obstacle_dist[0].astype(np.float32)
-        achieved_goal = self.task.get_achieved_goal().astype(np.float32)
-        desired_goal = self.task.get_goal().astype(np.float32)
+        with self.sim.timer.phase("observation"):
+            robot_pos = self.robot.get_obs().astype(np.float32)
+            obstacle_dist_vector = obstacle_dist[0].astype(np.float32)
+            achieved_goal = self.task.get_achieved_goal().astype(np.float32)
+            desired_goal = self.task.get_goal().astype(np.float32)
 
         return {
             "robot_pos": robot_pos,
@@ -53,6 +65,9 @@ class BaseEnv(gym.Env):
     def reset(
         self, seed: Optional[int] = None, options: Optional[dict] = None
     ) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Seeds the env generator when a seed is given and hands it to the task, subclasses place the episode."""
+        super().reset(seed=seed, options=options)
+        self.task.np_random = self.np_random
         return NotImplemented
 
     def step(self, action: np.ndarray) -> Tuple[Dict[str, np.ndarray], float, bool, bool, Dict[str, Any]]:
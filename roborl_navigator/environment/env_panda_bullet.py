@@ -6,12 +6,13 @@ from typing import (
 )
 
 import numpy as np
-from gymnasium.utils import seeding
 
 from roborl_navigator.environment import BaseEnv
 from roborl_navigator.simulation.bullet import BulletSim
 from roborl_navigator.robot.bullet_panda_robot import BulletPanda
 from roborl_navigator.task.reach_task import Reach
+from roborl_navigator.task.reachability import ReachabilityIndex
+from roborl_navigator.utils import OccupancyMap
 
 
 class PandaBulletEnv(BaseEnv):
@@ -23,12 +24,16 @@ class PandaBulletEnv(BaseEnv):
         orientation_task: bool = False,
         distance_threshold: float = 0.05,
         goal_range: float = 0.3,
-        debug_mode: bool = False
+        debug_mode: bool = False,
+        reachability_index: Optional[str] = None,
+        occupancy_map: bool = False,
+        profile: bool = False,
     ) -> None:
         self.sim = BulletSim(render_mode=render_mode,
                              n_substeps=30,
                              orientation_task=orientation_task,
-                             debug_mode=debug_mode)
+                             debug_mode=debug_mode,
+                             occupancy_map=OccupancyMap.for_goal_range(goal_range) if occupancy_map else None)
 
         self.robot = BulletPanda(self.sim, orientation_task=orientation_task)
         self.task = Reach(
@@ -38,6 +43,9 @@ class PandaBulletEnv(BaseEnv):
             orientation_task=orientation_task,
             distance_threshold=distance_threshold,
             goal_range=goal_range,
+            reachability_index=(
+                ReachabilityIndex.load(reachability_index, bullet_model=True) if reachability_index else None
+            ),
         )
         super().__init__()
 
@@ -59,15 +67,19 @@ class PandaBulletEnv(BaseEnv):
         self.pitch = None
         self.a = None
         self.obstacle_collision_margin = 0.022 # SHOULD NOT BE MORE THAN 0.022
+        self.set_profiling(profile)
 
     def reset(
         self, seed: Optional[int] = None, options: Optional[dict] = None
     ) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
-        # super().reset(seed=seed, options=options)
-        self.task.np_random, seed = seeding.np_random(seed)
+        scenario = options.get("scenario") if options else None
+        if seed is None and scenario is not None:
+            seed = int(scenario["seed"])
+        super().reset(seed=seed, options=options)
         with self.sim.no_rendering():
             self.robot.reset()
-            self.task.reset()
+            self.task.reset(scenario)
+        self.sim.reset_obstacle_map()
         if options and "goal" in options:
             self.task.set_goal(options["goal"])
         observation = self._get_obs()
@@ -75,7 +87,12 @@ class PandaBulletEnv(BaseEnv):
         return observation, info
 
     def step(self, action: np.ndarray) -> Tuple[Dict[str, np.ndarray], float, bool, bool, Dict[str, Any]]:
-        self.robot.set_action(action)
+        with self.timer.phase("step"):
+            return self._step(action)
+
+    def _step(self, action: np.ndarray) -> Tuple[Dict[str, np.ndarray], float, bool, bool, Dict[str, Any]]:
+        with self.timer.phase("action"):
+            self.robot.set_action(action)
         self.sim.step()
         if np.sum(self.robot.get_ee_velocity()) > 0.1:
             self.sim.step()
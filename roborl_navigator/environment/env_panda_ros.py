@@ -7,12 +7,15 @@ from typing import (
 
 import numpy as np
 
-from gymnasium.utils import seeding
-
 from roborl_navigator.environment import BaseEnv
+from roborl_navigator.environment.plan_ahead import PolicyRollout
 from roborl_navigator.simulation.ros.ros_sim import ROSSim
 from roborl_navigator.robot.ros_panda_robot import ROSRobot
 from roborl_navigator.task.reach_task import Reach
+from roborl_navigator.utils import (
+    OccupancyMap,
+    PlannerResult,
+)
 
 
 class PandaROSEnv(BaseEnv):
@@ -24,9 +27,28 @@ class PandaROSEnv(BaseEnv):
         goal_range: float = 0.3,
         demonstration: bool = False,
         real_robot: bool = False,
+        direct_joint_threshold: Optional[float] = None,
+        streaming_rate: Optional[float] = None,
+        local_kinematics: bool = True,
+        obstacle_sensor: bool = True,
+        occupancy_map: bool = False,
+        obstacle_sampling: str = "bullet",
     ) -> None:
-        self.sim = ROSSim(orientation_task=orientation_task, demonstration=demonstration)
-        self.robot = ROSRobot(self.sim, orientation_task=orientation_task, real_robot=real_robot)
+        self.sim = ROSSim(
+            orientation_task=orientation_task,
+            demonstration=demonstration,
+            obstacle_sensor=obstacle_sensor,
+            occupancy_map=OccupancyMap.for_goal_range(goal_range) if occupancy_map else None,
+            obstacle_sampling=obstacle_sampling,
+        )
+        self.robot = ROSRobot(
+            self.sim,
+            orientation_task=orientation_task,
+            real_robot=real_robot,
+            direct_joint_threshold=direct_joint_threshold,
+            streaming_rate=streaming_rate,
+            local_kinematics=local_kinematics,
+        )
         self.task = Reach(
             self.sim,
             self.robot,
@@ -45,11 +67,14 @@ class PandaROSEnv(BaseEnv):
         if self.demonstration and options and "goal" in options:
             self.task.set_goal(options["goal"])
         else:
+            scenario = options.get("scenario") if options else None
+            if seed is None and scenario is not None:
+                seed = int(scenario["seed"])
             super().reset(seed=seed, options=options)
-            self.task.np_random, seed = seeding.np_random(seed)
             with self.sim.no_rendering():
                 self.robot.reset()
-                self.task.reset()
+                self.task.reset(scenario)
+            self.sim.reset_obstacle_map()
 
         observation = self._get_obs()
         info = {"is_success": self.task.is_success(observation["achieved_goal"], self.task.get_goal())}
@@ -59,12 +84,48 @@ class PandaROSEnv(BaseEnv):
         truncated = self.robot.set_action(action)
         observation = self._get_obs()
         terminated = bool(self.task.is_success(observation["achieved_goal"], self.task.get_goal()))
-        info = {"is_success": terminated}
+        info = {
+            "is_success": terminated,
+            "planning_time": self.robot.planning_time,
+            "execution_time": self.robot.execution_time,
+        }
         reward = float(self.task.compute_reward(observation["achieved_goal"], self.task.get_goal(), info))
         return observation, reward, terminated, truncated, info
 
+    def plan_ahead_step(
+        self, rollout: PolicyRollout, velocity_scaling: float = 0.3
+    ) -> Tuple[Dict[str, np.ndarray], float, bool, bool, Dict[str, Any]]:
+        """Reaches the goal with a policy rollout in a local model, executed as a single MoveIt trajectory.
+
+        The rollout sees the task obstacles, a rollout ending in a collision is not executed.
+        """
+        start_joint_angles = self.robot.get_joint_angles()
+        obstacles = np.array([self.task.obstacle1_pos, self.task.obstacle2_pos, self.task.obstacle3_pos])
+        waypoints, rollout_info = rollout.rollout(start_joint_angles, self.task.get_goal(), obstacles)
+        waypoints[0] = start_joint_angles
+        if rollout_info.get("is_collision"):
+            self.robot.planning_time = self.robot.execution_time = 0.0
+            result = PlannerResult.COLLISION
+        else:
+            result = self.robot.execute_joint_waypoints(waypoints, velocity_scaling)
+
+        observation = self._get_obs()
+        terminated = bool(self.task.is_success(observation["achieved_goal"], self.task.get_goal()))
+        info = {
+            "is_success": terminated,
+            "rollout_success": rollout_info["is_success"],
+            "rollout_collision": bool(rollout_info.get("is_collision", False)),
+            "steps": rollout_info["steps"],
+            "planner_result": result,
+            "planning_time": self.robot.planning_time,
+            "execution_time": self.robot.execution_time,
+        }
+        reward = float(self.task.compute_reward(observation["achieved_goal"], self.task.get_goal(), info))
+        return observation, reward, terminated, result != PlannerResult.SUCCESS, info
+
     def close(self) -> None:
-        pass
+        if self.robot.streamer is not None:
+            self.robot.streamer.stop()
 
     def render(self) -> Optional[np.ndarray]:
         pass
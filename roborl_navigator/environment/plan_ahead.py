@@ -0,0 +1,79 @@
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+
+from roborl_navigator.environment.env_panda_bullet import PandaBulletEnv
+
+
+class PolicyRollout:
+    """Rolls a trained policy forward in a headless Bullet model of the Panda to collect joint waypoints.
+
+    The waypoints can then be executed as a single trajectory instead of planning every policy step.
+
+    Args:
+        policy (Any): Anything with a Stable Baselines3 like predict(observation, deterministic) method.
+        max_steps (int): Rollout limit, the registered environments truncate after 50 steps.
+    """
+
+    def __init__(
+        self,
+        policy: Any,
+        orientation_task: bool = False,
+        distance_threshold: float = 0.05,
+        goal_range: float = 0.3,
+        max_steps: int = 50,
+    ) -> None:
+        self.policy = policy
+        self.max_steps = max_steps
+        self.env = PandaBulletEnv(
+            render_mode="rgb_array",
+            orientation_task=orientation_task,
+            distance_threshold=distance_threshold,
+            goal_range=goal_range,
+        )
+        self.hidden_obstacle_position = np.array([0.0, 2.0, -1.0])  # off the table, outside the camera view
+
+    def rollout(
+        self,
+        joint_angles: np.ndarray,
+        goal: np.ndarray,
+        obstacles: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """Runs the policy from joint_angles (real Panda values) towards goal.
+
+        Args:
+            obstacles (np.ndarray): Optional (3, 3) obstacle positions, obstacles are hidden when None.
+
+        Returns:
+            Tuple[np.ndarray, Dict[str, Any]]: (T + 1, 7) joint waypoints including the start, and the info
+            of the last step.
+        """
+        sim = self.env.sim
+        self.env.reset(options={"goal": np.asarray(goal, dtype=np.float32)})
+        self.env.robot.set_joint_angles(np.asarray(joint_angles, dtype=np.float64))
+        for i, name in enumerate(["obstacle1", "obstacle2", "obstacle3"]):
+            position = self.hidden_obstacle_position if obstacles is None else obstacles[i]
+            sim.set_base_pose(name, position, np.array([0.0, 0.0, 0.0, 1.0]))
+        sim.set_base_pose("target", np.asarray(goal)[:3], np.array([0.0, 0.0, 0.0, 1.0]))
+
+        observation = self.env._get_obs()
+        waypoints = [self.env.robot.get_joint_angles()]
+        info = {"is_success": bool(self.env.task.is_success(observation["achieved_goal"], self.env.task.get_goal()))}
+        for _ in range(self.max_steps):
+            if info["is_success"]:
+                break
+            action = self.policy.predict(observation, deterministic=True)[0]
+            observation, _, terminated, _, info = self.env.step(np.array(action).astype(np.float32))
+            waypoints.append(self.env.robot.get_joint_angles())
+            if terminated:
+                break
+        info["steps"] = len(waypoints) - 1
+        return np.array(waypoints), info
+
+    def close(self) -> None:
+        self.env.close()
@@ -0,0 +1,192 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Union,
+)
+
+import numpy as np
+
+from roborl_navigator.environment.env_panda_bullet import PandaBulletEnv
+from roborl_navigator.task.scenario_bank import ScenarioBank
+
+RESULT_DTYPE = np.dtype([
+    ("scenario", np.int64),  # index of the scenario in the evaluated bank
+    ("success", np.bool_),
+    ("collision", np.bool_),
+    ("timeout", np.bool_),
+    ("steps", np.int32),
+    ("min_obstacle_distance", np.float32),  # closest end-effector to obstacle point cloud distance of the episode
+    ("wall_time", np.float32),  # seconds spent on reset and steps
+])
+
+Policy = Callable[[Dict[str, np.ndarray]], np.ndarray]
+
+_worker_env = None
+_worker_policy = None
+
+
+class SB3PolicyLoader:
+    """Picklable loader of a saved Stable Baselines3 model, called once per evaluation worker.
+
+    Args:
+        model_path (str): Path of the saved model.zip.
+        algorithm (str): Stable Baselines3 algorithm class name, e.g. "TD3".
+    """
+
+    def __init__(self, model_path: str, algorithm: str = "TD3") -> None:
+        self.model_path = model_path
+        self.algorithm = algorithm
+
+    def __call__(self, env: PandaBulletEnv) -> Policy:
+        import stable_baselines3
+        model = getattr(stable_baselines3, self.algorithm).load(
+            self.model_path, env=env, replay_buffer_class=stable_baselines3.HerReplayBuffer
+        )
+        return lambda observation: model.predict(observation, deterministic=True)[0]
+
+
+class NumpyPolicyLoader:
+    """Picklable loader of the exported NumPy actor of a saved model, workers memory map the same actor file.
+
+    A model.zip is exported once when the loader is created, not by every worker.
+
+    Args:
+        model_path (str): Path of the saved model.zip or its exported .npz actor.
+    """
+
+    def __init__(self, model_path: str) -> None:
+        from roborl_navigator.policy.loader import ensure_exported
+        self.model_path = ensure_exported(model_path)
+
+    def __call__(self, env: PandaBulletEnv) -> Policy:
+        from roborl_navigator.policy import load_policy
+        return load_policy(self.model_path)
+
+
+def apply_scenario(env: PandaBulletEnv, scenario: np.ndarray) -> Dict[str, np.ndarray]:
+    """Resets env to a SCENARIO_DTYPE record, returns the observation of the placed scene."""
+    return env.reset(options={"scenario": scenario})[0]
+
+
+def _init_worker(env_kwargs: Dict[str, Any], policy_loader: Callable[[PandaBulletEnv], Policy]) -> None:
+    global _worker_env, _worker_policy
+    _worker_env = PandaBulletEnv(**env_kwargs)
+    _worker_policy = policy_loader(_worker_env)
+
+
+def _evaluate_chunk(start: int, scenarios: np.ndarray, max_steps: int) -> np.ndarray:
+    return evaluate_scenarios(_worker_env, _worker_policy, scenarios, max_steps, start)
+
+
+def evaluate_scenarios(
+    env: PandaBulletEnv,
+    policy: Policy,
+    scenarios: np.ndarray,
+    max_steps: int = 50,
+    start: int = 0,
+) -> np.ndarray:
+    """Rolls out policy on every SCENARIO_DTYPE record in one process, returns an array of RESULT_DTYPE records."""
+    results = np.zeros(len(scenarios), dtype=RESULT_DTYPE)
+    for i, scenario in enumerate(scenarios):
+        start_time = time.perf_counter()
+        # the scenario seed keeps any env sampling independent of the sharding
+        observation = apply_scenario(env, scenario)
+        min_distance = env.sim.curr_euclid_dist
+        info = {}
+        step = 0
+        for step in range(1, max_steps + 1):
+            observation, _, terminated, truncated, info = env.step(np.asarray(policy(observation), dtype=np.float32))
+            min_distance = min(min_distance, env.sim.curr_euclid_dist)
+            if terminated or truncated:
+                break
+        result = results[i]
+        result["scenario"] = start + i
+        result["success"] = bool(info.get("is_success", False))
+        result["collision"] = bool(info.get("is_collision", False))
+        result["timeout"] = not (result["success"] or result["collision"])
+        result["steps"] = step
+        result["min_obstacle_distance"] = min_distance
+        result["wall_time"] = time.perf_counter() - start_time
+    return results
+
+
+class ScenarioEvaluator:
+    """Evaluates a policy on a scenario set sharded over a process pool of PandaBulletEnv workers.
+
+    Every worker builds its env and loads the policy once, then takes chunks of consecutive scenarios. Results
+    are written back by scenario row, so the report does not depend on the number of workers or chunk order.
+
+    Args:
+        policy_loader (Callable): Picklable callable creating the policy for a worker env, e.g. SB3PolicyLoader.
+        env_kwargs (Dict[str, Any]): PandaBulletEnv arguments, rendering is always headless.
+        n_workers (int): Number of processes, defaults to the CPU count.
+        chunk_size (int): Scenarios per task, small chunks balance the load, large ones cut the IPC.
+        max_steps (int): Episode length, the registered environments use 50.
+        start_method (str): multiprocessing start method, defaults to the platform default.
+    """
+
+    def __init__(
+        self,
+        policy_loader: Callable[[PandaBulletEnv], Policy],
+        env_kwargs: Optional[Dict[str, Any]] = None,
+        n_workers: Optional[int] = None,
+        chunk_size: int = 16,
+        max_steps: int = 50,
+        start_method: Optional[str] = None,
+    ) -> None:
+        self.policy_loader = policy_loader
+        self.env_kwargs = dict(env_kwargs or {}, render_mode="rgb_array")
+        self.n_workers = n_workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.max_steps = max_steps
+        self.start_method = start_method
+
+    def evaluate(self, scenarios: Union[ScenarioBank, np.ndarray]) -> np.ndarray:
+        """Evaluates a scenario bank or SCENARIO_DTYPE array, returns RESULT_DTYPE records in scenario order."""
+        results = np.zeros(len(scenarios), dtype=RESULT_DTYPE)
+        chunks = [
+            (start, scenarios[start:start + self.chunk_size]) for start in range(0, len(scenarios), self.chunk_size)
+        ]
+        with ProcessPoolExecutor(
+            max_workers=min(self.n_workers, len(chunks)) or 1,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_init_worker,
+            initargs=(self.env_kwargs, self.policy_loader),
+        ) as executor:
+            futures = [
+                executor.submit(_evaluate_chunk, start, chunk, self.max_steps) for start, chunk in chunks
+            ]
+            for (start, chunk), future in zip(chunks, futures):
+                results[start:start + len(chunk)] = future.result()
+        return results
+
+    @staticmethod
+    def summary(results: np.ndarray) -> Dict[str, float]:
+        """Outcome counts and rates, mean steps of the successful episodes and wall time statistics."""
+        n_results = max(len(results), 1)
+        successful_steps = results["steps"][results["success"]]
+        return {
+            "scenarios": len(results),
+            "successes": int(results["success"].sum()),
+            "collisions": int(results["collision"].sum()),
+            "timeouts": int(results["timeout"].sum()),
+            "success_rate": float(results["success"].sum() / n_results),
+            "collision_rate": float(results["collision"].sum() / n_results),
+            "timeout_rate": float(results["timeout"].sum() / n_results),
+            "mean_success_steps": float(successful_steps.mean()) if len(successful_steps) else float("nan"),
+            "mean_min_obstacle_distance": float(results["min_obstacle_distance"].mean()) if len(results) else 0.0,
+            "mean_wall_time": float(results["wall_time"].mean()) if len(results) else 0.0,
+            "total_wall_time": float(results["wall_time"].sum()),
+        }
+
+    @staticmethod
+    def to_records(results: np.ndarray) -> List[Dict[str, Any]]:
+        """JSON serializable per-scenario records."""
+        return [{name: record[name].item() for name in RESULT_DTYPE.names} for record in results]
@@ -0,0 +1,31 @@
+import unittest
+
+from roborl_navigator.environment.env_panda_bullet import PandaBulletEnv
+
+
+class TestPandaBulletEnv(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.env = PandaBulletEnv(render_mode="rgb_array", goal_range=0.2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.env.close()
+
+    def test_profiling(self):
+        self.env.set_profiling(True)
+        try:
+            self.env.reset(seed=0)
+            self.env.step(self.env.action_space.sample())
+            stats = self.env.get_perf_stats()
+        finally:
+            self.env.set_profiling(False)
+        for phase in ["step", "action", "physics", "camera", "point_cloud", "nearest_point", "observation", "reward"]:
+            self.assertGreaterEqual(stats[phase]["count"], 1, phase)
+        self.assertGreaterEqual(stats["step"]["mean"], stats["physics"]["mean"])
+        self.assertEqual(self.env.get_perf_stats(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import numpy as np
+import unittest
+
+from roborl_navigator.environment.env_panda_bullet import PandaBulletEnv
+from roborl_navigator.environment.scenario_evaluation import (
+    RESULT_DTYPE,
+    ScenarioEvaluator,
+    evaluate_scenarios,
+)
+from roborl_navigator.task.scenario_bank import ScenarioBank
+
+
+class ConstantPolicyLoader:
+
+    def __init__(self, action: np.ndarray) -> None:
+        self.action = action
+
+    def __call__(self, env: PandaBulletEnv):
+        return lambda observation: self.action
+
+
+class TestScenarioEvaluation(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.scenarios = ScenarioBank.generate(6, goal_range=0.2, seed=0)
+        cls.env_kwargs = {"goal_range": 0.2, "distance_threshold": 0.025}
+        cls.loader = ConstantPolicyLoader(np.array([0.0, 0.5, 0.0, 0.3, 0.0, -0.2, 0.0], dtype=np.float32))
+
+    def test_single_process_results(self):
+        env = PandaBulletEnv(render_mode="rgb_array", **self.env_kwargs)
+        try:
+            results = evaluate_scenarios(env, self.loader(env), self.scenarios[:2], max_steps=5, start=4)
+        finally:
+            env.close()
+        self.assertEqual(results.dtype, RESULT_DTYPE)
+        np.testing.assert_array_equal(results["scenario"], [4, 5])
+        outcomes = results["success"].astype(int) + results["collision"] + results["timeout"]
+        np.testing.assert_array_equal(outcomes, [1, 1])
+        self.assertTrue(np.all((results["steps"] >= 1) & (results["steps"] <= 5)))
+        self.assertTrue(np.all(results["min_obstacle_distance"] > 0.0))
+        self.assertTrue(np.all(results["wall_time"] > 0.0))
+
+    def test_sharding_does_not_change_results(self):
+        sequential = ScenarioEvaluator(self.loader, self.env_kwargs, n_workers=1, chunk_size=6, max_steps=5)
+        parallel = ScenarioEvaluator(self.loader, self.env_kwargs, n_workers=3, chunk_size=1, max_steps=5)
+        expected = sequential.evaluate(self.scenarios)
+        results = parallel.evaluate(self.scenarios)
+        np.testing.assert_array_equal(results["scenario"], np.arange(6))
+        for name in ["success", "collision", "timeout", "steps"]:
+            np.testing.assert_array_equal(results[name], expected[name])
+        np.testing.assert_allclose(results["min_obstacle_distance"], expected["min_obstacle_distance"], atol=1e-6)
+
+        summary = ScenarioEvaluator.summary(results)
+        self.assertEqual(summary["scenarios"], 6)
+        self.assertEqual(summary["successes"] + summary["collisions"] + summary["timeouts"], 6)
+        self.assertEqual(len(ScenarioEvaluator.to_records(results)), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import gymnasium as gym
+import numpy as np
+import unittest
+
+import roborl_navigator.environment
+from roborl_navigator.environment.env_panda_bullet import PandaBulletEnv
+from roborl_navigator.environment.vector_env import (
+    make_env_fns,
+    make_vector_env,
+    spawn_seeds,
+)
+
+
+class TestEnvSeeding(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.env = PandaBulletEnv(render_mode="rgb_array", goal_range=0.2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.env.close()
+
+    def episode(self, seed=None):
+        observation, _ = self.env.reset(seed=seed)
+        task = self.env.task
+        return np.concatenate((observation["desired_goal"], task.obstacle1_pos, task.obstacle2_pos, task.obstacle3_pos))
+
+    def test_seeded_reset_is_reproducible(self):
+        first = [self.episode(3)] + [self.episode() for _ in range(3)]
+        second = [self.episode(3)] + [self.episode() for _ in range(3)]
+        np.testing.assert_array_equal(first, second)
+        self.assertFalse(np.array_equal(self.episode(4), first[0]))
+
+    def test_global_rng_is_not_used(self):
+        np.random.seed(0)
+        state = np.random.get_state()[1].copy()
+        self.episode(5)
+        self.episode()
+        np.testing.assert_array_equal(np.random.get_state()[1], state)
+
+    def test_spawn_seeds(self):
+        seeds = spawn_seeds(11, 8)
+        self.assertEqual(len(set(seeds)), 8)
+        self.assertEqual(seeds, spawn_seeds(11, 8))
+        self.assertNotEqual(seeds, spawn_seeds(12, 8))
+
+
+class TestVectorEnv(unittest.TestCase):
+
+    @staticmethod
+    def goal_streams(seed, n_envs=3, n_resets=3):
+        vector_env = make_vector_env(n_envs, seed=seed, render_mode="rgb_array", goal_range=0.2)
+        try:
+            goals = [vector_env.reset()[0]["desired_goal"] for _ in range(n_resets)]
+        finally:
+            vector_env.close()
+        return np.stack(goals, axis=1)  # (n_envs, n_resets, 3)
+
+    def test_workers_have_distinct_reproducible_streams(self):
+        streams = self.goal_streams(seed=7)
+        self.assertEqual(len(np.unique(streams.reshape(-1, 3), axis=0)), streams.shape[0] * streams.shape[1])
+        np.testing.assert_array_equal(self.goal_streams(seed=7), streams)
+
+    def test_env_fns_continue_their_seeded_streams(self):
+        goals = []
+        for _ in range(2):
+            env = make_env_fns(1, seed=9, wrapper=gym.wrappers.RecordEpisodeStatistics, render_mode="rgb_array")[0]()
+            try:
+                self.assertIsInstance(env, gym.wrappers.RecordEpisodeStatistics)
+                goals.append(env.reset()[0]["desired_goal"])  # unseeded, as SB3 resets its envs
+            finally:
+                env.close()
+        np.testing.assert_array_equal(goals[0], goals[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+from typing import (
+    Any,
+    Callable,
+    List,
+    Optional,
+)
+
+import gymnasium as gym
+import numpy as np
+
+
+def spawn_seeds(seed: Optional[int], n_envs: int) -> List[int]:
+    """Seeds of n_envs independent RNG streams spawned from one SeedSequence, None spawns from OS entropy."""
+    return [int(child.generate_state(1, np.uint64)[0]) for child in np.random.SeedSequence(seed).spawn(n_envs)]
+
+
+def make_env_fns(
+    n_envs: int,
+    seed: Optional[int] = None,
+    env_id: str = "RoboRL-Navigator-Panda-Bullet",
+    wrapper: Optional[Callable[[gym.Env], gym.Env]] = None,
+    **env_kwargs: Any,
+) -> List[Callable[[], gym.Env]]:
+    """Environment factories for a gymnasium or Stable-Baselines3 vector env, each seeded with its own spawned stream.
+
+    Every factory resets its environment once with its seed, later resets without a seed (as both vector envs do by
+    default) continue that environment's own generator, so parallel workers never share or repeat episodes and the
+    same seed reproduces all of them.
+    """
+
+    def make_env(env_seed: int) -> Callable[[], gym.Env]:
+        def _init() -> gym.Env:
+            env = gym.make(env_id, **env_kwargs)
+            if wrapper is not None:
+                env = wrapper(env)
+            env.reset(seed=env_seed)
+            return env
+
+        return _init
+
+    return [make_env(env_seed) for env_seed in spawn_seeds(seed, n_envs)]
+
+
+def make_vector_env(
+    n_envs: int,
+    seed: Optional[int] = None,
+    env_id: str = "RoboRL-Navigator-Panda-Bullet",
+    asynchronous: bool = True,
+    **env_kwargs: Any,
+) -> gym.vector.VectorEnv:
+    """Creates n_envs environments from make_env_fns in one gymnasium vector env and resets it."""
+    env_fns = make_env_fns(n_envs, seed, env_id, **env_kwargs)
+    vector_env = gym.vector.AsyncVectorEnv(env_fns) if asynchronous else gym.vector.SyncVectorEnv(env_fns)
+    vector_env.reset()
+    return vector_env
@@ -0,0 +1,10 @@
+from .numpy_policy import (
+    NumpyPolicy,
+    export_sb3_actor,
+    policy_from_state_dict,
+)
+from .loader import (
+    clear_policy_cache,
+    load_policy,
+    process_uptime,
+)
@@ -0,0 +1,120 @@
+import os
+import struct
+import threading
+import time
+import zipfile
+from typing import (
+    Dict,
+    Tuple,
+)
+
+import numpy as np
+
+from roborl_navigator.policy.numpy_policy import (
+    NumpyPolicy,
+    export_sb3_actor,
+)
+
+_import_time = time.perf_counter()
+_policies: Dict[str, Tuple[float, NumpyPolicy]] = {}  # real path of the actor file: (mtime, warmed policy)
+_lock = threading.Lock()
+
+
+def process_uptime() -> float:
+    """Seconds since the process was started, since this module was imported where /proc is unavailable."""
+    try:
+        with open("/proc/self/stat", "r") as stat_file:
+            start_ticks = int(stat_file.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", "r") as uptime_file:
+            uptime = float(uptime_file.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return time.perf_counter() - _import_time
+
+
+def actor_path(model_path: str) -> str:
+    """Exported actor of a model.zip, the .npz file next to it."""
+    return model_path[:-4] + ".npz" if model_path.endswith(".zip") else model_path
+
+
+def ensure_exported(model_path: str) -> str:
+    """Exports the actor of a model.zip once, returns the path of an up to date .npz actor file.
+
+    Stable Baselines3 and torch are only imported when the .npz file is missing or older than the model.
+    """
+    path = actor_path(model_path)
+    if path != model_path and (not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(model_path)):
+        print(f"Exporting the actor of {model_path} to {path}")
+        export_sb3_actor(model_path, path)
+    return path
+
+
+def mmap_npz(path: str) -> Dict[str, np.ndarray]:
+    """Memory maps the arrays of an uncompressed .npz file, scalars and compressed members are read."""
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as npz_file:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+            # array data starts after the local file header, its file name and extra field
+            npz_file.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack("<HH", npz_file.read(4))
+            member_offset = info.header_offset + 30 + name_length + extra_length
+            npz_file.seek(member_offset)
+            version = np.lib.format.read_magic(npz_file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(npz_file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(npz_file)
+            if not shape or dtype.hasobject:
+                npz_file.seek(member_offset)
+                arrays[name] = np.lib.format.read_array(npz_file)
+                continue
+            arrays[name] = np.memmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                offset=npz_file.tell(),
+                shape=shape,
+                order="F" if fortran_order else "C",
+            )
+    return arrays
+
+
+def warm_up(policy: NumpyPolicy) -> None:
+    """Runs one prediction, so the first real action does not pay for page faults and buffer setup."""
+    observation = {
+        key: np.zeros(size, dtype=np.float32) for key, size in zip(policy.observation_keys, policy.observation_sizes)
+    }
+    policy.predict(observation)
+
+
+def load_policy(model_path: str, warm: bool = True) -> NumpyPolicy:
+    """Deterministic actor of a model.zip or exported .npz file, memory mapped and cached per path.
+
+    Later calls of the same process return the cached, warmed policy until the actor file changes. The policy
+    reuses its buffers between predictions, threads sharing it have to serialize their calls.
+
+    Args:
+        model_path (str): Saved Stable Baselines3 model.zip or its exported .npz actor.
+        warm (bool): Run one prediction before returning.
+    """
+    path = os.path.realpath(ensure_exported(model_path))
+    mtime = os.path.getmtime(path)
+    with _lock:
+        cached = _policies.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        policy = NumpyPolicy.from_arrays(mmap_npz(path))
+        if warm:
+            warm_up(policy)
+        _policies[path] = (mtime, policy)
+        return policy
+
+
+def clear_policy_cache() -> None:
+    with _lock:
+        _policies.clear()
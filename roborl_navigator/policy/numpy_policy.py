@@ -0,0 +1,239 @@
+import argparse
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+NUMPY_POLICY_VERSION = 1
+ACTIVATIONS = ("relu", "tanh", "elu", "leakyrelu")
+
+
+def _apply_activation(activation: str, x: np.ndarray) -> None:
+    if activation == "relu":
+        np.maximum(x, 0.0, out=x)
+    elif activation == "tanh":
+        np.tanh(x, out=x)
+    elif activation == "elu":
+        np.putmask(x, x < 0.0, np.expm1(x))
+    else:
+        np.putmask(x, x < 0.0, x * 0.01)
+
+
+class NumpyPolicy:
+    """Deterministic TD3 actor evaluated with NumPy, without torch, Stable Baselines3 or the critic networks.
+
+    Mirrors the MultiInputPolicy actor: the dict observation is flattened in observation space key order, passed
+    through the MLP with a tanh output and unscaled to the action bounds. Layer outputs go to preallocated float32
+    buffers which grow with the largest batch seen, predict() only allocates the returned action.
+
+    Args:
+        kernels (List[np.ndarray]): Layer weights as (in_features, out_features) float32 arrays.
+        biases (List[np.ndarray]): Layer biases.
+        observation_keys (Sequence[str]): Dict observation keys in flattening order.
+        observation_sizes (Sequence[int]): Flattened size of every observation key.
+        action_low (np.ndarray): Lower bound of the action space.
+        action_high (np.ndarray): Upper bound of the action space.
+        activation (str): Hidden layer activation, one of ACTIVATIONS.
+        batch_size (int): Initial buffer capacity in observations.
+    """
+
+    def __init__(
+        self,
+        kernels: List[np.ndarray],
+        biases: List[np.ndarray],
+        observation_keys: Sequence[str],
+        observation_sizes: Sequence[int],
+        action_low: np.ndarray,
+        action_high: np.ndarray,
+        activation: str = "relu",
+        batch_size: int = 1,
+    ) -> None:
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"The 'activation' argument is must be in {set(ACTIVATIONS)}")
+        self.kernels = [np.ascontiguousarray(kernel, dtype=np.float32) for kernel in kernels]
+        self.biases = [np.asarray(bias, dtype=np.float32) for bias in biases]
+        self.observation_keys = list(observation_keys)
+        self.observation_sizes = [int(size) for size in observation_sizes]
+        self.action_low = np.asarray(action_low, dtype=np.float32)
+        self.action_high = np.asarray(action_high, dtype=np.float32)
+        self.activation = activation
+        if sum(self.observation_sizes) != self.kernels[0].shape[0]:
+            raise ValueError("Observation sizes do not match the input size of the first layer")
+
+        self._slices = []
+        start = 0
+        for key, size in zip(self.observation_keys, self.observation_sizes):
+            self._slices.append((key, start, start + size))
+            start += size
+        # tanh output in [-1, 1] to action bounds, as Stable Baselines3 unscale_action
+        self._action_scale = 0.5 * (self.action_high - self.action_low)
+        self._action_center = self.action_low + self._action_scale
+        self._capacity = 0
+        self._allocate(batch_size)
+
+    @property
+    def input_size(self) -> int:
+        return self.kernels[0].shape[0]
+
+    @property
+    def action_size(self) -> int:
+        return self.kernels[-1].shape[1]
+
+    def _allocate(self, batch_size: int) -> None:
+        self._capacity = batch_size
+        self._input = np.empty((batch_size, self.input_size), dtype=np.float32)
+        self._outputs = [np.empty((batch_size, kernel.shape[1]), dtype=np.float32) for kernel in self.kernels]
+
+    def forward(self, features: np.ndarray) -> np.ndarray:
+        """Squashed actions in [-1, 1] of a (n, input_size) feature batch, a view of an internal buffer."""
+        n = len(features)
+        x = features
+        last = len(self.kernels) - 1
+        for i, (kernel, bias) in enumerate(zip(self.kernels, self.biases)):
+            out = self._outputs[i][:n]
+            np.matmul(x, kernel, out=out)
+            out += bias
+            if i == last:
+                np.tanh(out, out=out)
+            else:
+                _apply_activation(self.activation, out)
+            x = out
+        return x
+
+    def predict(
+        self,
+        observation: Dict[str, np.ndarray],
+        state: Any = None,
+        episode_start: Any = None,
+        deterministic: bool = True,
+    ) -> Tuple[np.ndarray, None]:
+        """Actions of a single or batched dict observation, call compatible with Stable Baselines3 predict."""
+        first = np.asarray(observation[self.observation_keys[0]])
+        single = first.ndim <= 1
+        n = 1 if single else len(first)
+        if n > self._capacity:
+            self._allocate(max(n, 2 * self._capacity))
+        features = self._input[:n]
+        for key, start, stop in self._slices:
+            features[:, start:stop] = np.reshape(observation[key], (n, stop - start))
+        actions = self.act(features)
+        return (actions[0] if single else actions), None
+
+    def act(self, features: np.ndarray) -> np.ndarray:
+        """Actions of a (n, input_size) batch of already flattened observations."""
+        if len(features) > self._capacity:
+            self._allocate(max(len(features), 2 * self._capacity))
+        actions = np.multiply(self.forward(features), self._action_scale)
+        actions += self._action_center
+        return actions
+
+    def __call__(self, observation: Dict[str, np.ndarray]) -> np.ndarray:
+        return self.predict(observation)[0]
+
+    def save(self, path: str) -> None:
+        """Writes an uncompressed .npz file, the layout NumpyPolicy.load reads."""
+        arrays = {
+            "version": np.array(NUMPY_POLICY_VERSION),
+            "activation": np.array(self.activation),
+            "observation_keys": np.array(self.observation_keys),
+            "observation_sizes": np.array(self.observation_sizes),
+            "action_low": self.action_low,
+            "action_high": self.action_high,
+        }
+        for i, (kernel, bias) in enumerate(zip(self.kernels, self.biases)):
+            arrays[f"kernel_{i}"] = np.ascontiguousarray(kernel)
+            arrays[f"bias_{i}"] = bias
+        np.savez(path, **arrays)
+
+    @classmethod
+    def from_arrays(cls, arrays: Any, **kwargs: Any) -> "NumpyPolicy":
+        if int(arrays["version"]) != NUMPY_POLICY_VERSION:
+            raise ValueError("Unsupported policy file version")
+        n_layers = sum(1 for name in arrays.keys() if name.startswith("kernel_"))
+        return cls(
+            kernels=[arrays[f"kernel_{i}"] for i in range(n_layers)],
+            biases=[arrays[f"bias_{i}"] for i in range(n_layers)],
+            observation_keys=[str(key) for key in arrays["observation_keys"]],
+            observation_sizes=arrays["observation_sizes"],
+            action_low=arrays["action_low"],
+            action_high=arrays["action_high"],
+            activation=str(arrays["activation"]),
+            **kwargs,
+        )
+
+    @classmethod
+    def load(cls, path: str, **kwargs: Any) -> "NumpyPolicy":
+        with np.load(path) as arrays:
+            return cls.from_arrays(arrays, **kwargs)
+
+
+def policy_from_state_dict(
+    state_dict: Dict[str, Any],
+    observation_space: Any,
+    action_space: Any,
+    activation: str = "relu",
+) -> NumpyPolicy:
+    """Builds a NumpyPolicy from the parameters of a Stable Baselines3 TD3 / DDPG policy.
+
+    Args:
+        state_dict (Dict[str, Any]): Policy parameters, tensors or arrays, keyed like "actor.mu.0.weight".
+        observation_space (gym.spaces.Dict): Observation space of Box entries the policy was trained on.
+        action_space (gym.spaces.Box): Action space the policy was trained on.
+        activation (str): Hidden layer activation of the actor.
+    """
+    arrays = {
+        name: np.asarray(value.detach().cpu().numpy() if hasattr(value, "detach") else value, dtype=np.float32)
+        for name, value in state_dict.items()
+        if name.startswith("actor.")
+    }
+    if any(name.startswith("actor.features_extractor.") for name in arrays):
+        raise ValueError("Only actors with a flattening features extractor can be exported")
+    if not hasattr(observation_space, "spaces") or not isinstance(observation_space.spaces, dict):
+        raise ValueError("Only dict observation spaces can be exported")
+
+    layers = sorted(
+        int(name.split(".")[2]) for name in arrays if name.startswith("actor.mu.") and name.endswith(".weight")
+    )
+    return NumpyPolicy(
+        kernels=[arrays[f"actor.mu.{i}.weight"].T for i in layers],
+        biases=[arrays[f"actor.mu.{i}.bias"] for i in layers],
+        observation_keys=list(observation_space.spaces.keys()),
+        observation_sizes=[int(np.prod(space.shape)) for space in observation_space.spaces.values()],
+        action_low=action_space.low,
+        action_high=action_space.high,
+        activation=activation,
+    )
+
+
+def export_sb3_actor(model_path: str, output_path: Optional[str] = None) -> NumpyPolicy:
+    """Extracts the actor of a saved Stable Baselines3 TD3 / DDPG model.zip, optionally saved to output_path.
+
+    Reads the zip archive directly, so neither an environment nor the replay buffer class is needed.
+    """
+    from stable_baselines3.common.save_util import load_from_zip_file
+
+    data, params, _ = load_from_zip_file(model_path, device="cpu")
+    activation_fn = data.get("policy_kwargs", {}).get("activation_fn")
+    activation = activation_fn.__name__.lower() if activation_fn is not None else "relu"
+    policy = policy_from_state_dict(params["policy"], data["observation_space"], data["action_space"], activation)
+    if output_path:
+        policy.save(output_path)
+    return policy
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export the actor of a saved TD3 model to a NumPy policy file.")
+    parser.add_argument("model", help="Saved Stable Baselines3 model.zip")
+    parser.add_argument("--output", help="Output .npz path, defaults to the model path with an .npz extension")
+    args = parser.parse_args()
+
+    output = args.output or args.model.rsplit(".", 1)[0] + ".npz"
+    exported = export_sb3_actor(args.model, output)
+    layer_sizes = [exported.input_size] + [kernel.shape[1] for kernel in exported.kernels]
+    print(f"Wrote {output}: layers {layer_sizes}, {exported.activation}, observation keys {exported.observation_keys}")
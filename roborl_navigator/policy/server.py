@@ -0,0 +1,293 @@
+import argparse
+import json
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from roborl_navigator.policy.loader import load_policy
+from roborl_navigator.policy.numpy_policy import NumpyPolicy
+from roborl_navigator.utils.profiling import PhaseTimer
+
+Address = Union[str, Tuple[str, int]]  # Unix socket path or (host, port)
+
+
+def parse_address(address: str) -> Address:
+    """"host:port" is a localhost TCP address, anything else a Unix socket path."""
+    host, _, port = address.rpartition(":")
+    return (host or "127.0.0.1", int(port)) if port.isdigit() else address
+
+
+def _create_socket(address: Address) -> socket.socket:
+    if isinstance(address, str):
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return connection
+
+
+def _recv_exact(connection: socket.socket, size: int) -> Optional[bytes]:
+    data = bytearray()
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return bytes(data)
+
+
+class PolicyServer:
+    """Serves the actions of one policy to local clients, concurrent requests are evaluated in micro-batches.
+
+    A client connection receives a JSON header with the observation layout, then sends flattened float32
+    observations and reads float32 actions, one request at a time. A batching thread waits up to max_wait after
+    the oldest queued request for the other connected clients, so concurrent clients share one forward pass.
+
+    Args:
+        policy (NumpyPolicy): Policy evaluated by the batching thread only.
+        address (Address): Unix socket path or (host, port), port 0 binds a free port.
+        max_batch_size (int): Most requests evaluated in one forward pass.
+        max_wait (float): Seconds a request waits for others to join its batch.
+        stats_window (int): Number of most recent requests the latency percentiles are computed over.
+    """
+
+    def __init__(
+        self,
+        policy: NumpyPolicy,
+        address: Address,
+        max_batch_size: int = 64,
+        max_wait: float = 0.002,
+        stats_window: int = 10_000,
+    ) -> None:
+        self.policy = policy
+        self.address = address
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.timer = PhaseTimer(enabled=True, window=stats_window)
+        self.request_size = policy.input_size * 4
+        self.header = json.dumps({
+            "observation_keys": policy.observation_keys,
+            "observation_sizes": policy.observation_sizes,
+            "action_size": policy.action_size,
+        }).encode()
+
+        self._requests = queue.Queue()
+        self._features = np.empty((max_batch_size, policy.input_size), dtype=np.float32)
+        self._connections = set()
+        self._threads = []
+        self._running = False
+        self._socket = None
+        self.n_requests = 0
+        self.n_batches = 0
+        self._start_time = 0.0
+
+    def start(self) -> "PolicyServer":
+        self._socket = _create_socket(self.address)
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+        self._socket.bind(self.address)
+        self._socket.listen()
+        if not isinstance(self.address, str):
+            self.address = self._socket.getsockname()[:2]
+        self._running = True
+        self._start_time = time.perf_counter()
+        for target in [self._accept_loop, self._batch_loop]:
+            thread = threading.Thread(target=target, name=f"policy_server{target.__name__}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        self._running = False
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)  # wakes the blocked accept
+        except OSError:
+            pass
+        self._socket.close()
+        for connection in list(self._connections):
+            self._close_connection(connection)
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def __enter__(self) -> "PolicyServer":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def _accept_loop(self) -> None:
+        while self._running:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                break
+            if not isinstance(self.address, str):
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._connections.add(connection)
+            threading.Thread(target=self._read_loop, args=(connection,), daemon=True).start()
+
+    def _read_loop(self, connection: socket.socket) -> None:
+        try:
+            connection.sendall(struct.pack("<I", len(self.header)) + self.header)
+            while self._running:
+                data = _recv_exact(connection, self.request_size)
+                if data is None:
+                    break
+                self._requests.put((time.perf_counter(), data, connection))
+        except OSError:
+            pass
+        finally:
+            self._connections.discard(connection)
+            connection.close()
+
+    def _batch_loop(self) -> None:
+        while self._running:
+            try:
+                batch = [self._requests.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            deadline = batch[0][0] + self.max_wait
+            # every client has at most one request in flight, waiting is pointless once all of them are queued
+            while len(batch) < min(self.max_batch_size, len(self._connections)):
+                timeout = deadline - time.perf_counter()
+                try:
+                    batch.append(self._requests.get(timeout=timeout) if timeout > 0 else self._requests.get_nowait())
+                except queue.Empty:
+                    break
+
+            features = self._features[:len(batch)]
+            for i, (_, data, _) in enumerate(batch):
+                features[i] = np.frombuffer(data, dtype=np.float32)
+            try:
+                actions = self.policy.act(features).astype(np.float32, copy=False)
+            except Exception as error:
+                # a client waiting for its action would block forever, closing its connection raises there instead
+                print(f"Policy evaluation failed, closing {len(batch)} connections: {error!r}")
+                for _, _, connection in batch:
+                    self._close_connection(connection)
+                continue
+            self.n_requests += len(batch)
+            self.n_batches += 1
+            for (arrival_time, _, connection), action in zip(batch, actions):
+                try:
+                    connection.sendall(action.tobytes())
+                except OSError:
+                    continue  # client disconnected
+                self.timer.record("latency", time.perf_counter() - arrival_time)
+
+    @staticmethod
+    def _close_connection(connection: socket.socket) -> None:
+        try:
+            connection.shutdown(socket.SHUT_RDWR)  # the connection thread sees EOF and closes it
+        except OSError:
+            pass
+
+    def reset_stats(self) -> None:
+        self.timer.reset()
+        self.n_requests = 0
+        self.n_batches = 0
+        self._start_time = time.perf_counter()
+
+    def stats(self) -> Dict[str, Any]:
+        """Request throughput since start, mean batch size and server side latency in ms (receive to send)."""
+        elapsed = time.perf_counter() - self._start_time
+        return {
+            "requests": self.n_requests,
+            "batches": self.n_batches,
+            "mean_batch_size": self.n_requests / max(self.n_batches, 1),
+            "requests_per_sec": self.n_requests / elapsed if elapsed > 0 else 0.0,
+            "latency_ms": self.timer.stats().get("latency", {}),
+        }
+
+
+class PolicyClient:
+    """Connection to a PolicyServer with a Stable Baselines3 like predict for single dict observations.
+
+    Args:
+        address (Address): Unix socket path or (host, port) of the server.
+        timeout (float): Socket timeout in seconds, None blocks.
+    """
+
+    def __init__(self, address: Address, timeout: Optional[float] = None) -> None:
+        self.socket = _create_socket(address)
+        self.socket.settimeout(timeout)
+        self.socket.connect(address)
+        header_size = struct.unpack("<I", _recv_exact(self.socket, 4))[0]
+        header = json.loads(_recv_exact(self.socket, header_size))
+        self.observation_keys = header["observation_keys"]
+        self.action_size = header["action_size"]
+        self._slices = []
+        start = 0
+        for key, size in zip(self.observation_keys, header["observation_sizes"]):
+            self._slices.append((key, start, start + size))
+            start += size
+        self._features = np.empty(start, dtype=np.float32)
+
+    def predict(
+        self,
+        observation: Dict[str, np.ndarray],
+        state: Any = None,
+        episode_start: Any = None,
+        deterministic: bool = True,
+    ) -> Tuple[np.ndarray, None]:
+        for key, start, stop in self._slices:
+            self._features[start:stop] = np.ravel(observation[key])
+        self.socket.sendall(self._features.tobytes())
+        data = _recv_exact(self.socket, self.action_size * 4)
+        if data is None:
+            raise ConnectionError("Policy server closed the connection")
+        return np.frombuffer(data, dtype=np.float32).copy(), None
+
+    def __call__(self, observation: Dict[str, np.ndarray]) -> np.ndarray:
+        return self.predict(observation)[0]
+
+    def close(self) -> None:
+        self.socket.close()
+
+    def __enter__(self) -> "PolicyClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve the actions of a trained policy to local clients.")
+    parser.add_argument("--model", required=True, help="model.zip saved by Trainer or its exported .npz actor")
+    parser.add_argument("--address", default="/tmp/roborl_policy.sock", help="Unix socket path or host:port")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--stats-interval", type=float, default=10.0, help="Seconds between statistics prints")
+    args = parser.parse_args()
+
+    server = PolicyServer(
+        load_policy(args.model),
+        parse_address(args.address),
+        max_batch_size=args.max_batch_size,
+        max_wait=args.max_wait_ms / 1000,
+    ).start()
+    print(f"Serving {args.model} on {server.address}")
+    try:
+        while True:
+            time.sleep(args.stats_interval)
+            server_stats = server.stats()
+            latency = server_stats["latency_ms"]
+            print(
+                f"{server_stats['requests_per_sec']:.0f} requests/s, mean batch {server_stats['mean_batch_size']:.1f},"
+                f" p50 {latency.get('p50', 0.0):.2f} ms, p99 {latency.get('p99', 0.0):.2f} ms"
+            )
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from roborl_navigator.policy import (
+    clear_policy_cache,
+    load_policy,
+    policy_from_state_dict,
+    process_uptime,
+)
+from roborl_navigator.policy.loader import (
+    ensure_exported,
+    mmap_npz,
+)
+from roborl_navigator.policy.test.numpy_policy_test import (
+    ACTION_SPACE,
+    OBSERVATION_SPACE,
+    random_state_dict,
+    sample_observations,
+)
+
+
+class TestPolicyLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.policy = policy_from_state_dict(random_state_dict(self.rng, [16, 64, 7]), OBSERVATION_SPACE, ACTION_SPACE)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "model.npz")
+        self.policy.save(self.path)
+        clear_policy_cache()
+
+    def tearDown(self):
+        clear_policy_cache()
+        self.directory.cleanup()
+
+    def test_parameters_are_memory_mapped(self):
+        arrays = mmap_npz(self.path)
+        self.assertIsInstance(arrays["kernel_0"], np.memmap)
+        np.testing.assert_array_equal(arrays["kernel_1"], self.policy.kernels[1])
+        self.assertEqual(int(arrays["version"]), 1)
+        self.assertEqual(str(arrays["activation"]), "relu")
+
+    def test_load_matches_saved_policy(self):
+        observations = sample_observations(self.rng, 5)
+        loaded = load_policy(self.path)
+        np.testing.assert_array_equal(loaded.predict(observations)[0], self.policy.predict(observations)[0])
+
+    def test_policy_is_cached_per_path(self):
+        first = load_policy(self.path)
+        self.assertIs(load_policy(self.path), first)
+        os.utime(self.path, (time.time() + 10, time.time() + 10))
+        self.assertIsNot(load_policy(self.path), first)
+
+    def test_up_to_date_export_is_reused(self):
+        model_path = os.path.join(self.directory.name, "model.zip")
+        with open(model_path, "w") as model_file:
+            model_file.write("not read")
+        os.utime(model_path, (time.time() - 10, time.time() - 10))
+        self.assertEqual(ensure_exported(model_path), self.path)
+        self.assertIs(load_policy(model_path), load_policy(self.path))
+
+    def test_process_uptime(self):
+        uptime = process_uptime()
+        self.assertGreater(uptime, 0.0)
+        self.assertLess(uptime, 24 * 3600)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+import gymnasium as gym
+import numpy as np
+
+from roborl_navigator.policy import (
+    NumpyPolicy,
+    export_sb3_actor,
+    policy_from_state_dict,
+)
+
+OBSERVATION_SPACE = gym.spaces.Dict(
+    dict(
+        robot_pos=gym.spaces.Box(-10.0, 10.0, shape=(7,), dtype=np.float32),
+        obstacle_dist_vector=gym.spaces.Box(-10.0, 10.0, shape=(3,), dtype=np.float32),
+        desired_goal=gym.spaces.Box(-10.0, 10.0, shape=(3,), dtype=np.float32),
+        achieved_goal=gym.spaces.Box(-10.0, 10.0, shape=(3,), dtype=np.float32),
+    )
+)
+ACTION_SPACE = gym.spaces.Box(-1.0, 1.0, shape=(7,), dtype=np.float32)
+
+
+def random_state_dict(rng, layer_sizes):
+    state_dict = {}
+    for i, (n_in, n_out) in enumerate(zip(layer_sizes[:-1], layer_sizes[1:])):
+        state_dict[f"actor.mu.{2 * i}.weight"] = rng.normal(0, 1 / np.sqrt(n_in), (n_out, n_in)).astype(np.float32)
+        state_dict[f"actor.mu.{2 * i}.bias"] = rng.normal(0, 0.1, n_out).astype(np.float32)
+    state_dict["critic.qf0.0.weight"] = np.zeros((1, 1), dtype=np.float32)  # ignored
+    return state_dict
+
+
+def reference_actions(state_dict, observations, action_space):
+    """Straightforward float64 forward pass of the MultiInputPolicy actor."""
+    x = np.concatenate([observations[key] for key in sorted(observations)], axis=-1).astype(np.float64)
+    layers = sorted(int(name.split(".")[2]) for name in state_dict if name.startswith("actor.mu.") and "weight" in name)
+    for j, i in enumerate(layers):
+        x = x @ state_dict[f"actor.mu.{i}.weight"].T + state_dict[f"actor.mu.{i}.bias"]
+        x = np.tanh(x) if j == len(layers) - 1 else np.maximum(x, 0)
+    return action_space.low + 0.5 * (x + 1.0) * (action_space.high - action_space.low)
+
+
+def sample_observations(rng, n):
+    return {key: rng.uniform(-1, 1, (n, *space.shape)).astype(np.float32) for key, space in OBSERVATION_SPACE.items()}
+
+
+class TestNumpyPolicy(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rng = np.random.default_rng(0)
+        cls.state_dict = random_state_dict(cls.rng, [16, 400, 300, 7])
+        cls.policy = policy_from_state_dict(cls.state_dict, OBSERVATION_SPACE, ACTION_SPACE)
+
+    def test_observation_keys_follow_space_order(self):
+        self.assertEqual(self.policy.observation_keys, list(OBSERVATION_SPACE.spaces))
+        self.assertEqual(self.policy.observation_sizes, [3, 3, 3, 7])
+
+    def test_batch_matches_reference(self):
+        observations = sample_observations(self.rng, 64)
+        actions, state = self.policy.predict(observations)
+        self.assertIsNone(state)
+        self.assertEqual(actions.shape, (64, 7))
+        np.testing.assert_allclose(actions, reference_actions(self.state_dict, observations, ACTION_SPACE), atol=1e-5)
+
+    def test_single_observation(self):
+        observations = sample_observations(self.rng, 3)
+        batch = self.policy.predict(observations)[0]
+        single = self.policy({key: value[1] for key, value in observations.items()})
+        self.assertEqual(single.shape, (7,))
+        np.testing.assert_allclose(single, batch[1], atol=1e-6)
+
+    def test_buffers_are_reused(self):
+        observations = sample_observations(self.rng, 8)
+        first = self.policy.predict(observations)[0]
+        self.policy.predict(sample_observations(self.rng, 300))
+        np.testing.assert_array_equal(self.policy.predict(observations)[0], first)
+
+    def test_save_and_load(self):
+        observations = sample_observations(self.rng, 4)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "actor.npz")
+            self.policy.save(path)
+            loaded = NumpyPolicy.load(path)
+        self.assertEqual(loaded.observation_keys, self.policy.observation_keys)
+        np.testing.assert_array_equal(loaded.predict(observations)[0], self.policy.predict(observations)[0])
+
+    def test_invalid_activation(self):
+        with self.assertRaises(ValueError):
+            policy_from_state_dict(self.state_dict, OBSERVATION_SPACE, ACTION_SPACE, activation="gelu")
+
+    @unittest.skipUnless(importlib.util.find_spec("stable_baselines3"), "Stable Baselines3 is not installed")
+    def test_parity_with_sb3_predict(self):
+        from stable_baselines3 import (
+            HerReplayBuffer,
+            TD3,
+        )
+        from roborl_navigator.environment.env_panda_bullet import PandaBulletEnv
+
+        env = PandaBulletEnv(orientation_task=False)
+        try:
+            model = TD3("MultiInputPolicy", env, replay_buffer_class=HerReplayBuffer, device="cpu", seed=0)
+            with tempfile.TemporaryDirectory() as directory:
+                model.save(os.path.join(directory, "model"))
+                policy = export_sb3_actor(os.path.join(directory, "model.zip"))
+            observations = [env.reset(seed=seed)[0] for seed in range(16)]
+            for observation in observations:
+                expected = model.predict(observation, deterministic=True)[0]
+                np.testing.assert_allclose(policy.predict(observation)[0], expected, atol=1e-5)
+            batch = {key: np.stack([observation[key] for observation in observations]) for key in observations[0]}
+            np.testing.assert_allclose(policy.predict(batch)[0], model.predict(batch, deterministic=True)[0], atol=1e-5)
+        finally:
+            env.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from roborl_navigator.policy import policy_from_state_dict
+from roborl_navigator.policy.server import (
+    PolicyClient,
+    PolicyServer,
+    parse_address,
+)
+from roborl_navigator.policy.test.numpy_policy_test import (
+    ACTION_SPACE,
+    OBSERVATION_SPACE,
+    random_state_dict,
+    sample_observations,
+)
+
+
+class TestPolicyServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        state_dict = random_state_dict(rng, [16, 64, 7])
+        cls.policy = policy_from_state_dict(state_dict, OBSERVATION_SPACE, ACTION_SPACE)
+        cls.reference = policy_from_state_dict(state_dict, OBSERVATION_SPACE, ACTION_SPACE)
+        cls.observations = sample_observations(rng, 32)
+
+    def observation(self, i):
+        return {key: value[i] for key, value in self.observations.items()}
+
+    def test_parse_address(self):
+        self.assertEqual(parse_address("localhost:6200"), ("localhost", 6200))
+        self.assertEqual(parse_address(":6200"), ("127.0.0.1", 6200))
+        self.assertEqual(parse_address("/tmp/policy.sock"), "/tmp/policy.sock")
+
+    def test_unix_socket_actions_match_policy(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "policy.sock")
+            with PolicyServer(self.policy, path, max_wait=0.0) as server:
+                with PolicyClient(path, timeout=5.0) as client:
+                    for i in range(4):
+                        expected = self.reference.predict(self.observation(i))[0]
+                        np.testing.assert_allclose(client.predict(self.observation(i))[0], expected, atol=1e-6)
+                self.assertEqual(server.stats()["requests"], 4)
+            self.assertFalse(os.path.exists(path))
+
+    def test_concurrent_clients_are_batched(self):
+        n_clients, n_requests = 8, 10
+        errors = []
+        barrier = threading.Barrier(n_clients)
+        expected = self.reference.predict(self.observations)[0]
+
+        with PolicyServer(self.policy, ("127.0.0.1", 0), max_batch_size=8, max_wait=0.05) as server:
+            def run_client(index):
+                try:
+                    with PolicyClient(server.address, timeout=5.0) as client:
+                        barrier.wait()
+                        for _ in range(n_requests):
+                            np.testing.assert_allclose(client(self.observation(index)), expected[index], atol=1e-6)
+                except Exception as error:
+                    errors.append(error)
+
+            threads = [threading.Thread(target=run_client, args=(i,)) for i in range(n_clients)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stats = server.stats()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(stats["requests"], n_clients * n_requests)
+        self.assertGreater(stats["mean_batch_size"], 1.0)
+        self.assertLessEqual(stats["mean_batch_size"], 8.0)
+        self.assertIn("p99", stats["latency_ms"])
+
+    def test_failed_batch_closes_connections(self):
+        state_dict = random_state_dict(np.random.default_rng(1), [16, 64, 7])
+        policy = policy_from_state_dict(state_dict, OBSERVATION_SPACE, ACTION_SPACE)
+        act = policy.act
+        failures = [True]
+
+        def act_once_failing(features):
+            if failures and failures.pop():
+                raise RuntimeError("policy failed")
+            return act(features)
+
+        policy.act = act_once_failing
+        with PolicyServer(policy, ("127.0.0.1", 0), max_wait=0.0) as server:
+            with PolicyClient(server.address, timeout=5.0) as client:
+                with self.assertRaises(ConnectionError):
+                    client.predict(self.observation(0))
+            with PolicyClient(server.address, timeout=5.0) as client:
+                expected = policy.predict(self.observation(1))[0]
+                np.testing.assert_allclose(client.predict(self.observation(1))[0], expected, atol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
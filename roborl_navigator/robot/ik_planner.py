@@ -0,0 +1,124 @@
+import time
+from typing import (
+    Any,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+
+from roborl_navigator.robot.panda_kinematics import inverse_kinematics
+from roborl_navigator.utils import (
+    PandaConverter,
+    time_parameterize,
+)
+
+try:
+    import rospy
+    from moveit_msgs.msg import RobotTrajectory
+    from moveit_msgs.srv import (
+        GetStateValidity,
+        GetStateValidityRequest,
+    )
+    from trajectory_msgs.msg import JointTrajectoryPoint
+except ImportError:
+    print("ROS Packages are not initialized!")
+
+# moveit_msgs/MoveItErrorCodes values of the plan() result
+SUCCESS = 1
+PLANNING_FAILED = -1
+GOAL_IN_COLLISION = -10
+NO_IK_SOLUTION = -31
+
+
+class IKPlanner:
+    """Baseline without sampling: an IK solve, a straight joint space line to the solution and a collision check.
+
+    plan() returns the same (success, trajectory, planning time, error code) tuple as MoveGroupCommander.plan(),
+    so it is timed the same way as the MoveIt planners and can run in a PlannerPortfolio. Collisions are checked
+    against the planning scene with the /check_state_validity service, the goal first and then the line.
+
+    Args:
+        move_group (Any): MoveGroupCommander of the arm, gives the start joints and joint names.
+        max_joint_step (float): Largest joint move between two checked states of the line in radians.
+        velocity_scaling (float): Scaling of the Panda velocity and acceleration limits of the trajectory.
+        restarts (int): Random seeds tried when the IK from the current joints does not converge.
+        seed (int): Seed of the restart sampling.
+    """
+
+    def __init__(
+        self,
+        move_group: Any,
+        max_joint_step: float = 0.05,
+        velocity_scaling: float = 0.3,
+        restarts: int = 3,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.move_group = move_group
+        self.max_joint_step = max_joint_step
+        self.velocity_scaling = velocity_scaling
+        self.restarts = restarts
+        self.rng = np.random.default_rng(seed)
+        self.limits = np.array(PandaConverter().real_panda_limits)
+        self.state_validity_proxy = None
+
+    @staticmethod
+    def target_to_pose(target: Any) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Position and (x, y, z, w) quaternion of a Pose or PoseStamped, no quaternion if it is all zeros."""
+        pose = getattr(target, "pose", target)
+        position = np.array([pose.position.x, pose.position.y, pose.position.z])
+        orientation = np.array([pose.orientation.x, pose.orientation.y, pose.orientation.z, pose.orientation.w])
+        return position, orientation if np.linalg.norm(orientation) > 1e-6 else None
+
+    def solve(self, target: Any, start: np.ndarray) -> Optional[np.ndarray]:
+        """Joint angles reaching a pose target, seeded with start and then with random joint angles."""
+        position, orientation = self.target_to_pose(target)
+        seed = start
+        for _ in range(self.restarts + 1):
+            joint_angles, success = inverse_kinematics(position, orientation, seed)
+            if success:
+                return joint_angles
+            seed = self.rng.uniform(self.limits[:, 0], self.limits[:, 1])
+        return None
+
+    def is_valid(self, joint_angles: np.ndarray) -> bool:
+        if self.state_validity_proxy is None:
+            rospy.wait_for_service('/check_state_validity')
+            self.state_validity_proxy = rospy.ServiceProxy('/check_state_validity', GetStateValidity)
+        request = GetStateValidityRequest()
+        request.group_name = self.move_group.get_name()
+        request.robot_state.joint_state.name = self.move_group.get_active_joints()
+        request.robot_state.joint_state.position = np.asarray(joint_angles).tolist()
+        return self.state_validity_proxy(request).valid
+
+    def plan(self, target: Any = None) -> Tuple[bool, Any, float, int]:
+        """Plans to a Pose, PoseStamped or 7 joint values, returns (success, trajectory, planning time, error code)."""
+        start_time = time.perf_counter()
+        trajectory = RobotTrajectory()
+        trajectory.joint_trajectory.joint_names = self.move_group.get_active_joints()
+        start = np.asarray(self.move_group.get_current_joint_values(), dtype=np.float64)
+
+        if isinstance(target, (list, tuple, np.ndarray)):
+            goal = np.asarray(target, dtype=np.float64)
+        else:
+            goal = self.solve(target, start)
+        if goal is None:
+            return False, trajectory, time.perf_counter() - start_time, NO_IK_SOLUTION
+        if not self.is_valid(goal):
+            return False, trajectory, time.perf_counter() - start_time, GOAL_IN_COLLISION
+
+        n_segments = max(int(np.ceil(np.abs(goal - start).max() / self.max_joint_step)), 1)
+        waypoints = start + np.linspace(0.0, 1.0, n_segments + 1)[:, None] * (goal - start)
+        if not all(self.is_valid(waypoint) for waypoint in waypoints[1:-1]):
+            return False, trajectory, time.perf_counter() - start_time, PLANNING_FAILED
+
+        # the trajectory keeps only the line ends, the checked states in between lie on it
+        waypoints = waypoints[[0, -1]]
+        times, velocities = time_parameterize(waypoints, self.velocity_scaling, self.velocity_scaling)
+        for position, velocity, time_from_start in zip(waypoints, velocities, times):
+            point = JointTrajectoryPoint()
+            point.positions = position.tolist()
+            point.velocities = velocity.tolist()
+            point.time_from_start = rospy.Duration.from_sec(time_from_start)
+            trajectory.joint_trajectory.points.append(point)
+        return True, trajectory, time.perf_counter() - start_time, SUCCESS
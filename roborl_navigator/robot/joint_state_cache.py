@@ -0,0 +1,61 @@
+import threading
+from typing import (
+    Any,
+    List,
+    Optional,
+)
+
+import numpy as np
+
+try:
+    import rospy
+    from sensor_msgs.msg import JointState
+except ImportError:
+    print("ROS Packages are not initialized!")
+
+
+class JointStateCache:
+    """Keeps the latest /joint_states message of the given joints, reading it is a memory access.
+
+    Args:
+        joint_names (List[str]): Joints to keep, in the order returned by get_joint_angles.
+        topic (str): JointState topic, messages without all of the joints (e.g. gripper only) are skipped.
+        timeout (float): Seconds get_joint_angles waits for the first message before raising a TimeoutError.
+    """
+
+    def __init__(self, joint_names: List[str], topic: str = "/joint_states", timeout: float = 10.0) -> None:
+        self.joint_names = list(joint_names)
+        self.topic = topic
+        self.timeout = timeout
+        self.positions = None
+        self.velocities = None
+        self.stamp = None
+        self.sequence = 0  # increases with every accepted message
+        self._indices = {}  # message joint order -> indices of joint_names
+        self._received = threading.Event()
+        self.subscriber = rospy.Subscriber(topic, JointState, self.callback, queue_size=1, tcp_nodelay=True)
+
+    def callback(self, msg: Any) -> None:
+        names = tuple(msg.name)
+        indices = self._indices.get(names)
+        if indices is None:
+            if not all(name in names for name in self.joint_names):
+                return
+            indices = np.array([names.index(name) for name in self.joint_names])
+            self._indices[names] = indices
+        positions = np.asarray(msg.position)[indices]
+        velocities = np.asarray(msg.velocity)[indices] if len(msg.velocity) == len(names) else None
+        self.positions, self.velocities, self.stamp = positions, velocities, msg.header.stamp
+        self.sequence += 1
+        self._received.set()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Blocks until the first message is received, raises a TimeoutError after timeout (default self.timeout)."""
+        timeout = self.timeout if timeout is None else timeout
+        if not self._received.wait(timeout):
+            raise TimeoutError(f"No message with all of {self.joint_names} received on {self.topic} within {timeout} s")
+
+    def get_joint_angles(self) -> np.ndarray:
+        if not self._received.is_set():
+            self.wait()
+        return self.positions.copy()
@@ -0,0 +1,205 @@
+import threading
+import time
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from collections import deque
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
+
+import numpy as np
+
+from roborl_navigator.robot.joint_state_cache import JointStateCache
+from roborl_navigator.utils import PANDA_MAX_JOINT_VELOCITY
+
+try:
+    import rospy
+    from std_msgs.msg import Float64MultiArray
+    from trajectory_msgs.msg import (
+        JointTrajectory,
+        JointTrajectoryPoint,
+    )
+except ImportError:
+    print("ROS Packages are not initialized!")
+
+
+class JointCommandInterface(ABC):
+    """Receives small joint setpoints at a fixed rate, e.g. a trajectory or servo controller."""
+
+    @abstractmethod
+    def send(self, positions: np.ndarray, velocities: np.ndarray, duration: float) -> None:
+        pass
+
+    @abstractmethod
+    def get_joint_angles(self) -> np.ndarray:
+        pass
+
+
+class IntegratingJointController(JointCommandInterface):
+    """Local stand-in for a joint controller, integrates commands with a first order lag.
+
+    Args:
+        initial_joint_angles (np.ndarray): Start configuration.
+        mode (str): "position" tracks the commanded positions, "velocity" integrates the commanded velocities.
+        time_constant (float): Lag of the simulated joints in seconds.
+    """
+
+    def __init__(self, initial_joint_angles: np.ndarray, mode: str = "position", time_constant: float = 0.02) -> None:
+        if mode not in ["position", "velocity"]:
+            raise ValueError("The 'mode' argument is must be in {'position', 'velocity'}")
+        self.mode = mode
+        self.time_constant = time_constant
+        self._joint_angles = np.array(initial_joint_angles, dtype=np.float64)
+        self._command_positions = self._joint_angles.copy()
+        self._command_velocities = np.zeros_like(self._joint_angles)
+        self._last_update = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _integrate(self) -> None:
+        now = time.perf_counter()
+        dt = now - self._last_update
+        self._last_update = now
+        if self.mode == "position":
+            tracking = 1.0 - np.exp(-dt / self.time_constant)
+            self._joint_angles += (self._command_positions - self._joint_angles) * tracking
+        else:
+            self._joint_angles += self._command_velocities * dt
+
+    def send(self, positions: np.ndarray, velocities: np.ndarray, duration: float) -> None:
+        with self._lock:
+            self._integrate()
+            self._command_positions = np.array(positions, dtype=np.float64)
+            self._command_velocities = np.array(velocities, dtype=np.float64)
+
+    def get_joint_angles(self) -> np.ndarray:
+        with self._lock:
+            self._integrate()
+            return self._joint_angles.copy()
+
+
+class ROSJointCommandInterface(JointCommandInterface):
+    """Streams setpoints to a ros_control controller and reads /joint_states.
+
+    Position mode publishes a single point JointTrajectory, e.g. to position_joint_trajectory_controller.
+    Velocity mode publishes Float64MultiArray velocities to a joint group velocity controller.
+    """
+
+    def __init__(
+        self,
+        joint_names: List[str],
+        command_topic: str = "/position_joint_trajectory_controller/command",
+        mode: str = "position",
+        joint_states: Optional[JointStateCache] = None,
+    ) -> None:
+        if mode not in ["position", "velocity"]:
+            raise ValueError("The 'mode' argument is must be in {'position', 'velocity'}")
+        self.mode = mode
+        self.joint_names = joint_names
+        message_type = JointTrajectory if mode == "position" else Float64MultiArray
+        self.publisher = rospy.Publisher(command_topic, message_type, queue_size=1, tcp_nodelay=True)
+        self.joint_states = joint_states if joint_states is not None else JointStateCache(joint_names)
+
+    def send(self, positions: np.ndarray, velocities: np.ndarray, duration: float) -> None:
+        if self.mode == "velocity":
+            self.publisher.publish(Float64MultiArray(data=np.asarray(velocities).tolist()))
+            return
+        point = JointTrajectoryPoint()
+        point.positions = np.asarray(positions).tolist()
+        point.velocities = np.asarray(velocities).tolist()
+        point.time_from_start = rospy.Duration.from_sec(duration)
+        trajectory = JointTrajectory()
+        trajectory.joint_names = self.joint_names
+        trajectory.points = [point]
+        self.publisher.publish(trajectory)
+
+    def get_joint_angles(self) -> np.ndarray:
+        return self.joint_states.get_joint_angles()
+
+
+class JointCommandStreamer:
+    """Streams setpoints towards the latest joint target at a fixed rate from a background thread.
+
+    set_target never blocks, so policy inference and observation updates can run at their own pace while the
+    commanded setpoint moves towards the target at most max_velocity * dt per tick.
+
+    Args:
+        interface (JointCommandInterface): Controller receiving the setpoints.
+        rate (float): Streaming frequency in Hz.
+        velocity_scaling (float): Fraction of the Panda joint velocity limits used for setpoints.
+    """
+
+    def __init__(self, interface: JointCommandInterface, rate: float = 100.0, velocity_scaling: float = 0.3) -> None:
+        self.interface = interface
+        self.rate = rate
+        self.max_velocity = PANDA_MAX_JOINT_VELOCITY * velocity_scaling
+        self.setpoint = None
+        self.target = None
+        self.tick_periods = deque(maxlen=1000)
+        self._lock = threading.Lock()
+        self._running = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.setpoint = self.interface.get_joint_angles()
+        self.target = self.setpoint.copy()
+        self._running.set()
+        self._thread = threading.Thread(target=self._loop, name="joint_command_streamer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def set_target(self, joint_values: np.ndarray) -> None:
+        with self._lock:
+            self.target = np.array(joint_values, dtype=np.float64)
+
+    def reached(self, tolerance: float = 1e-3) -> bool:
+        with self._lock:
+            return bool(np.max(np.abs(self.target - self.setpoint)) <= tolerance)
+
+    def _loop(self) -> None:
+        period = 1.0 / self.rate
+        next_tick = time.perf_counter()
+        last_tick = next_tick
+        while self._running.is_set():
+            with self._lock:
+                step = np.clip(self.target - self.setpoint, -self.max_velocity * period, self.max_velocity * period)
+                self.setpoint = self.setpoint + step
+                setpoint = self.setpoint
+            self.interface.send(setpoint, step / period, period)
+
+            now = time.perf_counter()
+            self.tick_periods.append(now - last_tick)
+            last_tick = now
+            next_tick += period
+            if next_tick > now:
+                time.sleep(next_tick - now)
+            else:
+                next_tick = now  # overrun, do not try to catch up with a burst
+
+    def statistics(self) -> Dict[str, float]:
+        """Achieved streaming frequency and tick jitter over the last 1000 ticks."""
+        periods = np.array(self.tick_periods)[1:]
+        if len(periods) == 0:
+            return {"frequency": 0.0, "period_p50": 0.0, "period_p99": 0.0}
+        return {
+            "frequency": float(1.0 / periods.mean()),
+            "period_p50": float(np.percentile(periods, 50)),
+            "period_p99": float(np.percentile(periods, 99)),
+        }
+
+    def __enter__(self) -> "JointCommandStreamer":
+        self.start()
+        return self
+
+    def __exit__(self, *args: Optional[object]) -> None:
+        self.stop()
@@ -0,0 +1,230 @@
+from typing import (
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from roborl_navigator.utils import (
+    PandaConverter,
+    euler_to_quaternion,
+    quaternion_to_rotation_matrix,
+    rotation_matrix_to_euler,
+)
+
+# Modified DH parameters (a, d, alpha) of the Franka Emika Panda, the last row is the flange
+PANDA_DH_PARAMETERS = np.array([
+    [0.0, 0.333, 0.0],
+    [0.0, 0.0, -np.pi / 2],
+    [0.0, 0.316, np.pi / 2],
+    [0.0825, 0.0, np.pi / 2],
+    [-0.0825, 0.384, -np.pi / 2],
+    [0.0, 0.0, np.pi / 2],
+    [0.088, 0.0, np.pi / 2],
+    [0.0, 0.107, 0.0],
+])
+
+# Flange to hand TCP (panda_hand_tcp / fr3_hand_tcp): rotated -45 degrees around z, 0.1034 m along z
+PANDA_TCP_OFFSET = 0.1034
+PANDA_TCP_ROTATION = -np.pi / 4
+# Bullet end-effector link (panda_grasptarget, link 11 of franka_panda/panda.urdf)
+BULLET_PANDA_TCP_OFFSET = 0.105
+
+PANDA_CONVERTER = PandaConverter()
+# d(bullet angle) / d(real angle) of the linear PandaConverter real to bullet mapping, per joint
+REAL_TO_BULLET_SCALE = (
+    np.ptp(PANDA_CONVERTER.bullet_panda_limits, axis=-1) / np.ptp(PANDA_CONVERTER.real_panda_limits, axis=-1)
+)
+FK_CHUNK_SIZE = 65_536  # keeps the (N, 4, 4) temporaries in cache sized blocks for large batches
+
+
+def dh_transform(a: float, d: float, alpha: float, theta: np.ndarray) -> np.ndarray:
+    """Modified (Craig) DH transform RotX(alpha) TransX(a) RotZ(theta) TransZ(d), theta may be (N,)"""
+    theta = np.asarray(theta, dtype=np.float64)
+    ct, st = np.cos(theta), np.sin(theta)
+    ca, sa = np.cos(alpha), np.sin(alpha)
+    transform = np.zeros(theta.shape + (4, 4))
+    transform[..., 0, 0] = ct
+    transform[..., 0, 1] = -st
+    transform[..., 0, 3] = a
+    transform[..., 1, 0] = st * ca
+    transform[..., 1, 1] = ct * ca
+    transform[..., 1, 2] = -sa
+    transform[..., 1, 3] = -d * sa
+    transform[..., 2, 0] = st * sa
+    transform[..., 2, 1] = ct * sa
+    transform[..., 2, 2] = ca
+    transform[..., 2, 3] = d * ca
+    transform[..., 3, 3] = 1.0
+    return transform
+
+
+def tcp_transform(tcp_offset: float = PANDA_TCP_OFFSET, tcp_rotation: float = PANDA_TCP_ROTATION) -> np.ndarray:
+    return dh_transform(0.0, tcp_offset, 0.0, tcp_rotation)
+
+
+def _model_joint_angles(joint_angles: np.ndarray, bullet_model: bool) -> np.ndarray:
+    joint_angles = np.asarray(joint_angles, dtype=np.float64)[..., :7]
+    if bullet_model:
+        # Same mapping BulletPanda.set_joint_angles applies before commanding the simulator
+        return PANDA_CONVERTER.real_to_bullet(joint_angles)
+    return joint_angles
+
+
+def _joint_frames(joint_angles: np.ndarray, tcp: np.ndarray) -> np.ndarray:
+    """(N, 9, 4, 4) poses of the 7 joint frames, the flange and the TCP for (N, 7) joint angles."""
+    frames = np.empty((len(joint_angles), 9, 4, 4))
+    transform = None
+    for i, (a, d, alpha) in enumerate(PANDA_DH_PARAMETERS):
+        theta = joint_angles[:, i] if i < 7 else np.zeros(len(joint_angles))
+        link = dh_transform(a, d, alpha, theta)
+        transform = link if transform is None else np.matmul(transform, link)
+        frames[:, i] = transform
+    frames[:, 8] = np.matmul(transform, tcp)
+    return frames
+
+
+def forward_kinematics(
+    joint_angles: np.ndarray,
+    tcp_offset: Optional[float] = None,
+    tcp_rotation: float = PANDA_TCP_ROTATION,
+    bullet_model: bool = False,
+) -> np.ndarray:
+    """Returns end-effector poses in the Panda base frame.
+
+    Args:
+        joint_angles (np.ndarray): (7,) or (N, 7) real robot joint angles.
+        tcp_offset (float): Flange to end-effector distance, defaults to the hand TCP of the selected model.
+        bullet_model (bool): Pose of the Bullet Panda commanded with these values, i.e. after the
+            PandaConverter real to bullet mapping and up to the Bullet end-effector link.
+
+    Returns:
+        np.ndarray: (4, 4) or (N, 4, 4) homogeneous transforms.
+    """
+    if tcp_offset is None:
+        tcp_offset = BULLET_PANDA_TCP_OFFSET if bullet_model else PANDA_TCP_OFFSET
+    joint_angles = _model_joint_angles(joint_angles, bullet_model)
+    single = joint_angles.ndim == 1
+    joint_angles = np.atleast_2d(joint_angles)
+    tcp = tcp_transform(tcp_offset, tcp_rotation)
+
+    transforms = np.empty((len(joint_angles), 4, 4))
+    for start in range(0, len(joint_angles), FK_CHUNK_SIZE):
+        chunk = joint_angles[start:start + FK_CHUNK_SIZE]
+        transform = None
+        for i, (a, d, alpha) in enumerate(PANDA_DH_PARAMETERS[:7]):
+            link = dh_transform(a, d, alpha, chunk[:, i])
+            transform = link if transform is None else np.matmul(transform, link)
+        # flange and TCP are fixed, fold them into one constant transform
+        flange = dh_transform(*PANDA_DH_PARAMETERS[7], 0.0)
+        transforms[start:start + FK_CHUNK_SIZE] = np.matmul(transform, flange @ tcp)
+    return transforms[0] if single else transforms
+
+
+def ee_pose(joint_angles: np.ndarray, bullet_model: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the end-effector (position, euler orientation) for 7 real robot joint angles."""
+    transform = forward_kinematics(joint_angles, bullet_model=bullet_model)
+    return transform[:3, 3], rotation_matrix_to_euler(transform[:3, :3])
+
+
+def ee_poses(
+    joint_angles: np.ndarray, quaternion: bool = True, bullet_model: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Batched end-effector poses.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (N, 3) positions and (N, 4) quaternions (x, y, z, w) or (N, 3) euler.
+    """
+    transforms = forward_kinematics(np.atleast_2d(joint_angles), bullet_model=bullet_model)
+    orientations = rotation_matrix_to_euler(transforms[:, :3, :3])
+    if quaternion:
+        orientations = euler_to_quaternion(orientations)
+    return transforms[:, :3, 3], orientations
+
+
+def jacobian(
+    joint_angles: np.ndarray,
+    tcp_offset: Optional[float] = None,
+    tcp_rotation: float = PANDA_TCP_ROTATION,
+    bullet_model: bool = False,
+) -> np.ndarray:
+    """Geometric Jacobian of the end-effector in the base frame, rows are (vx, vy, vz, wx, wy, wz).
+
+    Returns:
+        np.ndarray: (6, 7) or (N, 6, 7) Jacobians with respect to the given joint angles, with bullet_model the
+            columns include the PandaConverter real to bullet scale.
+    """
+    if tcp_offset is None:
+        tcp_offset = BULLET_PANDA_TCP_OFFSET if bullet_model else PANDA_TCP_OFFSET
+    joint_angles = _model_joint_angles(joint_angles, bullet_model)
+    single = joint_angles.ndim == 1
+    joint_angles = np.atleast_2d(joint_angles)
+
+    tcp = tcp_transform(tcp_offset, tcp_rotation)
+    result = np.empty((len(joint_angles), 6, 7))
+    for start in range(0, len(joint_angles), FK_CHUNK_SIZE):
+        frames = _joint_frames(joint_angles[start:start + FK_CHUNK_SIZE], tcp)
+        axes = frames[:, :7, :3, 2]
+        origins = frames[:, :7, :3, 3]
+        ee_position = frames[:, 8, :3, 3]
+        result[start:start + FK_CHUNK_SIZE, :3] = np.cross(axes, ee_position[:, None, :] - origins).transpose(0, 2, 1)
+        result[start:start + FK_CHUNK_SIZE, 3:] = axes.transpose(0, 2, 1)
+    if bullet_model:
+        result *= REAL_TO_BULLET_SCALE
+    return result[0] if single else result
+
+
+def inverse_kinematics(
+    position: np.ndarray,
+    orientation: Optional[np.ndarray] = None,
+    seed: Optional[np.ndarray] = None,
+    damping: float = 0.05,
+    max_iterations: int = 100,
+    max_step: float = 0.2,
+    tolerance: float = 1e-4,
+) -> Tuple[np.ndarray, bool]:
+    """Damped least squares IK of the real Panda hand TCP, starting from seed and staying within the joint limits.
+
+    Args:
+        position (np.ndarray): (3,) target position in the base frame.
+        orientation (np.ndarray): (4,) quaternion (x, y, z, w) or (3, 3) rotation, None solves the position only.
+        seed (np.ndarray): (7,) start joint angles, e.g. the current ones, defaults to the middle of the limits.
+        damping (float): Damping factor, trades accuracy near singularities for bounded joint steps.
+        max_step (float): Largest joint space step of an iteration in radians.
+        tolerance (float): Position (m) and orientation (rad) error norm counted as solved.
+
+    Returns:
+        Tuple[np.ndarray, bool]: (7,) joint angles and whether they reach the target within tolerance.
+    """
+    limits = np.array(PANDA_CONVERTER.real_panda_limits)
+    position = np.asarray(position, dtype=np.float64)
+    if orientation is not None:
+        orientation = np.asarray(orientation, dtype=np.float64)
+        orientation = quaternion_to_rotation_matrix(orientation) if orientation.shape == (4,) else orientation
+    rows = 6 if orientation is not None else 3
+    joint_angles = limits.mean(axis=-1) if seed is None else np.clip(np.asarray(seed, dtype=np.float64)[:7], *limits.T)
+
+    tcp = tcp_transform()
+    for _ in range(max_iterations + 1):
+        frames = _joint_frames(joint_angles[None], tcp)[0]
+        error = np.empty(rows)
+        error[:3] = position - frames[8, :3, 3]
+        if orientation is not None:
+            error[3:] = Rotation.from_matrix(orientation @ frames[8, :3, :3].T).as_rotvec()
+        if np.linalg.norm(error) < tolerance:
+            return joint_angles, True
+
+        axes = frames[:7, :3, 2]
+        jacobian_matrix = np.empty((rows, 7))
+        jacobian_matrix[:3] = np.cross(axes, frames[8, :3, 3] - frames[:7, :3, 3]).T
+        if orientation is not None:
+            jacobian_matrix[3:] = axes.T
+        step = jacobian_matrix.T @ np.linalg.solve(
+            jacobian_matrix @ jacobian_matrix.T + damping ** 2 * np.eye(rows), error
+        )
+        step_norm = np.linalg.norm(step)
+        if step_norm > max_step:
+            step *= max_step / step_norm
+        joint_angles = np.clip(joint_angles + step, limits[:, 0], limits[:, 1])
+    return joint_angles, False
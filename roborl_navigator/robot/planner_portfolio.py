@@ -0,0 +1,206 @@
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+
+from roborl_navigator.utils import tracer
+
+try:
+    import moveit_commander
+except ImportError:
+    print("ROS Packages are not initialized!")
+
+PLANNER_IDS = {
+    "rrt": "RRTConnect",
+    "prm": "PRMstar",
+    "rrtstar": "RRTstar",
+    "bitrrt": "BiTRRT",
+}
+
+
+class PlannerPortfolio:
+    """Plans the same goal with several planner configurations at once and keeps the first or best plan.
+
+    Every planner request gets its own MoveGroupCommander, so the requests run in parallel threads without sharing
+    targets or planner settings. Planning requests can not be preempted, a planner still running from an earlier
+    call keeps its move group and the next call plans with another group of the same planner from a pool, so no
+    call waits for the losers of the previous one. Local planners (anything with a plan(target) method returning
+    a MoveIt like (success, trajectory, planning_time, error_code) tuple) can be added to compare against the same
+    timings, calls share them one at a time.
+
+    Args:
+        group_name (str): MoveIt planning group, e.g. "panda_manipulator".
+        planners (List[str]): Keys of PLANNER_IDS or OMPL planner ids.
+        planning_time (float): Planning time limit of every MoveIt planner in seconds.
+        local_planners (Dict[str, Any]): Additional planners by name.
+    """
+
+    def __init__(
+        self,
+        group_name: str,
+        planners: Optional[List[str]] = None,
+        planning_time: float = 1.9,
+        local_planners: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.group_name = group_name
+        self.planning_time = planning_time
+        self.planners = {}
+        for name in planners if planners is not None else ["rrt", "prm"]:
+            self.planners[name] = self._create_group(name)
+        self.local_planners = dict(local_planners or {})
+        self.planners.update(self.local_planners)
+        # requests of earlier calls may still be running, leave room for a few overlapping calls
+        self.executor = ThreadPoolExecutor(max_workers=4 * len(self.planners), thread_name_prefix="planner_portfolio")
+        self.timings = []  # one record per finished planner request
+        self._idle_groups = {name: [group] for name, group in self.planners.items() if name not in self.local_planners}
+        self._local_locks = {name: threading.Lock() for name in self.local_planners}
+        self._pending = []
+        self._calls = 0
+        self._lock = threading.Lock()
+
+    def _create_group(self, name: str) -> Any:
+        group = moveit_commander.MoveGroupCommander(self.group_name)
+        group.set_planner_id(PLANNER_IDS.get(name.lower(), name))
+        group.set_planning_time(self.planning_time)
+        return group
+
+    def _acquire_group(self, name: str) -> Any:
+        with self._lock:
+            if self._idle_groups[name]:
+                return self._idle_groups[name].pop()
+        return self._create_group(name)
+
+    def _release_group(self, name: str, group: Any) -> None:
+        with self._lock:
+            self._idle_groups[name].append(group)
+
+    def _plan(self, name: str, target: Any, call: int, start_time: float) -> Tuple[Any, float]:
+        try:
+            with tracer.span(f"plan {name}", "moveit", call=call):
+                if name in self.local_planners:
+                    with self._local_locks[name]:
+                        plan = self._call_planner(name, self.planners[name], target)
+                else:
+                    group = self._acquire_group(name)
+                    try:
+                        plan = self._call_planner(name, group, target)
+                    finally:
+                        self._release_group(name, group)
+        except Exception as error:
+            print(f"Planner {name} failed: {error}")
+            plan = (False, None, 0.0, -1)
+        planning_time = (time.perf_counter() - start_time) * 1000
+        with self._lock:
+            self.timings.append({
+                "call": call,
+                "planner": name,
+                "planning_time": planning_time,
+                "success": bool(plan[0]),
+                "duration": self.plan_duration(plan),
+            })
+        return plan, planning_time
+
+    def _call_planner(self, name: str, planner: Any, target: Any) -> Any:
+        if name in self.local_planners:
+            return planner.plan(target)
+        if isinstance(target, (list, tuple, np.ndarray)):
+            return planner.plan(list(target))
+        planner.set_pose_target(target)
+        plan = planner.plan()
+        planner.clear_pose_targets()
+        return plan
+
+    @staticmethod
+    def plan_duration(plan: Any) -> float:
+        """Execution time of a successful plan in seconds, inf otherwise."""
+        if not plan[0] or not plan[1].joint_trajectory.points:
+            return float("inf")
+        return plan[1].joint_trajectory.points[-1].time_from_start.to_sec()
+
+    def plan(
+        self,
+        target: Any,
+        mode: str = "first",
+        deadline: Optional[float] = None,
+        planners: Optional[List[str]] = None,
+    ) -> Tuple[Optional[Any], Dict[str, Any]]:
+        """Plans a pose or joint target with all planners.
+
+        Args:
+            target (Any): Pose, PoseStamped or joint values.
+            mode (str): "first" returns the first valid plan, "best" the shortest trajectory found before deadline.
+            deadline (float): Seconds to wait for the planners, None waits for all of them in "best" mode.
+            planners (List[str]): Subset of the planners to run.
+
+        Returns:
+            Tuple[Optional[Any], Dict[str, Any]]: The MoveIt plan tuple, None if nothing valid was found, and an
+            info dictionary with the chosen planner, the wall time of the call in ms as latency, the number of
+            requests of earlier calls still running and the planning time of every planner that finished in time.
+        """
+        if mode not in ["first", "best"]:
+            raise ValueError("The 'mode' argument is must be in {'first', 'best'}")
+        start_time = time.perf_counter()
+        still_running = sum(not future.done() for future in self._pending)
+        self._calls += 1
+        futures = {
+            self.executor.submit(self._plan, name, target, self._calls, start_time): name
+            for name in (planners if planners is not None else self.planners)
+        }
+        self._pending = [future for future in self._pending if not future.done()] + list(futures)
+
+        best_plan, best_planner, best_duration = None, None, float("inf")
+        timings = {}
+        remaining = set(futures)
+        while remaining:
+            timeout = None if deadline is None else max(deadline - (time.perf_counter() - start_time), 0.0)
+            done, remaining = wait(remaining, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break  # deadline
+            for future in done:
+                plan, planning_time = future.result()
+                timings[futures[future]] = {"planning_time": planning_time, "success": bool(plan[0])}
+                duration = self.plan_duration(plan)
+                if duration < best_duration:
+                    best_plan, best_planner, best_duration = plan, futures[future], duration
+            if best_plan is not None and mode == "first":
+                break
+
+        info = {
+            "planner": best_planner,
+            "latency": (time.perf_counter() - start_time) * 1000,
+            "still_running": still_running,
+            "planners": timings,
+        }
+        return best_plan, info
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Success rate and planning time statistics in ms of every planner over all calls."""
+        with self._lock:
+            timings = list(self.timings)
+        result = {}
+        for name in self.planners:
+            records = [record for record in timings if record["planner"] == name]
+            successful = [record["planning_time"] for record in records if record["success"]]
+            result[name] = {
+                "requests": len(records),
+                "success_rate": len(successful) / len(records) if records else 0.0,
+                "mean": float(np.mean(successful)) if successful else float("nan"),
+                "min": float(np.min(successful)) if successful else float("nan"),
+                "max": float(np.max(successful)) if successful else float("nan"),
+            }
+        return result
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
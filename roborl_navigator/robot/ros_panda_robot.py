@@ -1,29 +1,89 @@
+import time
 from collections import deque
-from typing import Optional
+from typing import (
+    Any,
+    Optional,
+    Tuple,
+)
 
 import numpy as np
 
 from roborl_navigator.robot.base_robot import Robot
+from roborl_navigator.robot.joint_state_cache import JointStateCache
+from roborl_navigator.robot.joint_streamer import (
+    JointCommandStreamer,
+    ROSJointCommandInterface,
+)
+from roborl_navigator.robot.panda_kinematics import ee_pose
 from roborl_navigator.simulation.ros.ros_sim import ROSSim
-from roborl_navigator.utils import PlannerResult
+from roborl_navigator.utils import (
+    PlannerResult,
+    interpolate_waypoints,
+    time_parameterize,
+    traced,
+)
 
 try:
     import moveit_commander
+    import rospy
+    from moveit_msgs.msg import RobotTrajectory
+    from moveit_msgs.srv import (
+        GetStateValidity,
+        GetStateValidityRequest,
+    )
     from tf.transformations import euler_from_quaternion, quaternion_from_euler
+    from trajectory_msgs.msg import JointTrajectoryPoint
 except ImportError:
     print("ROS Packages are not initialized!")
 
 
 class ROSRobot(Robot):
 
-    def __init__(self, sim: ROSSim, orientation_task: bool = False, real_robot: bool = False) -> None:
+    def __init__(
+        self,
+        sim: ROSSim,
+        orientation_task: bool = False,
+        real_robot: bool = False,
+        direct_joint_threshold: Optional[float] = None,
+        streaming_rate: Optional[float] = None,
+        local_kinematics: bool = True,
+    ) -> None:
         super().__init__(sim, orientation_task)
         self.real_robot = real_robot
         self.robot_name = "fr3" if real_robot else "panda"
         self.move_group = moveit_commander.MoveGroupCommander(self.robot_name + "_manipulator")
         self.status_queue = deque(maxlen=5)
 
+        # Observations are read from the latest /joint_states message and a local forward kinematics model
+        # instead of a move_group request per call. The local model assumes the robot base at the world origin,
+        # it is checked against move_group once and the end-effector pose falls back to move_group otherwise.
+        self.joint_states = None
+        self.local_kinematics = False
+        self._ee_pose = None
+        self._ee_pose_sequence = -1
+        if local_kinematics:
+            self.joint_states = JointStateCache(self.move_group.get_active_joints())
+            self.local_kinematics = self.check_local_kinematics()
+
+        # Joint goals whose largest joint delta (rad) is below this threshold skip planning, None always plans
+        self.direct_joint_threshold = direct_joint_threshold
+        self.direct_joint_velocity = 0.5  # rad/s used to time direct joint goals
+        self.state_validity_proxy = None
+
+        # Streaming actuation replaces the blocking MoveIt calls with setpoints sent at streaming_rate Hz.
+        # Setpoints are not collision checked, the controller is expected to supervise them.
+        self.streamer = None
+        if streaming_rate is not None:
+            interface = ROSJointCommandInterface(self.move_group.get_active_joints(), joint_states=self.joint_states)
+            self.streamer = JointCommandStreamer(interface, rate=streaming_rate)
+            self.streamer.start()
+        # Duration of the last control_joints call phases, in ms
+        self.planning_time = 0.0
+        self.execution_time = 0.0
+
     def get_ee_position(self) -> np.ndarray:
+        if self.local_kinematics:
+            return self.get_ee_pose()[0].astype(np.float32)
         position = self.move_group.get_current_pose().pose.position
         return np.array([
             position.x,
@@ -32,6 +92,8 @@ class ROSRobot(Robot):
         ]).astype(np.float32)
 
     def get_ee_orientation(self) -> np.ndarray:
+        if self.local_kinematics:
+            return self.get_ee_pose()[1].astype(np.float32)
         orientation = self.move_group.get_current_pose().pose.orientation
         return np.array(
             euler_from_quaternion([
@@ -42,6 +104,26 @@ class ROSRobot(Robot):
             ])
         ).astype(np.float32)
 
+    # ROS Specific
+    def check_local_kinematics(self, tolerance: float = 0.005) -> bool:
+        """Whether the local end-effector position is within tolerance (m) of the move_group pose."""
+        position = self.move_group.get_current_pose().pose.position
+        local_position = ee_pose(self.joint_states.get_joint_angles())[0]
+        error = np.linalg.norm(local_position - [position.x, position.y, position.z])
+        if error > tolerance:
+            print(f"Local forward kinematics is {error:.3f} m off the move_group pose, EE poses come from move_group")
+            return False
+        return True
+
+    def get_ee_pose(self) -> Tuple[np.ndarray, np.ndarray]:
+        """End-effector (position, euler orientation), computed once per joint state message."""
+        self.joint_states.wait()
+        sequence = self.joint_states.sequence
+        if self._ee_pose_sequence != sequence:
+            self._ee_pose = ee_pose(self.joint_states.get_joint_angles())
+            self._ee_pose_sequence = sequence
+        return self._ee_pose
+
     def get_ee_velocity(self) -> np.ndarray:
         return np.zeros(3)
 
@@ -50,8 +132,13 @@ class ROSRobot(Robot):
         return self.get_joint_angles() + joint_actions
 
     def get_joint_angles(self) -> np.ndarray:
+        if self.joint_states is not None:
+            return self.joint_states.get_joint_angles()
+        if self.streamer is not None:
+            return self.streamer.interface.get_joint_angles()
         return np.array(self.move_group.get_current_joint_values())
 
+    @traced(category="robot")
     def set_action(self, action: np.ndarray) -> Optional[bool]:
         action = action.copy()
         action = np.clip(action, self.action_space.low, self.action_space.high)
@@ -81,29 +168,100 @@ class ROSRobot(Robot):
     def set_joint_neutral(self) -> None:
         self.set_joint_angles(self.neutral_joint_values)
 
+    @traced(category="moveit")
     def control_joints(self, joint_values: np.ndarray) -> PlannerResult:
-        if self.real_robot:
-            joint_values = joint_values.tolist()
-            self.move_group.go(joint_values, True)
-            try:
-                self.move_group.go(joint_values, True)
-            except moveit_commander.MoveItCommanderException:
-                return PlannerResult.MOVEIT_ERROR
-            self.move_group.stop()
+        joint_values = np.asarray(joint_values, dtype=np.float64)
+        self.planning_time = 0.0
+        self.execution_time = 0.0
+
+        if self.streamer is not None:
+            self.streamer.set_target(joint_values)
             return PlannerResult.SUCCESS
-        else:
-            try:
-                success, plan, _, _ = self.move_group.plan(joint_values)
-            except moveit_commander.MoveItCommanderException:
-                return PlannerResult.MOVEIT_ERROR
-            if not success:
-                return PlannerResult.COLLISION
-            try:
-                self.move_group.go(joint_values, True)
-            except moveit_commander.MoveItCommanderException:
-                return PlannerResult.MOVEIT_ERROR
+
+        if self.direct_joint_threshold is not None:
+            start = self.get_joint_angles()
+            if np.max(np.abs(joint_values - start)) <= self.direct_joint_threshold:
+                return self.execute_trajectory(self.create_direct_trajectory(joint_values, start))
+
+        start_time = time.perf_counter()
+        try:
+            success, plan, _, _ = self.move_group.plan(joint_values.tolist())
+        except moveit_commander.MoveItCommanderException:
+            return PlannerResult.MOVEIT_ERROR
+        finally:
+            self.planning_time = (time.perf_counter() - start_time) * 1000
+        if not success:
+            return PlannerResult.COLLISION
+        # Execute the validated plan instead of letting go() plan the same goal again
+        return self.execute_trajectory(plan)
+
+    # ROS Specific
+    @traced(category="moveit")
+    def execute_trajectory(self, trajectory: Any) -> PlannerResult:
+        start_time = time.perf_counter()
+        try:
+            success = self.move_group.execute(trajectory, wait=True)
+        except moveit_commander.MoveItCommanderException:
+            return PlannerResult.MOVEIT_ERROR
+        finally:
             self.move_group.stop()
-            return PlannerResult.SUCCESS
+            self.execution_time = (time.perf_counter() - start_time) * 1000
+        return PlannerResult.SUCCESS if success else PlannerResult.MOVEIT_ERROR
+
+    # ROS Specific
+    def create_direct_trajectory(self, joint_values: np.ndarray, start: Optional[np.ndarray] = None) -> Any:
+        """Two point trajectory from the current state, MoveIt rejects trajectories not starting there."""
+        start = self.get_joint_angles() if start is None else np.asarray(start, dtype=np.float64)
+        duration = max(np.max(np.abs(joint_values - start)) / self.direct_joint_velocity, 0.05)
+        trajectory = RobotTrajectory()
+        trajectory.joint_trajectory.joint_names = self.move_group.get_active_joints()
+        for positions, time_from_start in [(start, 0.0), (joint_values, duration)]:
+            point = JointTrajectoryPoint()
+            point.positions = np.asarray(positions).tolist()
+            point.velocities = [0.0] * len(positions)
+            point.time_from_start = rospy.Duration.from_sec(time_from_start)
+            trajectory.joint_trajectory.points.append(point)
+        return trajectory
+
+    # ROS Specific
+    @traced(category="moveit")
+    def execute_joint_waypoints(
+        self, waypoints: np.ndarray, velocity_scaling: float = 0.3, validate: bool = True
+    ) -> PlannerResult:
+        """Time parameterizes (T, 7) joint waypoints and executes them as one trajectory, without planning."""
+        self.planning_time = 0.0
+        self.execution_time = 0.0
+        start_time = time.perf_counter()
+        times, velocities = time_parameterize(waypoints, velocity_scaling, velocity_scaling)
+        trajectory = RobotTrajectory()
+        trajectory.joint_trajectory.joint_names = self.move_group.get_active_joints()
+        for position, velocity, time_from_start in zip(waypoints, velocities, times):
+            point = JointTrajectoryPoint()
+            point.positions = position.tolist()
+            point.velocities = velocity.tolist()
+            point.time_from_start = rospy.Duration.from_sec(time_from_start)
+            trajectory.joint_trajectory.points.append(point)
+        valid = not validate or self.validate_joint_waypoints(waypoints)
+        self.planning_time = (time.perf_counter() - start_time) * 1000
+        if not valid:
+            return PlannerResult.COLLISION
+        return self.execute_trajectory(trajectory)
+
+    # ROS Specific
+    @traced(category="moveit")
+    def validate_joint_waypoints(self, waypoints: np.ndarray, max_step: float = 0.01) -> bool:
+        """Checks the waypoints and the straight joint space motion between them, every max_step (rad)."""
+        if self.state_validity_proxy is None:
+            rospy.wait_for_service('/check_state_validity')
+            self.state_validity_proxy = rospy.ServiceProxy('/check_state_validity', GetStateValidity)
+        request = GetStateValidityRequest()
+        request.group_name = self.move_group.get_name()
+        request.robot_state.joint_state.name = self.move_group.get_active_joints()
+        for state in interpolate_waypoints(waypoints, max_step):
+            request.robot_state.joint_state.position = state.tolist()
+            if not self.state_validity_proxy(request).valid:
+                return False
+        return True
 
     # ROS Specific
     def stuck_check(self) -> bool:
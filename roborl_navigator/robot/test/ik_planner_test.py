@@ -0,0 +1,87 @@
+import numpy as np
+import unittest
+from scipy.spatial.transform import Rotation
+
+from roborl_navigator.robot.panda_kinematics import forward_kinematics
+from roborl_navigator.simulation.bullet.bullet_ros import (
+    install_bullet_ros,
+    uninstall_bullet_ros,
+)
+
+
+class TestIKPlanner(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.backend = install_bullet_ros(
+            service_latency=0.0, topic_latency=0.0, planning_latency=0.0, execution_time_scale=0.0
+        )
+        import moveit_commander
+        from geometry_msgs.msg import Pose
+        from roborl_navigator.robot import ik_planner
+        cls.ik_planner = ik_planner
+        cls.Pose = Pose
+        cls.move_group = moveit_commander.MoveGroupCommander("panda_manipulator")
+        cls.planner = ik_planner.IKPlanner(cls.move_group, seed=0)
+        cls.start = np.array(cls.move_group.get_current_joint_values())
+
+    @classmethod
+    def tearDownClass(cls):
+        uninstall_bullet_ros()
+
+    def create_pose(self, position, orientation=None):
+        pose = self.Pose()
+        pose.position.x, pose.position.y, pose.position.z = position
+        if orientation is not None:
+            pose.orientation.x, pose.orientation.y, pose.orientation.z, pose.orientation.w = orientation
+        return pose
+
+    def test_position_target(self):
+        target = forward_kinematics(self.start + 0.1)[:3, 3]
+        success, trajectory, planning_time, error_code = self.planner.plan(self.create_pose(target))
+        self.assertTrue(success)
+        self.assertEqual(error_code, self.ik_planner.SUCCESS)
+        points = trajectory.joint_trajectory.points
+        np.testing.assert_allclose(points[0].positions, self.start, atol=1e-9)
+        np.testing.assert_allclose(forward_kinematics(np.array(points[-1].positions))[:3, 3], target, atol=1e-4)
+        self.assertGreater(points[-1].time_from_start.to_sec(), 0.0)
+        self.assertGreater(planning_time, 0.0)
+
+    def test_pose_target(self):
+        transform = forward_kinematics(self.start + 0.1)
+        quaternion = Rotation.from_matrix(transform[:3, :3]).as_quat()
+        success, trajectory, _, _ = self.planner.plan(self.create_pose(transform[:3, 3], quaternion))
+        self.assertTrue(success)
+        solution = np.array(trajectory.joint_trajectory.points[-1].positions)
+        np.testing.assert_allclose(forward_kinematics(solution), transform, atol=1e-4)
+
+    def test_joint_target(self):
+        success, trajectory, _, _ = self.planner.plan(self.start + 0.05)
+        self.assertTrue(success)
+        np.testing.assert_allclose(trajectory.joint_trajectory.points[-1].positions, self.start + 0.05)
+
+    def test_unreachable_and_colliding_targets(self):
+        success, _, _, error_code = self.planner.plan(self.create_pose([2.0, 0.0, 0.5]))
+        self.assertFalse(success)
+        self.assertEqual(error_code, self.ik_planner.NO_IK_SOLUTION)
+
+        into_table = self.start.copy()
+        into_table[1] = 1.7
+        success, _, _, error_code = self.planner.plan(into_table)
+        self.assertFalse(success)
+        self.assertEqual(error_code, self.ik_planner.GOAL_IN_COLLISION)
+
+    def test_portfolio_local_planner(self):
+        from roborl_navigator.robot.planner_portfolio import PlannerPortfolio
+        portfolio = PlannerPortfolio("panda_manipulator", [], local_planners={"ik": self.planner})
+        try:
+            target = forward_kinematics(self.start + 0.1)[:3, 3]
+            plan, info = portfolio.plan(self.create_pose(target))
+            self.assertIsNotNone(plan)
+            self.assertEqual(info["planner"], "ik")
+        finally:
+            portfolio.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import time
+
+import numpy as np
+import unittest
+
+from roborl_navigator.robot.joint_streamer import (
+    IntegratingJointController,
+    JointCommandStreamer,
+)
+
+
+class TestJointCommandStreamer(unittest.TestCase):
+
+    def setUp(self):
+        self.start = np.array([0.0, 0.4, 0.0, -1.78, 0.0, 2.24, 0.77])
+        self.target = self.start + np.array([0.1, -0.05, 0.05, 0.1, 0.0, -0.1, 0.05])
+
+    def wait_until(self, condition, timeout=5.0):
+        deadline = time.perf_counter() + timeout
+        while not condition() and time.perf_counter() < deadline:
+            time.sleep(0.005)
+
+    def test_position_streaming_reaches_target(self):
+        controller = IntegratingJointController(self.start, mode="position")
+        with JointCommandStreamer(controller, rate=200.0, velocity_scaling=0.5) as streamer:
+            streamer.set_target(self.target)
+            self.wait_until(streamer.reached)
+            self.assertTrue(streamer.reached())
+            time.sleep(0.2)
+            statistics = streamer.statistics()
+        np.testing.assert_allclose(controller.get_joint_angles(), self.target, atol=1e-3)
+        self.assertGreater(statistics["frequency"], 50.0)
+
+    def test_velocity_streaming_reaches_target(self):
+        controller = IntegratingJointController(self.start, mode="velocity")
+        with JointCommandStreamer(controller, rate=200.0, velocity_scaling=0.5) as streamer:
+            streamer.set_target(self.target)
+            self.wait_until(streamer.reached)
+            time.sleep(0.05)
+        np.testing.assert_allclose(controller.get_joint_angles(), self.target, atol=0.02)
+
+    def test_setpoints_are_velocity_limited(self):
+        controller = IntegratingJointController(self.start, mode="position")
+        streamer = JointCommandStreamer(controller, rate=100.0, velocity_scaling=0.1)
+        streamer.start()
+        streamer.set_target(self.start + 1.0)
+        time.sleep(0.1)
+        streamer.stop()
+        max_travel = streamer.max_velocity * (0.1 + 0.05)
+        self.assertTrue(np.all(np.abs(streamer.setpoint - self.start) <= max_travel))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import numpy as np
+import unittest
+
+from roborl_navigator.robot.bullet_panda_robot import BulletPanda
+from roborl_navigator.robot.panda_kinematics import (
+    ee_pose,
+    ee_poses,
+    forward_kinematics,
+    inverse_kinematics,
+    jacobian,
+)
+from roborl_navigator.simulation.bullet import BulletSim
+from roborl_navigator.utils import PandaConverter
+
+
+class TestPandaKinematics(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        converter = PandaConverter()
+        limits = np.array(converter.real_panda_limits)
+        rng = np.random.default_rng(0)
+        cls.joint_angles = rng.uniform(limits[:, 0], limits[:, 1], (50, 7))
+
+    def test_ready_pose(self):
+        # franka_ros "ready" configuration, hand TCP points straight down in front of the robot
+        transform = forward_kinematics(np.array([0.0, -np.pi / 4, 0.0, -3 * np.pi / 4, 0.0, np.pi / 2, np.pi / 4]))
+        np.testing.assert_allclose(transform[:3, 3], [0.3069, 0.0, 0.4869], atol=1e-3)
+        np.testing.assert_allclose(transform[:3, :3], np.diag([1.0, -1.0, -1.0]), atol=1e-6)
+
+    def test_euler_orientation(self):
+        position, orientation = ee_pose(np.array([0.0, 0.4, 0.0, -1.78, 0.0, 2.24, 0.77]))
+        self.assertEqual(position.shape, (3,))
+        self.assertEqual(orientation.shape, (3,))
+        self.assertAlmostEqual(abs(orientation[0]), np.pi, delta=0.01)
+
+    def test_batch_matches_single(self):
+        transforms = forward_kinematics(self.joint_angles)
+        self.assertEqual(transforms.shape, (50, 4, 4))
+        for joint_angles, transform in zip(self.joint_angles[:5], transforms[:5]):
+            np.testing.assert_allclose(forward_kinematics(joint_angles), transform, atol=1e-12)
+        positions, quaternions = ee_poses(self.joint_angles)
+        self.assertEqual(positions.shape, (50, 3))
+        self.assertEqual(quaternions.shape, (50, 4))
+
+    def test_matches_bullet_panda(self):
+        sim = BulletSim(render_mode="rgb_array")
+        try:
+            robot = BulletPanda(sim)
+            positions, orientations = ee_poses(self.joint_angles, quaternion=False, bullet_model=True)
+            for joint_angles, position, orientation in zip(self.joint_angles, positions, orientations):
+                robot.set_joint_angles(joint_angles)
+                np.testing.assert_allclose(robot.get_ee_position(), position, atol=1e-4)
+                bullet_matrix = np.array(sim.physics_client.getMatrixFromQuaternion(
+                    sim.physics_client.getQuaternionFromEuler(robot.get_ee_orientation())
+                )).reshape(3, 3)
+                fk_matrix = forward_kinematics(joint_angles, bullet_model=True)[:3, :3]
+                np.testing.assert_allclose(bullet_matrix, fk_matrix, atol=1e-4)
+        finally:
+            sim.close()
+
+    def test_jacobian_matches_finite_differences(self):
+        epsilon = 1e-6
+        for bullet_model in [False, True]:
+            with self.subTest(bullet_model=bullet_model):
+                jacobians = jacobian(self.joint_angles[:10], bullet_model=bullet_model)
+                for joint_angles, analytic in zip(self.joint_angles[:10], jacobians):
+                    transform = forward_kinematics(joint_angles, bullet_model=bullet_model)
+                    numeric = np.zeros((6, 7))
+                    for i in range(7):
+                        shifted = joint_angles.copy()
+                        shifted[i] += epsilon
+                        shifted_transform = forward_kinematics(shifted, bullet_model=bullet_model)
+                        numeric[:3, i] = (shifted_transform[:3, 3] - transform[:3, 3]) / epsilon
+                        # angular velocity from the skew symmetric part of dR R^T
+                        rotation_rate = (shifted_transform[:3, :3] - transform[:3, :3]) / epsilon @ transform[:3, :3].T
+                        numeric[3:, i] = [rotation_rate[2, 1], rotation_rate[0, 2], rotation_rate[1, 0]]
+                    np.testing.assert_allclose(analytic, numeric, atol=1e-4)
+
+    def test_inverse_kinematics(self):
+        seed = np.array([0.0, -np.pi / 4, 0.0, -3 * np.pi / 4, 0.0, np.pi / 2, np.pi / 4])
+        limits = np.array(PandaConverter().real_panda_limits)
+        for joint_angles in self.joint_angles[:10]:
+            transform = forward_kinematics(joint_angles)
+            solution, success = inverse_kinematics(transform[:3, 3], seed=seed)
+            self.assertTrue(success)
+            np.testing.assert_allclose(forward_kinematics(solution)[:3, 3], transform[:3, 3], atol=1e-4)
+            self.assertTrue(np.all((solution >= limits[:, 0]) & (solution <= limits[:, 1])))
+
+        # a small pose change from the seed converges with the orientation
+        target = forward_kinematics(seed + 0.2)
+        solution, success = inverse_kinematics(target[:3, 3], target[:3, :3], seed=seed)
+        self.assertTrue(success)
+        np.testing.assert_allclose(forward_kinematics(solution), target, atol=1e-4)
+
+    def test_inverse_kinematics_out_of_reach(self):
+        _, success = inverse_kinematics(np.array([2.0, 0.0, 0.5]))
+        self.assertFalse(success)
+
+
+if __name__ == '__main__':
+    unittest.main()
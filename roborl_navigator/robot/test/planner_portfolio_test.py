@@ -0,0 +1,94 @@
+import numpy as np
+import time
+import unittest
+
+from roborl_navigator.simulation.bullet.bullet_ros import (
+    install_bullet_ros,
+    uninstall_bullet_ros,
+)
+
+
+class TestPlannerPortfolio(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.backend = install_bullet_ros(
+            service_latency=0.0,
+            topic_latency=0.0,
+            planner_latencies={"RRTConnect": 0.05, "PRMstar": 0.3},
+            execution_time_scale=0.0,
+        )
+        from roborl_navigator.robot.planner_portfolio import PlannerPortfolio
+        cls.portfolio = PlannerPortfolio("panda_manipulator", ["rrt", "prm"])
+        cls.start = np.array(cls.portfolio.planners["rrt"].get_current_joint_values())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.portfolio.close()
+        uninstall_bullet_ros()
+
+    def test_first_returns_fastest_planner(self):
+        plan, info = self.portfolio.plan(self.start + 0.05, mode="first")
+        self.assertIsNotNone(plan)
+        self.assertEqual(info["planner"], "rrt")
+        self.assertLess(info["latency"], 250)
+        self.assertEqual(list(info["planners"]), ["rrt"])
+
+    def test_calls_do_not_wait_for_earlier_planners(self):
+        self.portfolio.plan(self.start + 0.05, mode="first")  # PRMstar keeps planning after this returns
+        start_time = time.perf_counter()
+        plan, info = self.portfolio.plan(self.start + 0.05, mode="first")
+        wall_time = (time.perf_counter() - start_time) * 1000
+        self.assertIsNotNone(plan)
+        self.assertGreaterEqual(info["still_running"], 1)
+        self.assertLess(wall_time, 250)
+        self.assertLessEqual(info["latency"], wall_time)
+        self.assertGreater(info["latency"], 0.9 * wall_time)
+
+    def test_best_waits_for_all_planners(self):
+        plan, info = self.portfolio.plan(self.start + 0.05, mode="best")
+        self.assertIsNotNone(plan)
+        self.assertEqual(set(info["planners"]), {"rrt", "prm"})
+        self.assertGreaterEqual(info["latency"], 300)
+
+    def test_deadline_stops_waiting(self):
+        plan, info = self.portfolio.plan(self.start + 0.05, mode="best", deadline=0.15)
+        self.assertIsNotNone(plan)
+        self.assertEqual(list(info["planners"]), ["rrt"])
+
+    def test_collision_target_has_no_plan(self):
+        into_table = self.start.copy()
+        into_table[1] = 1.7
+        plan, info = self.portfolio.plan(into_table, mode="first")
+        self.assertIsNone(plan)
+        self.assertIsNone(info["planner"])
+        self.assertFalse(any(timing["success"] for timing in info["planners"].values()))
+
+    def test_summary(self):
+        self.portfolio.plan(self.start + 0.05, mode="best")
+        summary = self.portfolio.summary()
+        self.assertEqual(set(summary), {"rrt", "prm"})
+        self.assertGreaterEqual(summary["prm"]["requests"], 1)
+        self.assertGreater(summary["prm"]["mean"], summary["rrt"]["mean"])
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            self.portfolio.plan(self.start, mode="fastest")
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+    def test_planner_threads_are_traced(self):
+        from roborl_navigator.utils import tracer
+        tracer.clear()
+        tracer.enable()
+        try:
+            self.portfolio.plan(self.start + 0.05, mode="best")
+        finally:
+            tracer.disable()
+        spans = {event["name"]: event for event in tracer.trace_events() if event["ph"] == "X"}
+        self.assertIn("plan rrt", spans)
+        self.assertIn("plan prm", spans)
+        self.assertNotEqual(spans["plan rrt"]["tid"], spans["plan prm"]["tid"])
+        tracer.clear()
@@ -7,6 +7,8 @@ from typing import (
 
 import numpy as np
 
+from roborl_navigator.utils import PhaseTimer
+
 
 class Simulation(ABC):
 
@@ -15,6 +17,7 @@ class Simulation(ABC):
         self.n_substeps = n_substeps
         self.timestep = 1.0 / 500
         self._bodies_idx = {}
+        self.timer = PhaseTimer()  # shared with the env and the task, see BaseEnv.set_profiling
 
     @property
     def dt(self):
@@ -27,6 +30,9 @@ class Simulation(ABC):
     def close(self) -> None:
         pass
 
+    def reset_obstacle_map(self) -> None:
+        pass
+
     def render(
         self,
         width: int = 720,
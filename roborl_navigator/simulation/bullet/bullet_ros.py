@@ -0,0 +1,704 @@
+import sys
+import threading
+import time
+import types
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+
+from roborl_navigator.robot.bullet_panda_robot import BulletPanda
+from roborl_navigator.robot.panda_kinematics import forward_kinematics
+from roborl_navigator.simulation.bullet.bullet_sim import BulletSim
+from roborl_navigator.utils import (
+    PandaConverter,
+    euler_to_quaternion,
+    quaternion_to_euler,
+    quaternion_to_rotation_matrix,
+    rotation_matrix_to_euler,
+    time_parameterize,
+)
+
+PANDA_ARM_JOINTS = [f"panda_joint{i}" for i in range(1, 8)]
+PANDA_FINGER_JOINTS = ["panda_finger_joint1", "panda_finger_joint2"]
+CAMERA_TOPICS = {
+    "rgb": "/camera/color/image_raw",
+    "depth": "/camera/aligned_depth_to_color/image_raw",
+    "camera_info": "/camera/aligned_depth_to_color/camera_info",
+}
+CAMERA_FRAME = "camera_depth_optical_frame"
+# Modules replaced by the stand-in, and repo modules that bind ROS names at import time
+ROS_MODULES = [
+    "rospy", "moveit_commander", "moveit_msgs", "moveit_msgs.msg", "moveit_msgs.srv", "gazebo_msgs",
+    "gazebo_msgs.msg", "gazebo_msgs.srv", "geometry_msgs", "geometry_msgs.msg", "sensor_msgs", "sensor_msgs.msg",
+    "std_msgs", "std_msgs.msg", "trajectory_msgs", "trajectory_msgs.msg", "tf", "tf.transformations", "cv_bridge",
+]
+ROS_DEPENDENT_MODULES = [
+    "roborl_navigator.robot.joint_state_cache",
+    "roborl_navigator.robot.ik_planner",
+    "roborl_navigator.robot.joint_streamer",
+    "roborl_navigator.robot.planner_portfolio",
+    "roborl_navigator.simulation.ros.depth_obstacles",
+    "roborl_navigator.simulation.ros.ros_sim",
+    "roborl_navigator.simulation.ros",
+    "roborl_navigator.robot.ros_panda_robot",
+    "roborl_navigator.environment.env_panda_ros",
+    "production.ros_controller.ros_controller",
+    "production.ros_controller",
+]
+
+
+def _message_type(type_name: str, **fields: Callable[[], Any]) -> type:
+    """Creates a ROS message like class, fields are given with a factory of their default value."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        for field, value in zip(fields, args):
+            kwargs[field] = value
+        for field, default in fields.items():
+            setattr(self, field, kwargs[field] if field in kwargs else default())
+
+    def __repr__(self) -> str:
+        return f"{type_name}({', '.join(f'{field}={getattr(self, field)!r}' for field in fields)})"
+
+    return type(type_name, (), {"__init__": __init__, "__repr__": __repr__, "__slots__": tuple(fields)})
+
+
+class Duration:
+
+    def __init__(self, secs: float = 0.0, nsecs: int = 0) -> None:
+        self.secs = float(secs) + nsecs * 1e-9
+
+    @classmethod
+    def from_sec(cls, secs: float) -> "Duration":
+        return cls(secs)
+
+    def to_sec(self) -> float:
+        return self.secs
+
+
+class Time(Duration):
+
+    @classmethod
+    def now(cls) -> "Time":
+        return cls(time.time())
+
+
+Header = _message_type("Header", seq=int, stamp=Time, frame_id=str)
+Point = _message_type("Point", x=float, y=float, z=float)
+Quaternion = _message_type("Quaternion", x=float, y=float, z=float, w=float)
+Pose = _message_type("Pose", position=Point, orientation=Quaternion)
+PoseStamped = _message_type("PoseStamped", header=Header, pose=Pose)
+ModelState = _message_type("ModelState", model_name=str, pose=Pose, twist=lambda: None, reference_frame=str)
+JointState = _message_type("JointState", header=Header, name=list, position=list, velocity=list, effort=list)
+Image = _message_type("Image", header=Header, height=int, width=int, encoding=str, step=int, data=lambda: None)
+CameraInfo = _message_type("CameraInfo", header=Header, height=int, width=int, K=list, D=list, R=list, P=list)
+Float64MultiArray = _message_type("Float64MultiArray", layout=lambda: None, data=list)
+JointTrajectoryPoint = _message_type(
+    "JointTrajectoryPoint", positions=list, velocities=list, accelerations=list, effort=list, time_from_start=Duration
+)
+JointTrajectory = _message_type("JointTrajectory", header=Header, joint_names=list, points=list)
+RobotTrajectory = _message_type("RobotTrajectory", joint_trajectory=JointTrajectory)
+RobotState = _message_type("RobotState", joint_state=JointState)
+GetStateValidityRequest = _message_type(
+    "GetStateValidityRequest", robot_state=RobotState, group_name=str, constraints=lambda: None
+)
+GetStateValidityResponse = _message_type("GetStateValidityResponse", valid=bool, contacts=list)
+GetStateValidity = _message_type("GetStateValidity")
+SetModelState = _message_type("SetModelState")
+SetModelStateResponse = _message_type("SetModelStateResponse", success=bool, status_message=str)
+SpawnModel = _message_type("SpawnModel")
+SpawnModelResponse = _message_type("SpawnModelResponse", success=bool, status_message=str)
+
+
+class BulletROSBackend:
+    """Runs the subset of the ROS, MoveIt and Gazebo APIs used by the ROS classes on a BulletSim.
+
+    The Panda is the Bullet model, joint states are published in real Panda values and end-effector poses come
+    from the real Panda kinematics. Planning interpolates in joint space and rejects collisions with the
+    obstacles, the table and the objects added to the planning scene.
+
+    Args:
+        service_latency (float): Seconds added to every service call, e.g. /gazebo/set_model_state.
+        topic_latency (float): Seconds between publishing and delivering a message.
+        planning_latency (float): Seconds added to every MoveIt plan request.
+        planner_latencies (Dict[str, float]): planning_latency of specific planner ids, e.g. {"PRMstar": 0.3}.
+        execution_time_scale (float): Trajectories take their duration times this value, 0 executes instantly.
+        joint_state_rate (float): /joint_states frequency in Hz, also the trajectory execution rate.
+        camera_rate (float): Camera topic frequency in Hz, images are only rendered while subscribed.
+    """
+
+    def __init__(
+        self,
+        service_latency: float = 0.002,
+        topic_latency: float = 0.001,
+        planning_latency: float = 0.05,
+        planner_latencies: Optional[Dict[str, float]] = None,
+        execution_time_scale: float = 1.0,
+        joint_state_rate: float = 100.0,
+        camera_rate: float = 15.0,
+        camera_resolution: Tuple[int, int] = (320, 240),
+        orientation_task: bool = False,
+    ) -> None:
+        self.service_latency = service_latency
+        self.topic_latency = topic_latency
+        self.planning_latency = planning_latency
+        self.planner_latencies = planner_latencies or {}
+        self.execution_time_scale = execution_time_scale
+        self.joint_state_rate = joint_state_rate
+        self.camera_rate = camera_rate
+
+        self.lock = threading.RLock()
+        self.sim = BulletSim(render_mode="rgb_array", orientation_task=orientation_task)
+        self.sim.image_resolution_width, self.sim.image_resolution_height = camera_resolution
+        self.robot = BulletPanda(self.sim, orientation_task=orientation_task)
+        with self.sim.no_rendering():
+            self.sim.create_scene()
+        self.robot.set_joint_neutral()
+        self.converter = PandaConverter()
+        self.collision_bodies = ["table", "obstacle1", "obstacle2", "obstacle3"]
+        self.command_velocities = None
+        self.camera_to_world = None
+
+        self.subscribers = {}
+        self.services = {
+            "/gazebo/set_model_state": self.set_model_state,
+            "/gazebo/spawn_sdf_model": self.spawn_model,
+            "/check_state_validity": self.check_state_validity,
+        }
+        self._sequence = 0
+        self._running = threading.Event()
+        self._running.set()
+        self._threads = [
+            threading.Thread(target=self._joint_state_loop, name="bullet_ros_joint_states", daemon=True),
+            threading.Thread(target=self._camera_loop, name="bullet_ros_camera", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def close(self) -> None:
+        self._running.clear()
+        for thread in self._threads:
+            thread.join()
+        with self.lock:
+            self.sim.close()
+
+    # Robot state
+    def get_joint_angles(self) -> np.ndarray:
+        with self.lock:
+            return self.robot.get_joint_angles()
+
+    def set_joint_angles(self, joint_values: np.ndarray) -> None:
+        with self.lock:
+            self.robot.set_joint_angles(np.asarray(joint_values, dtype=np.float64))
+
+    def get_finger_positions(self) -> np.ndarray:
+        with self.lock:
+            return np.array([self.robot.get_joint_angle(9), self.robot.get_joint_angle(10)])
+
+    def set_finger_positions(self, positions: np.ndarray) -> None:
+        with self.lock:
+            self.sim.set_joint_angle(self.robot.body_name, 9, positions[0])
+            self.sim.set_joint_angle(self.robot.body_name, 10, positions[1])
+
+    def in_collision(self, joint_values: np.ndarray) -> bool:
+        """Collision check of real joint values against the scene, the robot is restored afterwards."""
+        client = self.sim.physics_client
+        robot_id = self.sim._bodies_idx[self.robot.body_name]
+        with self.lock:
+            current = self.robot.get_joint_angles()
+            self.robot.set_joint_angles(np.asarray(joint_values, dtype=np.float64))
+            client.performCollisionDetection()
+            collision = False
+            for body in self.collision_bodies:
+                for contact in client.getContactPoints(robot_id, self.sim._bodies_idx[body]):
+                    # the base link rests on the table
+                    if not (body == "table" and contact[3] <= 0):
+                        collision = True
+                        break
+                if collision:
+                    break
+            self.robot.set_joint_angles(current)
+        return collision
+
+    def path_in_collision(self, start: np.ndarray, goal: np.ndarray, resolution: float = 0.05) -> bool:
+        steps = max(int(np.ceil(np.max(np.abs(goal - start)) / resolution)), 1)
+        return any(self.in_collision(start + (goal - start) * i / steps) for i in range(1, steps + 1))
+
+    def execute(self, times: np.ndarray, positions: np.ndarray) -> None:
+        """Moves the arm through (T, 7) real joint positions reached at (T,) times from start."""
+        times = np.asarray(times, dtype=np.float64)
+        positions = np.asarray(positions, dtype=np.float64)
+        if self.execution_time_scale > 0 and times[-1] > 0:
+            period = 1.0 / self.joint_state_rate
+            start_time = time.perf_counter()
+            for t in np.arange(period, times[-1], period):
+                self.set_joint_angles([np.interp(t, times, positions[:, i]) for i in range(positions.shape[1])])
+                delay = start_time + t * self.execution_time_scale - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        self.set_joint_angles(positions[-1])
+
+    # Topics
+    def subscribe(self, topic: str, callback: Callable[[Any], None]) -> None:
+        self.subscribers.setdefault(topic, []).append(callback)
+
+    def unsubscribe(self, topic: str, callback: Callable[[Any], None]) -> None:
+        if callback in self.subscribers.get(topic, []):
+            self.subscribers[topic].remove(callback)
+
+    def publish(self, topic: str, msg: Any) -> None:
+        if self.topic_latency > 0:
+            time.sleep(self.topic_latency)
+        if isinstance(msg, JointTrajectory) and msg.points:
+            # position controller command, the streamed setpoints are tracked exactly
+            self.set_joint_angles(msg.points[-1].positions)
+        elif isinstance(msg, Float64MultiArray):
+            self.command_velocities = np.asarray(msg.data, dtype=np.float64)
+        for callback in list(self.subscribers.get(topic, [])):
+            callback(msg)
+
+    def _joint_state_loop(self) -> None:
+        period = 1.0 / self.joint_state_rate
+        while self._running.is_set():
+            if self.command_velocities is not None:
+                self.set_joint_angles(self.get_joint_angles() + self.command_velocities * period)
+            if self.subscribers.get("/joint_states"):
+                self._sequence += 1
+                msg = JointState(
+                    header=Header(seq=self._sequence, stamp=Time.now()),
+                    name=PANDA_ARM_JOINTS + PANDA_FINGER_JOINTS,
+                    position=self.get_joint_angles().tolist() + self.get_finger_positions().tolist(),
+                )
+                msg.velocity = [0.0] * len(msg.name)
+                self.publish("/joint_states", msg)
+            time.sleep(period)
+
+    # Camera
+    def camera_intrinsics(self) -> np.ndarray:
+        width, height = self.sim.image_resolution_width, self.sim.image_resolution_height
+        focal = height / 2.0 / np.tan(np.deg2rad(60) / 2)  # BulletSim renders with a 60 degree vertical fov
+        return np.array([[focal, 0.0, width / 2.0], [0.0, focal, height / 2.0], [0.0, 0.0, 1.0]])
+
+    def capture(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Renders (bgr image, metric depth, camera to world transform) from the hand camera."""
+        with self.lock:
+            image, view_matrix, _, _ = self.sim.take_image()
+        rgba = np.asarray(image[2], dtype=np.uint8).reshape(image[1], image[0], 4)
+        near, far = 0.001, 10.0
+        depth_buffer = np.asarray(image[3], dtype=np.float64).reshape(image[1], image[0])
+        depth = (far * near / (far - (far - near) * depth_buffer)).astype(np.float32)
+        # OpenGL camera looks along -z with y up, the optical frame looks along z with y down
+        world_to_camera = np.diag([1.0, -1.0, -1.0, 1.0]) @ np.asarray(view_matrix).reshape(4, 4, order="F")
+        return np.ascontiguousarray(rgba[..., 2::-1]), depth, np.linalg.inv(world_to_camera)
+
+    def _camera_loop(self) -> None:
+        period = 1.0 / self.camera_rate
+        while self._running.is_set():
+            if any(self.subscribers.get(topic) for topic in CAMERA_TOPICS.values()):
+                bgr, depth, camera_to_world = self.capture()
+                self.camera_to_world = camera_to_world
+                header = Header(stamp=Time.now(), frame_id=CAMERA_FRAME)
+                height, width = depth.shape
+                self.publish(CAMERA_TOPICS["rgb"], Image(header, height, width, "bgr8", width * 3, bgr))
+                # RealSense aligned depth is published in millimeters
+                depth = np.round(np.minimum(depth, 65.0) * 1000).astype(np.uint16)
+                self.publish(CAMERA_TOPICS["depth"], Image(header, height, width, "16UC1", width * 2, depth))
+                info = CameraInfo(header, height, width, self.camera_intrinsics().reshape(-1).tolist())
+                self.publish(CAMERA_TOPICS["camera_info"], info)
+            time.sleep(period)
+
+    def lookup_transform(self, target_frame: str, source_frame: str) -> np.ndarray:
+        if target_frame not in ["world", "panda_link0"]:
+            raise KeyError(f"Frame {target_frame} is not published by the Bullet stand-in")
+        if source_frame == CAMERA_FRAME:
+            # pose of the last published frame, the hand camera moves with the arm
+            return self.camera_to_world if self.camera_to_world is not None else self.capture()[2]
+        if source_frame in ["panda_hand_tcp", "panda_link8"]:
+            return forward_kinematics(self.get_joint_angles())
+        raise KeyError(f"Frame {source_frame} is not published by the Bullet stand-in")
+
+    # Services
+    def call_service(self, name: str, *args: Any) -> Any:
+        if self.service_latency > 0:
+            time.sleep(self.service_latency)
+        return self.services[name](*args)
+
+    def set_model_state(self, state: Any) -> Any:
+        if state.model_name not in self.sim._bodies_idx:
+            return SetModelStateResponse(False, f"model [{state.model_name}] does not exist")
+        position, orientation = state.pose.position, state.pose.orientation
+        with self.lock:
+            self.sim.set_base_pose(
+                state.model_name,
+                np.array([position.x, position.y, position.z]),
+                np.array([orientation.x, orientation.y, orientation.z, orientation.w]),
+            )
+        return SetModelStateResponse(True, "")
+
+    def spawn_model(self, model_name: str, model_xml: str, namespace: str, pose: Any, frame: str) -> Any:
+        with self.lock:
+            if model_name not in self.sim._bodies_idx:
+                if model_name == "target_orientation_mark":
+                    self.sim.create_orientation_mark(np.zeros(3))
+                else:
+                    self.sim.create_geometry(
+                        model_name,
+                        geom_type=self.sim.physics_client.GEOM_SPHERE,
+                        ghost=True,
+                        visual_kwargs={"radius": 0.02, "rgbaColor": np.array([0.0, 1.0, 0.0, 0.5])},
+                    )
+        self.set_model_state(ModelState(model_name=model_name, pose=pose))
+        return SpawnModelResponse(True, "")
+
+    def check_state_validity(self, request: Any) -> Any:
+        state = request.robot_state.joint_state
+        positions = dict(zip(state.name, state.position))
+        return GetStateValidityResponse(valid=not self.in_collision([positions[name] for name in PANDA_ARM_JOINTS]))
+
+    def add_box(self, name: str, pose: Any, size: Tuple[float, float, float]) -> None:
+        position = pose.pose.position
+        with self.lock:
+            if name in self.sim._bodies_idx:
+                self.sim.remove_model(name)
+            self.sim.create_box(
+                name, np.asarray(size) / 2, np.array([position.x, position.y, position.z]), np.array([0, 0, 1, 0.3])
+            )
+        if name not in self.collision_bodies:
+            self.collision_bodies.append(name)
+
+
+class MoveItCommanderException(Exception):
+    pass
+
+
+class MoveGroupCommander:
+    """MoveGroupCommander subset for the "<robot>_manipulator" and "<robot>_hand" groups."""
+
+    backend = None
+
+    def __init__(self, name: str, *args: Any, **kwargs: Any) -> None:
+        self.name = name
+        self.hand = name.endswith("_hand")
+        self.joint_names = PANDA_FINGER_JOINTS if self.hand else PANDA_ARM_JOINTS
+        self.planner_id = "RRTConnect"
+        self.planning_time = 5.0
+        self.joint_target = None
+        self.pose_target = None
+
+    def get_name(self) -> str:
+        return self.name
+
+    def get_active_joints(self) -> List[str]:
+        return list(self.joint_names)
+
+    def get_end_effector_link(self) -> str:
+        return "" if self.hand else "panda_hand_tcp"
+
+    def get_current_joint_values(self) -> List[float]:
+        if self.hand:
+            return self.backend.get_finger_positions().tolist()
+        return self.backend.get_joint_angles().tolist()
+
+    def get_current_pose(self, end_effector_link: str = "") -> Any:
+        transform = forward_kinematics(self.backend.get_joint_angles())
+        quaternion = euler_to_quaternion(rotation_matrix_to_euler(transform[:3, :3]))
+        return PoseStamped(
+            header=Header(stamp=Time.now(), frame_id="world"),
+            pose=Pose(Point(*transform[:3, 3]), Quaternion(*quaternion)),
+        )
+
+    def get_named_target_values(self, name: str) -> Dict[str, float]:
+        width = {"open": 0.04, "close": 0.0}.get(name, 0.0)
+        return {joint: width for joint in self.joint_names}
+
+    def set_planner_id(self, planner_id: str) -> None:
+        self.planner_id = planner_id
+
+    def set_planning_time(self, seconds: float) -> None:
+        self.planning_time = seconds
+
+    def set_joint_value_target(self, values: Any) -> None:
+        if isinstance(values, dict):
+            values = [values[name] for name in self.joint_names]
+        self.joint_target = np.asarray(values, dtype=np.float64)
+        self.pose_target = None
+
+    def set_pose_target(self, pose: Any, end_effector_link: str = "") -> None:
+        self.pose_target = pose.pose if hasattr(pose, "pose") else pose
+        self.joint_target = None
+
+    def clear_pose_targets(self) -> None:
+        self.pose_target = None
+        self.joint_target = None
+
+    def stop(self) -> None:
+        pass
+
+    def _goal(self, joints: Any) -> Optional[np.ndarray]:
+        if joints is not None:
+            self.set_joint_value_target(joints)
+        if self.joint_target is not None:
+            return self.joint_target
+        if self.pose_target is not None:
+            return self._inverse_kinematics(self.pose_target)
+        raise MoveItCommanderException("No motion plan target specified")
+
+    def _inverse_kinematics(self, pose: Any) -> np.ndarray:
+        # Bullet IK of the end-effector link, close to but not exactly the real hand TCP
+        position = [pose.position.x, pose.position.y, pose.position.z]
+        orientation = [pose.orientation.x, pose.orientation.y, pose.orientation.z, pose.orientation.w]
+        backend = self.backend
+        with backend.lock:
+            solution = backend.sim.physics_client.calculateInverseKinematics(
+                backend.sim._bodies_idx[backend.robot.body_name],
+                backend.robot.ee_link,
+                position,
+                orientation,
+                maxNumIterations=100,
+            )
+        return backend.converter.bullet_to_real(np.array(solution[:7]))
+
+    def plan(self, joints: Any = None) -> Tuple[bool, Any, float, int]:
+        """Returns (success, trajectory, planning time, error code) like MoveIt 1 Noetic."""
+        start_time = time.perf_counter()
+        trajectory = RobotTrajectory()
+        trajectory.joint_trajectory.joint_names = self.get_active_joints()
+        goal = self._goal(joints)
+        start = np.asarray(self.get_current_joint_values())
+        if not self.hand and self.backend.path_in_collision(start, goal):
+            success = False
+        else:
+            success = True
+            waypoints = np.stack((start, goal))
+            times, velocities = time_parameterize(waypoints) if not self.hand else (np.array([0.0, 0.5]), waypoints * 0)
+            for position, velocity, time_from_start in zip(waypoints, velocities, times):
+                trajectory.joint_trajectory.points.append(
+                    JointTrajectoryPoint(
+                        positions=position.tolist(),
+                        velocities=velocity.tolist(),
+                        time_from_start=Duration.from_sec(time_from_start),
+                    )
+                )
+        latency = self.backend.planner_latencies.get(self.planner_id, self.backend.planning_latency)
+        delay = latency - (time.perf_counter() - start_time)
+        if delay > 0:
+            time.sleep(delay)
+        return success, trajectory, time.perf_counter() - start_time, 1 if success else -1
+
+    def execute(self, plan: Any, wait: bool = True) -> bool:
+        points = plan.joint_trajectory.points
+        if not points:
+            return False
+        if self.hand:
+            self.backend.set_finger_positions(points[-1].positions)
+            return True
+        times = np.array([point.time_from_start.to_sec() for point in points])
+        positions = np.array([point.positions for point in points])
+        if times[0] > 0:
+            # trajectories may omit the current state as their first point
+            times = np.concatenate(([0.0], times))
+            positions = np.concatenate((self.backend.get_joint_angles()[None], positions))
+        self.backend.execute(times, positions)
+        return True
+
+    def go(self, joints: Any = None, wait: bool = True) -> bool:
+        success, plan, _, _ = self.plan(joints)
+        return success and self.execute(plan, wait)
+
+
+class PlanningSceneInterface:
+
+    backend = None
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def add_box(self, name: str, pose: Any, size: Tuple[float, float, float] = (1, 1, 1)) -> None:
+        self.backend.add_box(name, pose, size)
+
+    def get_known_object_names(self) -> List[str]:
+        return [name for name in self.backend.collision_bodies if name != "table"]
+
+
+class RobotCommander:
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+def _rospy_module(backend: BulletROSBackend) -> types.ModuleType:
+    rospy = types.ModuleType("rospy")
+
+    class Publisher:
+
+        def __init__(self, name: str, data_class: type, *args: Any, **kwargs: Any) -> None:
+            self.name = name
+
+        def publish(self, msg: Any) -> None:
+            backend.publish(self.name, msg)
+
+    class Subscriber:
+
+        def __init__(self, name: str, data_class: type, callback: Callable[[Any], None], *args: Any, **kwargs: Any):
+            self.name = name
+            self.callback = callback
+            backend.subscribe(name, callback)
+
+        def unregister(self) -> None:
+            backend.unsubscribe(self.name, self.callback)
+
+    class ServiceProxy:
+
+        def __init__(self, name: str, service_class: type, *args: Any, **kwargs: Any) -> None:
+            self.name = name
+
+        def __call__(self, *args: Any) -> Any:
+            return backend.call_service(self.name, *args)
+
+    class ROSException(Exception):
+        pass
+
+    def wait_for_service(service: str, timeout: Optional[float] = None) -> None:
+        if service not in backend.services:
+            raise ROSException(f"Service {service} is not provided by the Bullet stand-in")
+
+    rospy.Publisher = Publisher
+    rospy.Subscriber = Subscriber
+    rospy.ServiceProxy = ServiceProxy
+    rospy.ROSException = ROSException
+    rospy.Time = Time
+    rospy.Duration = Duration
+    rospy.wait_for_service = wait_for_service
+    rospy.init_node = lambda *args, **kwargs: None
+    rospy.is_shutdown = lambda: not backend._running.is_set()
+    rospy.sleep = lambda duration: time.sleep(duration.to_sec() if isinstance(duration, Duration) else duration)
+    return rospy
+
+
+def _tf_modules(backend: BulletROSBackend) -> Tuple[types.ModuleType, types.ModuleType]:
+    tf = types.ModuleType("tf")
+    transformations = types.ModuleType("tf.transformations")
+
+    class TransformListener:
+
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            pass
+
+        def waitForTransform(self, target_frame: str, source_frame: str, *args: Any) -> None:
+            backend.lookup_transform(target_frame, source_frame)
+
+        def lookupTransform(self, target_frame: str, source_frame: str, *args: Any) -> Tuple[List, List]:
+            transform = backend.lookup_transform(target_frame, source_frame)
+            quaternion = euler_to_quaternion(rotation_matrix_to_euler(transform[:3, :3]))
+            return transform[:3, 3].tolist(), quaternion.tolist()
+
+    def quaternion_matrix(quaternion: List[float]) -> np.ndarray:
+        matrix = np.eye(4)
+        matrix[:3, :3] = quaternion_to_rotation_matrix(quaternion)
+        return matrix
+
+    tf.TransformListener = TransformListener
+    tf.transformations = transformations
+    transformations.quaternion_matrix = quaternion_matrix
+    transformations.euler_from_quaternion = lambda quaternion: tuple(quaternion_to_euler(quaternion))
+    transformations.quaternion_from_euler = lambda roll, pitch, yaw: euler_to_quaternion([roll, pitch, yaw])
+    return tf, transformations
+
+
+def _module(name: str, **attributes: Any) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    return module
+
+
+_saved_modules = {}
+
+
+def install_bullet_ros(**kwargs: Any) -> BulletROSBackend:
+    """Registers the Bullet stand-in as the ROS packages and returns its backend.
+
+    Import the ROS classes after calling it, repo modules that already bound the ROS names are imported again.
+    Keyword arguments are passed to BulletROSBackend.
+    """
+    if _saved_modules:
+        uninstall_bullet_ros()
+    backend = BulletROSBackend(**kwargs)
+    MoveGroupCommander.backend = backend
+    PlanningSceneInterface.backend = backend
+    tf, transformations = _tf_modules(backend)
+
+    class CvBridge:
+
+        @staticmethod
+        def imgmsg_to_cv2(msg: Any, desired_encoding: str = "passthrough") -> np.ndarray:
+            if desired_encoding == "32FC1":
+                return msg.data.astype(np.float32)
+            return msg.data
+
+    modules = {
+        "rospy": _rospy_module(backend),
+        "moveit_commander": _module(
+            "moveit_commander",
+            MoveGroupCommander=MoveGroupCommander,
+            PlanningSceneInterface=PlanningSceneInterface,
+            RobotCommander=RobotCommander,
+            MoveItCommanderException=MoveItCommanderException,
+            roscpp_initialize=lambda *args: None,
+            roscpp_shutdown=lambda: None,
+        ),
+        "moveit_msgs": _module("moveit_msgs"),
+        "moveit_msgs.msg": _module("moveit_msgs.msg", RobotTrajectory=RobotTrajectory, RobotState=RobotState),
+        "moveit_msgs.srv": _module(
+            "moveit_msgs.srv", GetStateValidity=GetStateValidity, GetStateValidityRequest=GetStateValidityRequest
+        ),
+        "gazebo_msgs": _module("gazebo_msgs"),
+        "gazebo_msgs.msg": _module("gazebo_msgs.msg", ModelState=ModelState),
+        "gazebo_msgs.srv": _module("gazebo_msgs.srv", SetModelState=SetModelState, SpawnModel=SpawnModel),
+        "geometry_msgs": _module("geometry_msgs"),
+        "geometry_msgs.msg": _module(
+            "geometry_msgs.msg", Point=Point, Quaternion=Quaternion, Pose=Pose, PoseStamped=PoseStamped
+        ),
+        "sensor_msgs": _module("sensor_msgs"),
+        "sensor_msgs.msg": _module("sensor_msgs.msg", JointState=JointState, Image=Image, CameraInfo=CameraInfo),
+        "std_msgs": _module("std_msgs"),
+        "std_msgs.msg": _module("std_msgs.msg", Header=Header, Float64MultiArray=Float64MultiArray),
+        "trajectory_msgs": _module("trajectory_msgs"),
+        "trajectory_msgs.msg": _module(
+            "trajectory_msgs.msg", JointTrajectory=JointTrajectory, JointTrajectoryPoint=JointTrajectoryPoint
+        ),
+        "tf": tf,
+        "tf.transformations": transformations,
+        "cv_bridge": _module("cv_bridge", CvBridge=CvBridge),
+    }
+    for name in ROS_MODULES:
+        _saved_modules[name] = sys.modules.get(name)
+        sys.modules[name] = modules[name]
+    _forget_ros_dependent_modules()
+    return backend
+
+
+def uninstall_bullet_ros() -> None:
+    """Restores the modules replaced by install_bullet_ros and closes its backend."""
+    if MoveGroupCommander.backend is not None:
+        MoveGroupCommander.backend.close()
+        MoveGroupCommander.backend = None
+        PlanningSceneInterface.backend = None
+    for name, module in _saved_modules.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+    _saved_modules.clear()
+    _forget_ros_dependent_modules()
+
+
+def _forget_ros_dependent_modules() -> None:
+    """Drops the repo modules bound to the previous ROS packages, the next import loads them again."""
+    for name in ROS_DEPENDENT_MODULES:
+        sys.modules.pop(name, None)
@@ -7,6 +7,7 @@ import pybullet_data
 import pybullet_utils.bullet_client as bc
 
 from roborl_navigator.simulation import Simulation
+from roborl_navigator.utils import OccupancyMap
 
 
 class BulletSim(Simulation):
@@ -17,7 +18,8 @@ class BulletSim(Simulation):
         n_substeps: Optional[int] = 20,
         renderer: Optional[str] = "Tiny",
         orientation_task: Optional[bool] = False,
-        debug_mode: bool = False
+        debug_mode: bool = False,
+        occupancy_map: Optional[OccupancyMap] = None,
     ) -> None:
         super().__init__(render_mode, n_substeps)
 
@@ -60,11 +62,14 @@ class BulletSim(Simulation):
         self.image_resolution_width = 128
         self.image_resolution_height = 72
         self.curr_euclid_dist = -1
+        # Fuses the camera frames of an episode, obstacles stay known after leaving the camera view
+        self.occupancy_map = occupancy_map
 
     def step(self) -> None:
         """Step the simulation."""
-        for _ in range(self.n_substeps):
-            self.physics_client.stepSimulation()
+        with self.timer.phase("physics"):
+            for _ in range(self.n_substeps):
+                self.physics_client.stepSimulation()
 
     def close(self) -> None:
         """Close the simulation."""
@@ -160,17 +165,34 @@ class BulletSim(Simulation):
         return min_vector_dist, min_dist
 
     def get_closest_dist(self, ee_position):
-        img, view_matrix, proj_matrix, camera_pos = self.take_image()
-
-        points = self.get_point_cloud(view_matrix, proj_matrix, img)
-
-        min_vector_dist, min_euclid_dist = self.return_closest_dist(ee_position, points)
+        with self.timer.phase("camera"):
+            img, view_matrix, proj_matrix, camera_pos = self.take_image()
+
+        with self.timer.phase("point_cloud"):
+            points = self.get_point_cloud(view_matrix, proj_matrix, img)
+
+        result = None
+        if self.occupancy_map is not None:
+            with self.timer.phase("occupancy_map"):
+                eye_position = np.linalg.inv(np.asarray(view_matrix).reshape(4, 4, order="F"))[:3, 3]
+                self.occupancy_map.integrate(points, eye_position)
+        with self.timer.phase("nearest_point"):
+            if self.occupancy_map is not None:
+                result = self.occupancy_map.closest_dist(ee_position)
+            if result is not None:
+                min_vector_dist, min_euclid_dist = result[0], result[1][0]
+            else:
+                min_vector_dist, min_euclid_dist = self.return_closest_dist(ee_position, points)
 
         min_euclid_dist = np.array([min_euclid_dist])
         self.curr_euclid_dist = min_euclid_dist[0]
 
         return min_vector_dist, min_euclid_dist
 
+    def reset_obstacle_map(self) -> None:
+        if self.occupancy_map is not None:
+            self.occupancy_map.reset()
+
     @contextmanager
     def no_rendering(self) -> Iterator[None]:
         self.physics_client.configureDebugVisualizer(self.physics_client.COV_ENABLE_RENDERING, 0)
@@ -0,0 +1,143 @@
+import threading
+from typing import (
+    Any,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+
+from roborl_navigator.utils import (
+    DepthPointCloud,
+    OccupancyMap,
+    quaternion_to_rotation_matrix,
+)
+
+try:
+    import rospy
+    from cv_bridge import CvBridge
+    from sensor_msgs.msg import (
+        CameraInfo,
+        Image,
+    )
+    from tf import TransformListener
+except ImportError:
+    print("ROS Packages are not initialized!")
+
+SAMPLINGS = ("bullet", "dense")
+BULLET_CAMERA_RESOLUTION = (72, 128)  # (height, width) of the BulletSim camera
+BULLET_SEARCH_STEP = 50  # BulletSim.return_closest_dist checks every 50th point
+
+
+class DepthObstacleSensor:
+    """Keeps a base frame point cloud of the latest aligned depth frame for obstacle distance queries.
+
+    Frames are processed in the subscriber callback, so get_closest_dist only runs the nearest point search.
+
+    The "bullet" sampling resamples the frames to the 128x72 BulletSim camera and searches every 50th pixel, the
+    observation the policies were trained with. The field of view still is the one of the real camera, not the
+    60 degrees of BulletSim, and invalid or out of range pixels are dropped instead of landing on the far plane.
+    "dense" searches a voxel downsampled cloud of every stride-th pixel, closer to the true obstacle distance.
+
+    Args:
+        depth_topic (str): Aligned depth image, 16UC1 in millimeters like the RealSense driver or 32FC1.
+        camera_info_topic (str): CameraInfo of the depth image, K is read once.
+        base_frame (str): Frame of the end-effector positions given to get_closest_dist.
+        depth_scale (float): Meters per depth unit of 16UC1 images.
+        voxel_size (float): Voxel edge length of the "dense" sampling.
+        stride (int): Pixel stride of the "dense" sampling.
+        occupancy_map (OccupancyMap): Fuses the frames and answers the distance queries when given.
+        sampling (str): "bullet" or "dense", see above.
+        timeout (float): Seconds get_closest_dist waits for the first frame before raising a TimeoutError.
+    """
+
+    def __init__(
+        self,
+        depth_topic: str = "/camera/aligned_depth_to_color/image_raw",
+        camera_info_topic: str = "/camera/aligned_depth_to_color/camera_info",
+        base_frame: str = "world",
+        depth_scale: float = 0.001,
+        voxel_size: float = 0.01,
+        stride: int = 2,
+        occupancy_map: Optional[OccupancyMap] = None,
+        sampling: str = "bullet",
+        timeout: float = 10.0,
+    ) -> None:
+        if sampling not in SAMPLINGS:
+            raise ValueError(f"The 'sampling' argument is must be in {set(SAMPLINGS)}")
+        self.depth_topic = depth_topic
+        self.base_frame = base_frame
+        self.depth_scale = depth_scale
+        self.timeout = timeout
+        if sampling == "bullet":
+            self.cloud = DepthPointCloud(
+                voxel_size=None, resolution=BULLET_CAMERA_RESOLUTION, search_step=BULLET_SEARCH_STEP
+            )
+        else:
+            self.cloud = DepthPointCloud(voxel_size=voxel_size, stride=stride)
+        self.occupancy_map = occupancy_map
+        self.intrinsics = None
+        self.stamp = None
+        self._lock = threading.Lock()
+        self._received = threading.Event()
+        self.cv_bridge = CvBridge()
+        self.tf_listener = TransformListener()
+        self.info_subscriber = rospy.Subscriber(camera_info_topic, CameraInfo, self.camera_info_callback)
+        self.depth_subscriber = rospy.Subscriber(depth_topic, Image, self.depth_callback, queue_size=1)
+
+    def camera_info_callback(self, msg: Any) -> None:
+        self.intrinsics = np.array(msg.K, dtype=np.float64).reshape(3, 3)
+        self.info_subscriber.unregister()
+
+    def lookup_camera_to_base(self, frame: str, stamp: Any) -> Optional[np.ndarray]:
+        try:
+            translation, rotation = self.tf_listener.lookupTransform(self.base_frame, frame, stamp)
+        except Exception:
+            # the wrist camera moves, the pose at the frame stamp may not be buffered yet
+            try:
+                translation, rotation = self.tf_listener.lookupTransform(self.base_frame, frame, rospy.Time(0))
+            except Exception:
+                return None
+        transform = np.eye(4)
+        transform[:3, :3] = quaternion_to_rotation_matrix(rotation)
+        transform[:3, 3] = translation
+        return transform
+
+    def depth_callback(self, msg: Any) -> None:
+        if self.intrinsics is None:
+            return
+        camera_to_base = self.lookup_camera_to_base(msg.header.frame_id, msg.header.stamp)
+        if camera_to_base is None:
+            return
+        depth = np.asarray(self.cv_bridge.imgmsg_to_cv2(msg, "passthrough"))
+        if depth.dtype == np.uint16:
+            depth = depth.astype(np.float32) * self.depth_scale
+        with self._lock:
+            points = self.cloud.update(depth, self.intrinsics, camera_to_base)
+            if self.occupancy_map is not None:
+                self.occupancy_map.integrate(points, camera_to_base[:3, 3])
+            self.stamp = msg.header.stamp
+        self._received.set()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Blocks until the first frame is processed, raises a TimeoutError after timeout (default self.timeout)."""
+        timeout = self.timeout if timeout is None else timeout
+        if not self._received.wait(timeout):
+            raise TimeoutError(
+                f"No depth frame received on {self.depth_topic} within {timeout} s, frames are also dropped while"
+                f" the camera info or the transform to {self.base_frame} is missing"
+            )
+
+    def get_closest_dist(self, ee_position: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(per axis absolute distance, [euclidean distance]) to the closest observed point, like BulletSim."""
+        if not self._received.is_set():
+            self.wait()
+        with self._lock:
+            result = self.occupancy_map.closest_dist(ee_position) if self.occupancy_map is not None else None
+            return result if result is not None else self.cloud.closest_dist(ee_position)
+
+    def reset(self) -> None:
+        """Clears the occupancy map, the next frames start a new one."""
+        if self.occupancy_map is not None:
+            with self._lock:
+                self.occupancy_map.reset()
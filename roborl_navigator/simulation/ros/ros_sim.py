@@ -5,6 +5,7 @@ import sys
 from typing import (
     Any,
     Optional,
+    Tuple,
 )
 
 import moveit_commander
@@ -16,13 +17,24 @@ from gazebo_msgs.srv import (
 from geometry_msgs.msg import Pose
 
 from roborl_navigator.simulation import Simulation
-from roborl_navigator.utils import euler_to_quaternion
+from roborl_navigator.simulation.ros.depth_obstacles import DepthObstacleSensor
+from roborl_navigator.utils import (
+    OccupancyMap,
+    euler_to_quaternion,
+)
 
 
 class ROSSim(Simulation):
     """ROSSim basically represents Gazebo Simulation"""
 
-    def __init__(self, orientation_task: bool = False, demonstration: bool = False) -> None:
+    def __init__(
+        self,
+        orientation_task: bool = False,
+        demonstration: bool = False,
+        obstacle_sensor: bool = True,
+        occupancy_map: Optional[OccupancyMap] = None,
+        obstacle_sampling: str = "bullet",
+    ) -> None:
         super().__init__()
         self.orientation_task = orientation_task
         self.demonstration = demonstration
@@ -42,6 +54,12 @@ class ROSSim(Simulation):
         self.models = {}
         self.set_model_state_proxy = rospy.ServiceProxy('/gazebo/set_model_state', SetModelState)
 
+        # Obstacle distances come from the aligned depth stream, like the depth camera of BulletSim
+        self.obstacle_sensor = None
+        if obstacle_sensor:
+            self.obstacle_sensor = DepthObstacleSensor(occupancy_map=occupancy_map, sampling=obstacle_sampling)
+        self.curr_euclid_dist = -1
+
     def step(self) -> None:
         return None
 
@@ -51,6 +69,21 @@ class ROSSim(Simulation):
     def render(self, *args: Any, **kwargs: Any) -> Optional[np.ndarray]:
         return None
 
+    def get_closest_dist(self, ee_position: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        result = self.obstacle_sensor.get_closest_dist(ee_position) if self.obstacle_sensor is not None else None
+        if result is None:
+            # nothing observed, same as BulletSim with an empty point cloud
+            result = np.abs(np.asarray(ee_position)), np.array([1000.0])
+        self.curr_euclid_dist = result[1][0]
+        return result
+
+    def reset_obstacle_map(self) -> None:
+        if self.obstacle_sensor is not None:
+            self.obstacle_sensor.reset()
+
+    def is_collision(self, margin: float = 0.022) -> bool:
+        return self.curr_euclid_dist < margin
+
     def create_scene(self) -> None:
         # Create a ground collision object in the RVIZ
         if not self.demonstration:
@@ -0,0 +1,225 @@
+import time
+from importlib.util import find_spec
+
+import numpy as np
+import unittest
+
+from roborl_navigator.simulation.bullet.bullet_ros import (
+    install_bullet_ros,
+    uninstall_bullet_ros,
+)
+from roborl_navigator.utils import PlannerResult
+
+
+class TestBulletROS(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.backend = install_bullet_ros(
+            service_latency=0.0, topic_latency=0.0, planning_latency=0.0, execution_time_scale=0.0
+        )
+        from roborl_navigator.robot.ros_panda_robot import ROSRobot
+        from roborl_navigator.simulation.ros.ros_sim import ROSSim
+        cls.sim = ROSSim()
+        cls.sim.create_scene()
+        cls.robot = ROSRobot(cls.sim)
+
+    @classmethod
+    def tearDownClass(cls):
+        uninstall_bullet_ros()
+
+    def wait_for_joint_state(self):
+        sequence = self.robot.joint_states.sequence
+        while self.robot.joint_states.sequence == sequence:
+            time.sleep(0.001)
+
+    def test_plan_and_execute(self):
+        self.robot.set_joint_neutral()
+        self.wait_for_joint_state()
+        target = self.robot.get_joint_angles() + 0.05
+        self.assertEqual(self.robot.control_joints(target), PlannerResult.SUCCESS)
+        self.wait_for_joint_state()
+        np.testing.assert_allclose(self.robot.get_joint_angles(), target, atol=1e-6)
+
+    def test_direct_trajectory_starts_at_current_state(self):
+        self.robot.set_joint_neutral()
+        self.wait_for_joint_state()
+        start = self.robot.get_joint_angles()
+        target = start + np.array([0.1, 0.0, 0.0, -0.05, 0.0, 0.0, 0.0])
+        points = self.robot.create_direct_trajectory(target).joint_trajectory.points
+        self.assertEqual(len(points), 2)
+        np.testing.assert_allclose(points[0].positions, start)
+        self.assertEqual(points[0].time_from_start.to_sec(), 0.0)
+        np.testing.assert_allclose(points[1].positions, target)
+        self.assertAlmostEqual(points[1].time_from_start.to_sec(), 0.1 / self.robot.direct_joint_velocity)
+
+        self.robot.direct_joint_threshold = 0.2
+        try:
+            self.assertEqual(self.robot.control_joints(target), PlannerResult.SUCCESS)
+        finally:
+            self.robot.direct_joint_threshold = None
+        self.wait_for_joint_state()
+        np.testing.assert_allclose(self.robot.get_joint_angles(), target, atol=1e-6)
+
+    def test_collision_is_rejected(self):
+        self.robot.set_joint_neutral()
+        self.wait_for_joint_state()
+        start = self.robot.get_joint_angles()
+        into_table = start.copy()
+        into_table[1] = 1.7
+        self.assertTrue(self.robot.validate_joint_waypoints(start[None]))
+        self.assertFalse(self.robot.validate_joint_waypoints(into_table[None]))
+        self.assertEqual(self.robot.control_joints(into_table), PlannerResult.COLLISION)
+        np.testing.assert_allclose(self.robot.get_joint_angles(), start, atol=1e-6)
+
+    def test_ee_pose_matches_move_group(self):
+        self.wait_for_joint_state()
+        pose = self.robot.move_group.get_current_pose().pose
+        np.testing.assert_allclose(
+            self.robot.get_ee_position(), [pose.position.x, pose.position.y, pose.position.z], atol=1e-5
+        )
+
+    def test_local_kinematics_check(self):
+        self.assertTrue(self.robot.local_kinematics)
+        current_pose = self.robot.move_group.get_current_pose
+
+        def shifted_pose(*args):
+            pose = current_pose(*args)
+            pose.pose.position.x += 0.1  # robot base away from the world origin
+            return pose
+
+        self.robot.move_group.get_current_pose = shifted_pose
+        try:
+            self.assertFalse(self.robot.check_local_kinematics())
+        finally:
+            del self.robot.move_group.get_current_pose
+
+    def test_joint_state_timeout(self):
+        from roborl_navigator.robot.joint_state_cache import JointStateCache
+        joint_states = JointStateCache(self.robot.joint_states.joint_names, topic="/unpublished_states", timeout=0.05)
+        with self.assertRaisesRegex(TimeoutError, "/unpublished_states"):
+            joint_states.get_joint_angles()
+
+    def test_set_model_state(self):
+        position = np.array([0.45, 0.1, 0.05])
+        self.sim.set_base_pose("obstacle1", position, np.array([0.0, 0.0, 0.0, 1.0]))
+        sim = self.backend.sim
+        np.testing.assert_allclose(
+            sim.physics_client.getBasePositionAndOrientation(sim._bodies_idx["obstacle1"])[0], position
+        )
+        self.sim.set_base_pose("obstacle1", np.array([0.0, 2.0, -1.0]), np.array([0.0, 0.0, 0.0, 1.0]))
+
+    def test_depth_point_cloud_matches_bullet(self):
+        from roborl_navigator.utils import DepthPointCloud
+        _, depth, camera_to_world = self.backend.capture()
+        cloud = DepthPointCloud(voxel_size=0.005, stride=1, max_depth=10.0)
+        cloud.update(depth, self.backend.camera_intrinsics(), camera_to_world)
+        sim = self.backend.sim
+        image, view_matrix, proj_matrix, _ = sim.take_image()
+        bullet_points = sim.get_point_cloud(view_matrix, proj_matrix, image)
+        for position in [np.array([0.5, 0.0, 0.1]), np.array([0.6, 0.1, 0.2])]:
+            distance = np.min(np.linalg.norm(bullet_points - position, axis=-1))
+            self.assertAlmostEqual(cloud.closest_dist(position)[1][0], distance, delta=0.005)
+
+    def test_obstacle_sensor_timeout(self):
+        from roborl_navigator.simulation.ros.depth_obstacles import DepthObstacleSensor
+        sensor = DepthObstacleSensor(depth_topic="/camera/unpublished/image_raw", timeout=0.05)
+        with self.assertRaisesRegex(TimeoutError, "/camera/unpublished/image_raw"):
+            sensor.get_closest_dist(np.array([0.5, 0.0, 0.2]))
+
+    def test_env_obstacle_distance(self):
+        from roborl_navigator.environment.env_panda_ros import PandaROSEnv
+        env = PandaROSEnv()
+        observation, _ = env.reset()
+        self.assertEqual(observation["obstacle_dist_vector"].shape, (3,))
+        self.assertLess(env.sim.curr_euclid_dist, 1.0)
+        observation, _, _, _, info = env.step(np.zeros(7, dtype=np.float32))
+        self.assertIn("planning_time", info)
+        env.close()
+
+    def test_plan_ahead_respects_obstacles(self):
+        from roborl_navigator.environment.env_panda_ros import PandaROSEnv
+        from roborl_navigator.environment.plan_ahead import PolicyRollout
+        from roborl_navigator.robot.panda_kinematics import ee_pose
+
+        class SweepPolicy:
+            """Turns the base joint at full speed, blind to obstacles."""
+
+            def predict(self, observation, deterministic=True):
+                return np.array([1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0], dtype=np.float32), None
+
+        env = PandaROSEnv()
+        env.reset()
+        rollout = PolicyRollout(SweepPolicy(), max_steps=20)
+        neutral = np.array(env.robot.neutral_joint_values)
+        start = neutral - [0.3, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+        end = neutral + [0.3, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+        hidden = np.array([0.0, 2.0, -1.0])
+        try:
+            self.assertEqual(env.robot.control_joints(start), PlannerResult.SUCCESS)
+            self.wait_for_joint_state()
+            # an obstacle halfway along the sweep, where the hand passes at neutral
+            env.task.obstacle1_pos = ee_pose(neutral)[0]
+            env.task.obstacle2_pos = env.task.obstacle3_pos = hidden
+            for name in ["obstacle1", "obstacle2", "obstacle3"]:
+                env.sim.set_base_pose(name, getattr(env.task, name + "_pos"), np.array([0.0, 0.0, 0.0, 1.0]))
+            env.task.set_goal(ee_pose(end)[0].astype(np.float32))
+
+            # both ends are free, the motion between them is not
+            self.assertTrue(env.robot.validate_joint_waypoints(start[None]))
+            self.assertTrue(env.robot.validate_joint_waypoints(end[None]))
+            self.assertFalse(env.robot.validate_joint_waypoints(np.stack((start, end))))
+            free_waypoints, free_info = rollout.rollout(start, env.task.get_goal())
+            self.assertTrue(free_info["is_success"])
+            self.assertFalse(env.robot.validate_joint_waypoints(free_waypoints))
+
+            _, _, _, truncated, info = env.plan_ahead_step(rollout)
+            self.assertTrue(truncated)
+            self.assertEqual(info["planner_result"], PlannerResult.COLLISION)
+            np.testing.assert_allclose(env.robot.get_joint_angles(), start, atol=1e-6)
+        finally:
+            for name in ["obstacle1", "obstacle2", "obstacle3"]:
+                env.sim.set_base_pose(name, hidden, np.array([0.0, 0.0, 0.0, 1.0]))
+            rollout.close()
+            env.close()
+
+    @unittest.skipIf(find_spec("requests") is None or find_spec("PIL") is None, "ROSController needs requests, PIL")
+    def test_ros_controller(self):
+        from production.ros_controller.ros_controller import ROSController
+        controller = ROSController()
+        controller.go_to_capture_location()
+        self.wait_for_joint_state()
+        np.testing.assert_allclose(self.robot.get_joint_angles(), controller.capture_joint_degrees, atol=1e-6)
+        for _ in range(2):  # the camera pose is published with the frames, one may have started before the move
+            published = self.backend.camera_to_world
+            while self.backend.camera_to_world is published:
+                time.sleep(0.005)
+
+        camera_to_world = controller.get_camera_to_world_transform(refresh=True)
+        np.testing.assert_allclose(camera_to_world, self.backend.capture()[2], atol=1e-5)
+
+        pose = controller.create_pose(np.array([0.5, 0.0, 0.3]), np.array([1.0, 0.0, 0.0, 0.0]))
+        for planner in ["rrt", "ik"]:
+            plan, planning_time = controller.get_pose_goal_plan_with_duration(pose, planner)
+            self.assertTrue(plan[0])
+            self.assertGreaterEqual(planning_time, 0)
+        controller.go_to_home_position()
+
+    def test_camera_topics(self):
+        import rospy
+        messages = {}
+        subscriber = rospy.Subscriber(
+            "/camera/aligned_depth_to_color/image_raw", None, lambda msg: messages.setdefault("depth", msg)
+        )
+        start_time = time.time()
+        while "depth" not in messages and time.time() - start_time < 5.0:
+            time.sleep(0.01)
+        subscriber.unregister()
+        depth = messages["depth"].data
+        self.assertEqual(depth.dtype, np.uint16)
+        self.assertEqual(depth.shape, (240, 320))
+        self.assertTrue(np.all(depth > 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
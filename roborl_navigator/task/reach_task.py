@@ -6,9 +6,16 @@ from typing import (
 )
 
 import numpy as np
-from roborl_navigator.utils import distance, euler_to_quaternion
+from roborl_navigator.utils import (
+    distance,
+    euler_to_quaternion,
+    PhaseTimer,
+    goal_range_bounds,
+    obstacle_range_bounds,
+)
 from roborl_navigator.simulation import Simulation
 from roborl_navigator.robot import Robot
+from roborl_navigator.task.reachability import ReachabilityIndex
 
 Sim = TypeVar('Sim', bound=Simulation)
 Rob = TypeVar('Rob', bound=Robot)
@@ -25,6 +32,7 @@ class Reach:
         goal_range: Optional[float] = 0.3,
         orientation_task: Optional[bool] = False,
         demonstration: Optional[bool] = False,
+        reachability_index: Optional[ReachabilityIndex] = None,
     ) -> None:
         self.sim = sim
         self.robot = robot
@@ -37,16 +45,20 @@ class Reach:
         self.orientation_task = orientation_task
         self.distance_threshold = distance_threshold
         self.demonstration = demonstration
-
-        self.goal_range_low = np.array([0.5 - (goal_range / 2), -goal_range / 2, 0.05])
-        self.goal_range_high = np.array([0.5 + (goal_range / 2), goal_range / 2, goal_range / 2])
+        self.reachability_index = reachability_index
+        self.max_goal_attempts = 100
+        self.unreachable_goals = 0  # episodes whose goal is not in the reachability index
+        # the env replaces it with its own generator on reset, all episode sampling goes through it
+        self.np_random = np.random.default_rng()
+        self.timer = PhaseTimer()
+
+        self.goal_range_low, self.goal_range_high = goal_range_bounds(goal_range)
         self.orientation_range_low = np.array([-3, -0.8])
         self.orientation_range_high = np.array([-2, 0.4])
 
         self.obstacle_range = goal_range
-
-        self.obstacle_range_low = np.array([0.5 - (self.obstacle_range / 2), -self.obstacle_range / 2, 0.05])
-        self.obstacle_range_high = np.array([0.5 + (self.obstacle_range / 2), self.obstacle_range / 2, 0.05])
+        self.obstacle_range_low, self.obstacle_range_high = obstacle_range_bounds(self.obstacle_range)
+        self.min_obstacle_goal_distance = 0.05
 
         with self.sim.no_rendering():
             self.create_scene()
@@ -54,9 +66,19 @@ class Reach:
     def create_scene(self) -> None:
         self.sim.create_scene()
 
-    def reset(self) -> None:
-        self.goal = self._sample_goal()
-        self.obstacle1_pos, self.obstacle2_pos, self.obstacle3_pos = self._sample_obstacles()
+    def reset(self, scenario: Optional[np.ndarray] = None) -> None:
+        """Samples a new episode, or places a ScenarioBank record when scenario is given."""
+        if scenario is None:
+            self.goal = self._sample_goal()
+            self.obstacle1_pos, self.obstacle2_pos, self.obstacle3_pos = self._sample_obstacles()
+        else:
+            goal = np.asarray(scenario["goal"], dtype=np.float32)
+            if self.orientation_task:
+                goal = np.concatenate((goal, np.asarray(scenario["orientation"], dtype=np.float32)))
+            self.goal = goal
+            self.obstacle1_pos, self.obstacle2_pos, self.obstacle3_pos = np.asarray(
+                scenario["obstacles"], dtype=np.float64
+            )
 
         if not self.demonstration:
             self.sim.set_base_pose("target", self.goal[:3], np.array([0.0, 0.0, 0.0, 1.0]))
@@ -86,28 +108,44 @@ class Reach:
         return ee_position
 
     def _sample_goal(self) -> np.ndarray:
-        position = np.random.uniform(self.goal_range_low, self.goal_range_high)
+        for _ in range(self.max_goal_attempts):
+            goal = self._sample_goal_candidate()
+            if self.reachability_index is None or self._is_reachable_goal(goal):
+                return goal
+        self.unreachable_goals += 1
+        print(
+            f"No reachable goal in {self.max_goal_attempts} attempts, using an unreachable one"
+            f" ({self.unreachable_goals} so far)"
+        )
+        return goal
+
+    def _sample_goal_candidate(self) -> np.ndarray:
+        position = self.np_random.uniform(self.goal_range_low, self.goal_range_high)
         if self.orientation_task:
-            orientation = np.random.uniform(self.orientation_range_low, self.orientation_range_high)
+            orientation = self.np_random.uniform(self.orientation_range_low, self.orientation_range_high)
             return np.concatenate((
                 position,
                 orientation,
             )).astype(np.float32)
         return position
 
+    def _is_reachable_goal(self, goal: np.ndarray) -> bool:
+        return bool(self.reachability_index.is_reachable_goal(goal)[0])
+
     def _sample_obstacles(self):
-        position1 = np.random.uniform(self.obstacle_range_low, self.obstacle_range_high)
-        position2 = np.random.uniform(self.obstacle_range_low, self.obstacle_range_high)
-        position3 = np.random.uniform(self.obstacle_range_low, self.obstacle_range_high)
+        position1 = self.np_random.uniform(self.obstacle_range_low, self.obstacle_range_high)
+        position2 = self.np_random.uniform(self.obstacle_range_low, self.obstacle_range_high)
+        position3 = self.np_random.uniform(self.obstacle_range_low, self.obstacle_range_high)
 
-        min_dist_to_goal = 0.05
+        min_dist_to_goal = self.min_obstacle_goal_distance
+        goal_position = self.goal[:3]
 
-        while distance(position1, self.goal) < min_dist_to_goal:
-            position1 = np.random.uniform(self.obstacle_range_low, self.obstacle_range_high)
-        while distance(position2, self.goal) < min_dist_to_goal:
-            position2 = np.random.uniform(self.obstacle_range_low, self.obstacle_range_high)
-        while distance(position3, self.goal) < min_dist_to_goal:
-            position3 = np.random.uniform(self.obstacle_range_low, self.obstacle_range_high)
+        while distance(position1, goal_position) < min_dist_to_goal:
+            position1 = self.np_random.uniform(self.obstacle_range_low, self.obstacle_range_high)
+        while distance(position2, goal_position) < min_dist_to_goal:
+            position2 = self.np_random.uniform(self.obstacle_range_low, self.obstacle_range_high)
+        while distance(position3, goal_position) < min_dist_to_goal:
+            position3 = self.np_random.uniform(self.obstacle_range_low, self.obstacle_range_high)
 
         return position1, position2, position3
 
@@ -117,6 +155,10 @@ class Reach:
         return result
 
     def compute_reward(self, achieved_goal, desired_goal, info: Dict[str, Any], obstacle_dist=np.array([0.15])) -> np.ndarray:
+        with self.timer.phase("reward"):
+            return self._compute_reward(achieved_goal, desired_goal, obstacle_dist)
+
+    def _compute_reward(self, achieved_goal, desired_goal, obstacle_dist) -> np.ndarray:
         d = distance(achieved_goal, desired_goal, self.orientation_task)
         if self.reward_type == "sparse":
             return -np.array(d > self.distance_threshold, dtype=np.float32)
@@ -0,0 +1,181 @@
+import argparse
+import json
+import time
+from typing import (
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+
+from roborl_navigator.robot.panda_kinematics import (
+    forward_kinematics,
+    jacobian,
+)
+from roborl_navigator.utils import (
+    PandaConverter,
+    goal_range_bounds,
+    rotation_matrix_to_euler,
+)
+
+VOXEL_DTYPE = np.dtype([
+    ("count", np.uint32),  # number of sampled configurations whose end-effector falls in the voxel
+    ("manipulability", np.float32),  # best Yoshikawa manipulability sqrt(det(J J^T)) seen in the voxel
+    ("orientations", np.uint64),  # bitmask of reached (roll, pitch) bins, 8 x 8 bins
+])
+ORIENTATION_BINS = 8
+
+
+class ReachabilityIndex:
+    """Voxelized reachability and manipulability map of the Panda over a task workspace.
+
+    The voxel grid is stored as a structured .npy file next to a small .json file with its parameters, so it
+    can be memory-mapped and queried with O(1) lookups.
+
+    Args:
+        grid (np.ndarray): (X, Y, Z) array of VOXEL_DTYPE.
+        low (np.ndarray): World position of the grid corner.
+        voxel_size (float): Edge length of a voxel in meters.
+        bullet_model (bool): The grid indexes the Bullet Panda model instead of the real robot.
+    """
+
+    def __init__(self, grid: np.ndarray, low: np.ndarray, voxel_size: float, bullet_model: bool = False) -> None:
+        self.grid = grid
+        self.low = np.asarray(low, dtype=np.float64)
+        self.voxel_size = voxel_size
+        self.bullet_model = bullet_model
+        self.shape = np.array(grid.shape)
+
+    @classmethod
+    def build(
+        cls,
+        low: np.ndarray,
+        high: np.ndarray,
+        voxel_size: float = 0.01,
+        n_samples: int = 10_000_000,
+        batch_size: int = 500_000,
+        bullet_model: bool = False,
+        seed: Optional[int] = None,
+    ) -> "ReachabilityIndex":
+        """Samples joint configurations uniformly within the real Panda limits and bins their end-effector poses."""
+        low = np.asarray(low, dtype=np.float64)
+        shape = np.ceil((np.asarray(high) - low) / voxel_size).astype(int)
+        grid = np.zeros(tuple(shape), dtype=VOXEL_DTYPE)
+        index = cls(grid, low, voxel_size, bullet_model)
+
+        rng = np.random.default_rng(seed)
+        limits = np.array(PandaConverter().real_panda_limits)
+        for start in range(0, n_samples, batch_size):
+            joint_angles = rng.uniform(limits[:, 0], limits[:, 1], (min(batch_size, n_samples - start), 7))
+            transforms = forward_kinematics(joint_angles, bullet_model=bullet_model)
+            flat_index, inside = index.voxel_index(transforms[:, :3, 3])
+            if not np.any(inside):
+                continue
+            flat_index = flat_index[inside]
+            jacobians = jacobian(joint_angles[inside], bullet_model=bullet_model)
+            manipulability = np.sqrt(np.maximum(np.linalg.det(jacobians @ jacobians.transpose(0, 2, 1)), 0.0))
+            orientation_bin = index.orientation_bin(rotation_matrix_to_euler(transforms[inside, :3, :3]))
+            orientation_bits = np.left_shift(np.uint64(1), orientation_bin.astype(np.uint64))
+
+            flat_grid = grid.reshape(-1)
+            np.add.at(flat_grid["count"], flat_index, 1)
+            np.maximum.at(flat_grid["manipulability"], flat_index, manipulability.astype(np.float32))
+            np.bitwise_or.at(flat_grid["orientations"], flat_index, orientation_bits)
+        return index
+
+    @staticmethod
+    def orientation_bin(orientations: np.ndarray) -> np.ndarray:
+        """Flat (roll, pitch) bin of (N, 2+) euler orientations."""
+        orientations = np.atleast_2d(orientations)
+        roll = np.floor((orientations[:, 0] + np.pi) / (2 * np.pi) * ORIENTATION_BINS).astype(int)
+        pitch = np.floor((orientations[:, 1] + np.pi / 2) / np.pi * ORIENTATION_BINS).astype(int)
+        roll = np.clip(roll, 0, ORIENTATION_BINS - 1)
+        pitch = np.clip(pitch, 0, ORIENTATION_BINS - 1)
+        return roll * ORIENTATION_BINS + pitch
+
+    def voxel_index(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Flat voxel index of (N, 3) positions and a mask of the positions inside the grid."""
+        cells = np.floor((np.atleast_2d(positions)[:, :3] - self.low) / self.voxel_size).astype(np.int64)
+        inside = np.all((cells >= 0) & (cells < self.shape), axis=-1)
+        cells = np.where(inside[:, None], cells, 0)
+        return np.ravel_multi_index(cells.T, tuple(self.shape)), inside
+
+    def is_reachable(
+        self, positions: np.ndarray, orientations: Optional[np.ndarray] = None, min_count: int = 1
+    ) -> np.ndarray:
+        """Returns a mask of reachable (N, 3) positions, optionally with (N, 2+) euler orientations."""
+        flat_index, inside = self.voxel_index(positions)
+        voxels = self.grid.reshape(-1)[flat_index]
+        reachable = inside & (voxels["count"] >= min_count)
+        if orientations is not None:
+            bits = np.left_shift(np.uint64(1), self.orientation_bin(orientations).astype(np.uint64))
+            reachable &= np.bitwise_and(voxels["orientations"], bits) != 0
+        return reachable
+
+    def is_reachable_goal(self, goals: np.ndarray) -> np.ndarray:
+        """Mask of reachable (N, 3) Reach goals, the (roll, pitch) of (N, 5) orientation task goals is checked too."""
+        goals = np.atleast_2d(goals)
+        return self.is_reachable(goals[:, :3], goals[:, 3:5] if goals.shape[1] > 3 else None)
+
+    def manipulability(self, positions: np.ndarray) -> np.ndarray:
+        """Best manipulability seen around (N, 3) positions, 0 outside the grid or where nothing was reached."""
+        flat_index, inside = self.voxel_index(positions)
+        return np.where(inside, self.grid.reshape(-1)[flat_index]["manipulability"], 0.0)
+
+    def save(self, path: str) -> None:
+        """Writes path.npy (voxel grid) and path.json (grid parameters)."""
+        path = path[:-4] if path.endswith(".npy") else path
+        np.save(path + ".npy", self.grid)
+        with open(path + ".json", "w") as meta_file:
+            json.dump({
+                "version": 1,
+                "low": self.low.tolist(),
+                "voxel_size": self.voxel_size,
+                "shape": self.shape.tolist(),
+                "orientation_bins": ORIENTATION_BINS,
+                "bullet_model": self.bullet_model,
+            }, meta_file)
+
+    @classmethod
+    def load(
+        cls, path: str, mmap_mode: Optional[str] = "r", bullet_model: Optional[bool] = None
+    ) -> "ReachabilityIndex":
+        """Loads an index, bullet_model rejects one built for the other Panda model when given."""
+        path = path[:-4] if path.endswith(".npy") else path
+        with open(path + ".json", "r") as meta_file:
+            meta = json.load(meta_file)
+        if bullet_model is not None and meta["bullet_model"] != bullet_model:
+            built_for, expected = ("Bullet", "real") if meta["bullet_model"] else ("real", "Bullet")
+            raise ValueError(
+                f"{path} indexes the {built_for} Panda but the {expected} one is expected, "
+                f"rebuild it {'with' if bullet_model else 'without'} --bullet-model"
+            )
+        grid = np.load(path + ".npy", mmap_mode=mmap_mode)
+        return cls(grid, np.array(meta["low"]), meta["voxel_size"], meta["bullet_model"])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the Panda reachability index of the Reach task workspace.")
+    parser.add_argument("--output", required=True, help="Output path, .npy and .json files are written")
+    parser.add_argument("--goal-range", type=float, default=0.3)
+    parser.add_argument("--margin", type=float, default=0.05, help="Meters added around the goal range")
+    parser.add_argument("--voxel-size", type=float, default=0.02)
+    parser.add_argument("--samples", type=int, default=50_000_000)
+    parser.add_argument("--bullet-model", action="store_true", help="Index the Bullet Panda instead of the real one")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    goal_low, goal_high = goal_range_bounds(args.goal_range)
+    start_time = time.time()
+    reachability_index = ReachabilityIndex.build(
+        goal_low - args.margin,
+        goal_high + args.margin,
+        voxel_size=args.voxel_size,
+        n_samples=args.samples,
+        bullet_model=args.bullet_model,
+        seed=args.seed,
+    )
+    reachability_index.save(args.output)
+    covered = np.mean(reachability_index.grid["count"] > 0)
+    print(f"Built {reachability_index.shape.tolist()} voxels in {time.time() - start_time:.1f} s")
+    print(f"{covered:.1%} of the voxels are reachable")
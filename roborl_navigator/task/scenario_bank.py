@@ -0,0 +1,190 @@
+import argparse
+import json
+import time
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Union,
+)
+
+import numpy as np
+
+from roborl_navigator.task.reachability import ReachabilityIndex
+from roborl_navigator.utils import (
+    goal_range_bounds,
+    obstacle_range_bounds,
+)
+
+SCENARIO_DTYPE = np.dtype([
+    ("goal", np.float32, (3,)),  # goal position in the base frame
+    ("orientation", np.float32, (2,)),  # goal (roll, pitch), only used by the orientation task
+    ("obstacles", np.float32, (3, 3)),  # positions of obstacle1, obstacle2 and obstacle3
+    ("seed", np.uint64),  # seed of the episode RNG
+])
+SCENARIO_BANK_VERSION = 1
+
+
+def _task_goals(goals: np.ndarray, orientations: Optional[np.ndarray]) -> np.ndarray:
+    """Goals as Reach stores them, position followed by (roll, pitch) for the orientation task."""
+    return goals if orientations is None else np.concatenate((goals, orientations), axis=-1)
+
+
+class ScenarioBank:
+    """Fixed set of Reach episodes (goal, goal orientation, obstacle positions and seed) for repeatable evaluation.
+
+    Stored as a structured .npy file, memory-mapped on load, next to a .json file with the sampling parameters.
+    A record is placed with PandaBulletEnv.reset(options={"scenario": bank[i]}).
+
+    Args:
+        scenarios (np.ndarray): Array of SCENARIO_DTYPE.
+        params (Dict[str, Any]): Sampling parameters the scenarios were generated with.
+    """
+
+    def __init__(self, scenarios: np.ndarray, params: Optional[Dict[str, Any]] = None) -> None:
+        self.scenarios = scenarios
+        self.params = params or {}
+
+    def __len__(self) -> int:
+        return len(self.scenarios)
+
+    def __getitem__(self, index: Union[int, slice, np.ndarray]) -> np.ndarray:
+        return self.scenarios[index]
+
+    @classmethod
+    def generate(
+        cls,
+        n_scenarios: int,
+        goal_range: float = 0.3,
+        obstacle_range: Optional[float] = None,
+        min_obstacle_goal_distance: float = 0.05,
+        orientation_low: Union[np.ndarray, list] = (-3.0, -0.8),
+        orientation_high: Union[np.ndarray, list] = (-2.0, 0.4),
+        reachability_index: Optional[ReachabilityIndex] = None,
+        max_goal_attempts: int = 100,
+        orientation_task: bool = False,
+        seed: int = 0,
+        batch_size: int = 1_000_000,
+    ) -> "ScenarioBank":
+        """Samples scenarios the way Reach.reset does, rejected goals and obstacles are redrawn batch-wise.
+
+        Args:
+            n_scenarios (int): Number of scenarios.
+            goal_range (float): Goal box size of the Reach task.
+            obstacle_range (float): Obstacle area size, Reach uses the goal range.
+            min_obstacle_goal_distance (float): Obstacles closer to the goal are redrawn.
+            reachability_index (ReachabilityIndex): Unreachable goals are redrawn up to max_goal_attempts times.
+            orientation_task (bool): Goal orientations are checked against the index too, like Reach does.
+            seed (int): Seed of the bank, the same seed and parameters give the same scenarios.
+        """
+        obstacle_range = goal_range if obstacle_range is None else obstacle_range
+        goal_low, goal_high = goal_range_bounds(goal_range)
+        obstacle_low, obstacle_high = obstacle_range_bounds(obstacle_range)
+        rng = np.random.default_rng(seed)
+
+        scenarios = np.zeros(n_scenarios, dtype=SCENARIO_DTYPE)
+        for start in range(0, n_scenarios, batch_size):
+            n = min(batch_size, n_scenarios - start)
+            goals = rng.uniform(goal_low, goal_high, (n, 3))
+            orientations = rng.uniform(orientation_low, orientation_high, (n, 2)) if orientation_task else None
+            if reachability_index is not None:
+                rejected = ~reachability_index.is_reachable_goal(_task_goals(goals, orientations))
+                for _ in range(max_goal_attempts - 1):
+                    if not np.any(rejected):
+                        break
+                    n_rejected = int(rejected.sum())
+                    goals[rejected] = rng.uniform(goal_low, goal_high, (n_rejected, 3))
+                    if orientations is not None:
+                        orientations[rejected] = rng.uniform(orientation_low, orientation_high, (n_rejected, 2))
+                    rejected[rejected] = ~reachability_index.is_reachable_goal(
+                        _task_goals(goals, orientations)[rejected]
+                    )
+
+            obstacles = rng.uniform(obstacle_low, obstacle_high, (n, 3, 3))
+            rejected = np.linalg.norm(obstacles - goals[:, None], axis=-1) < min_obstacle_goal_distance
+            while np.any(rejected):
+                obstacles[rejected] = rng.uniform(obstacle_low, obstacle_high, (int(rejected.sum()), 3))
+                goal_index = np.nonzero(rejected)[0]
+                rejected[rejected] = np.linalg.norm(obstacles[rejected] - goals[goal_index], axis=-1) < (
+                    min_obstacle_goal_distance
+                )
+
+            batch = scenarios[start:start + n]
+            batch["goal"] = goals
+            if orientations is None:
+                orientations = rng.uniform(orientation_low, orientation_high, (n, 2))
+            batch["orientation"] = orientations
+            batch["obstacles"] = obstacles
+            batch["seed"] = rng.integers(0, 2 ** 63, n, dtype=np.uint64)
+
+        params = {
+            "goal_range": goal_range,
+            "obstacle_range": obstacle_range,
+            "min_obstacle_goal_distance": min_obstacle_goal_distance,
+            "orientation_low": list(orientation_low),
+            "orientation_high": list(orientation_high),
+            "reachability_filtered": reachability_index is not None,
+            "orientation_task": orientation_task,
+            "seed": seed,
+        }
+        return cls(scenarios, params)
+
+    @classmethod
+    def from_csv(cls, path: str, seed: int = 0) -> "ScenarioBank":
+        """Converts the goal and three obstacle positions rows of the old random goal CSV files."""
+        rows = np.loadtxt(path, delimiter=",", ndmin=2)
+        scenarios = np.zeros(len(rows), dtype=SCENARIO_DTYPE)
+        scenarios["goal"] = rows[:, :3]
+        scenarios["obstacles"] = rows[:, 3:12].reshape(-1, 3, 3)
+        scenarios["seed"] = np.random.default_rng(seed).integers(0, 2 ** 63, len(rows), dtype=np.uint64)
+        return cls(scenarios, {"source": path, "seed": seed})
+
+    def save(self, path: str) -> None:
+        """Writes path.npy (scenarios) and path.json (version and sampling parameters)."""
+        path = path[:-4] if path.endswith(".npy") else path
+        np.save(path + ".npy", self.scenarios)
+        with open(path + ".json", "w") as meta_file:
+            json.dump({"version": SCENARIO_BANK_VERSION, "size": len(self), **self.params}, meta_file)
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = "r") -> "ScenarioBank":
+        path = path[:-4] if path.endswith(".npy") else path
+        with open(path + ".json", "r") as meta_file:
+            params = json.load(meta_file)
+        if params.pop("version") != SCENARIO_BANK_VERSION:
+            raise ValueError(f"Scenario bank {path} has an unsupported version")
+        params.pop("size")
+        scenarios = np.load(path + ".npy", mmap_mode=mmap_mode)
+        if scenarios.dtype != SCENARIO_DTYPE:
+            raise ValueError(f"Scenario bank {path} has an unexpected dtype {scenarios.dtype}")
+        return cls(scenarios, params)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate a scenario bank of Reach episodes.")
+    parser.add_argument("--output", required=True, help="Output path, .npy and .json files are written")
+    parser.add_argument("--scenarios", type=int, default=10_000)
+    parser.add_argument("--goal-range", type=float, default=0.2)
+    parser.add_argument("--min-obstacle-goal-distance", type=float, default=0.05)
+    parser.add_argument("--reachability-index", help="Only keep goals reachable in this (Bullet model) index")
+    parser.add_argument("--orientation-task", action="store_true", help="Check goal orientations in the index")
+    parser.add_argument("--from-csv", help="Convert an old random goal CSV file instead of sampling")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start_time = time.time()
+    if args.from_csv:
+        bank = ScenarioBank.from_csv(args.from_csv, seed=args.seed)
+    else:
+        bank = ScenarioBank.generate(
+            args.scenarios,
+            goal_range=args.goal_range,
+            min_obstacle_goal_distance=args.min_obstacle_goal_distance,
+            reachability_index=(
+                ReachabilityIndex.load(args.reachability_index, bullet_model=True) if args.reachability_index else None
+            ),
+            orientation_task=args.orientation_task,
+            seed=args.seed,
+        )
+    bank.save(args.output)
+    print(f"Wrote {len(bank)} scenarios in {time.time() - start_time:.2f} s")
@@ -0,0 +1,78 @@
+import os
+import tempfile
+
+import numpy as np
+import unittest
+
+from roborl_navigator.robot.panda_kinematics import ee_poses
+from roborl_navigator.task.reachability import ReachabilityIndex
+from roborl_navigator.utils import (
+    PandaConverter,
+    filter_reachable_grasps,
+    goal_range_bounds,
+)
+
+
+class TestReachabilityIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.low, cls.high = goal_range_bounds(0.3)
+        cls.index = ReachabilityIndex.build(cls.low - 0.05, cls.high + 0.05, voxel_size=0.05, n_samples=1_000_000, seed=0)
+
+    def test_sampled_poses_are_reachable(self):
+        limits = np.array(PandaConverter().real_panda_limits)
+        joint_angles = np.random.default_rng(1).uniform(limits[:, 0], limits[:, 1], (50_000, 7))
+        positions, _ = ee_poses(joint_angles, quaternion=False)
+        inside = self.index.voxel_index(positions)[1]
+        self.assertTrue(np.any(inside))
+        reachable = self.index.is_reachable(positions[inside])
+        # independent samples land in voxels the index has already seen almost always
+        self.assertGreater(np.mean(reachable), 0.9)
+        self.assertTrue(np.all(self.index.manipulability(positions[inside][reachable]) > 0))
+
+    def test_outside_grid_is_unreachable(self):
+        positions = np.array([[2.0, 0.0, 0.1], [0.5, 0.0, -1.0], [-1.0, -1.0, 3.0]])
+        np.testing.assert_array_equal(self.index.is_reachable(positions), [False, False, False])
+        np.testing.assert_array_equal(self.index.manipulability(positions), [0.0, 0.0, 0.0])
+
+    def test_save_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "reachability")
+            self.index.save(path)
+            loaded = ReachabilityIndex.load(path + ".npy")
+            self.assertIsInstance(loaded.grid, np.memmap)
+            np.testing.assert_array_equal(loaded.grid, self.index.grid)
+            positions = np.random.default_rng(2).uniform(self.low, self.high, (1000, 3))
+            np.testing.assert_array_equal(loaded.is_reachable(positions), self.index.is_reachable(positions))
+            del loaded
+            # the index samples the real Panda, the Bullet environment must not use it
+            ReachabilityIndex.load(path, bullet_model=False)
+            with self.assertRaisesRegex(ValueError, "--bullet-model"):
+                ReachabilityIndex.load(path, bullet_model=True)
+
+    def test_unreachable_goals_are_counted(self):
+        from roborl_navigator.environment.env_panda_bullet import PandaBulletEnv
+        empty = ReachabilityIndex(np.zeros((2, 2, 2), dtype=self.index.grid.dtype), self.low, 0.2, bullet_model=True)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "reachability")
+            empty.save(path)
+            env = PandaBulletEnv(render_mode="rgb_array", reachability_index=path)
+        env.task.max_goal_attempts = 3
+        unreachable_goals = env.task.unreachable_goals
+        env.reset(seed=0)
+        self.assertEqual(env.task.unreachable_goals, unreachable_goals + 1)
+        env.close()
+
+    def test_grasp_filter_uses_index(self):
+        poses = np.zeros((2, 7))
+        poses[:, 6] = 1.0
+        poses[0, :3] = [0.5, 0.0, 0.05]
+        poses[1, :3] = [0.5, 0.0, 0.05]
+        poses[1, 0] = 10.0
+        mask = filter_reachable_grasps(poses, self.low, self.high, margin=10.0, reachability_index=self.index)
+        np.testing.assert_array_equal(mask, [bool(self.index.is_reachable(poses[:1, :3])[0]), False])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+
+import numpy as np
+import unittest
+
+from roborl_navigator.environment.env_panda_bullet import PandaBulletEnv
+from roborl_navigator.task.reachability import ReachabilityIndex
+from roborl_navigator.task.scenario_bank import (
+    SCENARIO_DTYPE,
+    ScenarioBank,
+)
+from roborl_navigator.utils import (
+    goal_range_bounds,
+    in_goal_range,
+    obstacle_range_bounds,
+)
+
+
+class TestScenarioBank(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.bank = ScenarioBank.generate(20_000, goal_range=0.2, min_obstacle_goal_distance=0.05, seed=3)
+
+    def test_sampling_constraints(self):
+        scenarios = self.bank.scenarios
+        self.assertEqual(scenarios.dtype, SCENARIO_DTYPE)
+        self.assertTrue(np.all(in_goal_range(scenarios["goal"], *goal_range_bounds(0.2), margin=1e-6)))
+        obstacles = scenarios["obstacles"].reshape(-1, 3)
+        self.assertTrue(np.all(in_goal_range(obstacles, *obstacle_range_bounds(0.2), margin=1e-6)))
+        distances = np.linalg.norm(scenarios["obstacles"] - scenarios["goal"][:, None], axis=-1)
+        self.assertGreaterEqual(distances.min(), 0.05 - 1e-6)
+        self.assertEqual(len(np.unique(scenarios["seed"])), len(scenarios))
+
+    def test_seeded(self):
+        same = ScenarioBank.generate(20_000, goal_range=0.2, min_obstacle_goal_distance=0.05, seed=3)
+        other = ScenarioBank.generate(20_000, goal_range=0.2, min_obstacle_goal_distance=0.05, seed=4)
+        np.testing.assert_array_equal(same.scenarios, self.bank.scenarios)
+        self.assertFalse(np.array_equal(other.scenarios["goal"], self.bank.scenarios["goal"]))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bank")
+            self.bank.save(path)
+            loaded = ScenarioBank.load(path)
+            self.assertIsInstance(loaded.scenarios, np.memmap)
+            np.testing.assert_array_equal(loaded[:], self.bank[:])
+            self.assertEqual(loaded.params["goal_range"], 0.2)
+            self.assertEqual(loaded.params["seed"], 3)
+
+    def test_reachability_filter_matches_reach(self):
+        low, high = goal_range_bounds(0.2)
+        index = ReachabilityIndex.build(low - 0.05, high + 0.05, voxel_size=0.05, n_samples=300_000, seed=0)
+        for orientation_task in [False, True]:
+            bank = ScenarioBank.generate(
+                2000, goal_range=0.2, reachability_index=index, orientation_task=orientation_task, seed=0
+            )
+            goals = bank.scenarios["goal"]
+            if orientation_task:
+                goals = np.concatenate((goals, bank.scenarios["orientation"]), axis=-1)
+            # the goals Reach._is_reachable_goal would accept
+            self.assertTrue(np.all(index.is_reachable_goal(goals)))
+
+    def test_from_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "goals.csv")
+            rows = np.arange(24, dtype=np.float64).reshape(2, 12) / 100
+            np.savetxt(path, rows, delimiter=",")
+            bank = ScenarioBank.from_csv(path)
+        self.assertEqual(len(bank), 2)
+        np.testing.assert_allclose(bank[1]["goal"], rows[1, :3], atol=1e-6)
+        np.testing.assert_allclose(bank[1]["obstacles"][2], rows[1, 9:12], atol=1e-6)
+
+    def test_env_reset_places_scenario(self):
+        env = PandaBulletEnv(render_mode="rgb_array", goal_range=0.2)
+        try:
+            scenario = self.bank[7]
+            observation, _ = env.reset(options={"scenario": scenario})
+            np.testing.assert_allclose(observation["desired_goal"], scenario["goal"], atol=1e-6)
+            for i in range(3):
+                body = env.sim._bodies_idx[f"obstacle{i + 1}"]
+                position = env.sim.physics_client.getBasePositionAndOrientation(body)[0]
+                np.testing.assert_allclose(position, scenario["obstacles"][i], atol=1e-6)
+            body = env.sim._bodies_idx["target"]
+            np.testing.assert_allclose(
+                env.sim.physics_client.getBasePositionAndOrientation(body)[0], scenario["goal"], atol=1e-6
+            )
+        finally:
+            env.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
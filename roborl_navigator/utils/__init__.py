@@ -1,8 +1,28 @@
+from .camera import *
 from .converter import *
 from .distance import *
 from .enums import *
 from .formulas import *
+from .grasp import *
+from .grasp_cache import GraspResultCache
+from .occupancy import OccupancyMap
+from .point_cloud import *
+from .profiling import PhaseTimer
+from .results_store import (
+    ResultsStore,
+    duration_stats,
+    read_results,
+    results_to_arrays,
+    results_to_dataframe,
+)
+from .tracing import (
+    Tracer,
+    traced,
+    tracer,
+)
+from .trajectory import *
 from .wrapper import *
+from .workspace import *
 from .path_helper import (
     get_assets_path,
     get_model_directory,
@@ -0,0 +1,92 @@
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+
+
+def project_points(points: np.ndarray, intrinsics: np.ndarray) -> np.ndarray:
+    """Projects (N, 3) camera frame points to (N, 2) pixel coordinates (u, v). This function is vectorized."""
+    points = np.atleast_2d(points)
+    z = np.maximum(points[:, 2], 1e-6)
+    u = intrinsics[0, 0] * points[:, 0] / z + intrinsics[0, 2]
+    v = intrinsics[1, 1] * points[:, 1] / z + intrinsics[1, 2]
+    return np.stack((u, v), axis=-1)
+
+
+def pixel_grid(height: int, width: int, intrinsics: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Precomputes the normalized (x / z, y / z) ray of every pixel, reusable while K and resolution are unchanged."""
+    u, v = np.meshgrid(np.arange(width, dtype=np.float64), np.arange(height, dtype=np.float64))
+    x = (u - intrinsics[0, 2]) / intrinsics[0, 0]
+    y = (v - intrinsics[1, 2]) / intrinsics[1, 1]
+    return x, y
+
+
+def backproject_depth(
+    depth: np.ndarray, intrinsics: np.ndarray, grid: Optional[Tuple[np.ndarray, np.ndarray]] = None
+) -> np.ndarray:
+    """Back-projects an (H, W) metric depth image to (H, W, 3) camera frame points."""
+    if grid is None:
+        grid = pixel_grid(depth.shape[0], depth.shape[1], intrinsics)
+    x, y = grid
+    return np.stack((x * depth, y * depth, depth), axis=-1)
+
+
+def box_corners(low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """Returns the 8 corners of an axis aligned box as (8, 3)."""
+    index = np.array([[i >> 2 & 1, i >> 1 & 1, i & 1] for i in range(8)])
+    return np.where(index, high, low)
+
+
+def workspace_roi(
+    low: np.ndarray,
+    high: np.ndarray,
+    world_to_camera: np.ndarray,
+    intrinsics: np.ndarray,
+    image_shape: Tuple[int, int],
+    margin: float = 0.0,
+) -> Tuple[int, int, int, int]:
+    """Projects a world frame box, grown by margin meters, into the image.
+
+    Returns:
+        Tuple[int, int, int, int]: (x_min, y_min, x_max, y_max) clipped to the image, max values exclusive.
+    """
+    corners = box_corners(np.asarray(low) - margin, np.asarray(high) + margin)
+    corners = np.matmul(corners, world_to_camera[:3, :3].T) + world_to_camera[:3, 3]
+    pixels = project_points(corners, intrinsics)
+    height, width = image_shape[:2]
+    x_min, y_min = np.floor(pixels.min(axis=0)).astype(int)
+    x_max, y_max = np.ceil(pixels.max(axis=0)).astype(int) + 1
+    return (
+        int(np.clip(x_min, 0, width)),
+        int(np.clip(y_min, 0, height)),
+        int(np.clip(x_max, 0, width)),
+        int(np.clip(y_max, 0, height)),
+    )
+
+
+def crop_intrinsics(intrinsics: np.ndarray, roi: Tuple[int, int, int, int], downsample: int = 1) -> np.ndarray:
+    """Intrinsics of an image cropped to roi and subsampled with a pixel stride of downsample."""
+    intrinsics = np.array(intrinsics, dtype=np.float64)
+    intrinsics[0, 2] -= roi[0]
+    intrinsics[1, 2] -= roi[1]
+    intrinsics[:2, :3] /= downsample
+    return intrinsics
+
+
+def crop_capture(
+    data: Dict[str, Any], roi: Tuple[int, int, int, int], downsample: int = 1, depth_dtype: Any = np.float32
+) -> Dict[str, Any]:
+    """Crops and subsamples a capture dictionary (rgb, depth, label, K) and adjusts K to match."""
+    x_min, y_min, x_max, y_max = roi
+    window = (slice(y_min, y_max, downsample), slice(x_min, x_max, downsample))
+    result = dict(data)
+    result["rgb"] = np.ascontiguousarray(data["rgb"][window])
+    result["depth"] = np.ascontiguousarray(data["depth"][window], dtype=depth_dtype)
+    if data.get("label") is not None:
+        result["label"] = np.ascontiguousarray(data["label"][window])
+    result["K"] = crop_intrinsics(data["K"], roi, downsample)
+    return result
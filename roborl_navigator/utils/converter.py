@@ -57,16 +57,17 @@ class PandaConverter:
         mapped_value = ((value - from_min) / (from_max - from_min)) * (to_max - to_min) + to_min
         return mapped_value
 
+    @staticmethod
+    def map_values(joint_values, from_limits, to_limits):
+        """Vectorized map_value for (7,) or (N, 7) joint values."""
+        from_limits = np.asarray(from_limits)
+        to_limits = np.asarray(to_limits)
+        values = np.clip(np.asarray(joint_values, dtype=np.float64), from_limits[:, 0], from_limits[:, 1])
+        scale = (to_limits[:, 1] - to_limits[:, 0]) / (from_limits[:, 1] - from_limits[:, 0])
+        return (values - from_limits[:, 0]) * scale + to_limits[:, 0]
+
     def bullet_to_real(self, joint_values):
-        mapped_values = []
-        for input_value, from_range, to_range in zip(joint_values, self.bullet_panda_limits, self.real_panda_limits):
-            mapped_value = self.map_value(input_value, from_range, to_range)
-            mapped_values.append(mapped_value)
-        return np.array(mapped_values)
+        return self.map_values(joint_values, self.bullet_panda_limits, self.real_panda_limits)
 
     def real_to_bullet(self, joint_values):
-        mapped_values = []
-        for input_value, from_range, to_range in zip(joint_values, self.real_panda_limits, self.bullet_panda_limits):
-            mapped_value = self.map_value(input_value, from_range, to_range)
-            mapped_values.append(mapped_value)
-        return np.array(mapped_values)
+        return self.map_values(joint_values, self.real_panda_limits, self.bullet_panda_limits)
@@ -13,15 +13,41 @@ from typing import (
 
 
 def euler_to_quaternion(orientation: Union[np.ndarray, List[float]]) -> np.ndarray:
-    roll = orientation[0]
-    pitch = orientation[1]
-    yaw = orientation[2]
+    """Accepts a single (3,) orientation or a batch shaped (..., 3). Returns quaternions as (x, y, z, w)."""
+    orientation = np.asarray(orientation, dtype=np.float64)
+    roll = orientation[..., 0]
+    pitch = orientation[..., 1]
+    yaw = orientation[..., 2]
 
     qx = np.sin(roll / 2) * np.cos(pitch / 2) * np.cos(yaw / 2) - np.cos(roll / 2) * np.sin(pitch / 2) * np.sin(yaw / 2)
     qy = np.cos(roll / 2) * np.sin(pitch / 2) * np.cos(yaw / 2) + np.sin(roll / 2) * np.cos(pitch / 2) * np.sin(yaw / 2)
     qz = np.cos(roll / 2) * np.cos(pitch / 2) * np.sin(yaw / 2) - np.sin(roll / 2) * np.sin(pitch / 2) * np.cos(yaw / 2)
     qw = np.cos(roll / 2) * np.cos(pitch / 2) * np.cos(yaw / 2) + np.sin(roll / 2) * np.sin(pitch / 2) * np.sin(yaw / 2)
-    return np.array((qx, qy, qz, qw))
+    return np.stack((qx, qy, qz, qw), axis=-1)
+
+
+def rotation_matrix_to_euler(rotation: np.ndarray) -> np.ndarray:
+    """Converts (..., 3, 3) rotation matrices (or the rotation part of 4x4 transforms) to (roll, pitch, yaw)."""
+    rotation = np.asarray(rotation)
+    roll = np.arctan2(rotation[..., 2, 1], rotation[..., 2, 2])
+    pitch = np.arcsin(np.clip(-rotation[..., 2, 0], -1.0, 1.0))
+    yaw = np.arctan2(rotation[..., 1, 0], rotation[..., 0, 0])
+    return np.stack((roll, pitch, yaw), axis=-1)
+
+
+def quaternion_to_rotation_matrix(quaternion: np.ndarray) -> np.ndarray:
+    """Converts (..., 4) quaternions given as (x, y, z, w) to (..., 3, 3) rotation matrices."""
+    quaternion = np.asarray(quaternion, dtype=np.float64)
+    quaternion = quaternion / np.linalg.norm(quaternion, axis=-1, keepdims=True)
+    x, y, z, w = quaternion[..., 0], quaternion[..., 1], quaternion[..., 2], quaternion[..., 3]
+    return np.stack(
+        (
+            np.stack((1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)), axis=-1),
+            np.stack((2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)), axis=-1),
+            np.stack((2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)), axis=-1),
+        ),
+        axis=-2,
+    )
 
 
 def quaternion_to_euler(quaternion: np.ndarray) -> np.ndarray:
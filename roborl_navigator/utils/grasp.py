@@ -0,0 +1,107 @@
+from typing import (
+    Any,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+
+from .formulas import (
+    euler_to_quaternion,
+    quaternion_to_rotation_matrix,
+    rotation_matrix_to_euler,
+)
+from .workspace import (
+    PANDA_MAX_REACH,
+    in_goal_range,
+    in_reachable_workspace,
+)
+
+
+def load_grasp_predictions(path: str, segment: int = -1) -> Tuple[np.ndarray, np.ndarray]:
+    """Loads Contact-GraspNet predictions.npz and returns (grasps (N, 4, 4), scores (N,)) of a segment."""
+    data = np.load(path, allow_pickle=True)
+    grasps = np.asarray(data['pred_grasps_cam'].item()[segment], dtype=np.float64)
+    scores = np.asarray(data['scores'].item()[segment], dtype=np.float64)
+    return grasps, scores
+
+
+def top_k_grasps(grasps: np.ndarray, scores: np.ndarray, k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the k best grasps sorted by descending score. Returns every grasp when k is None."""
+    if k is None or k >= len(scores):
+        order = np.argsort(-scores, kind="stable")
+    else:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return grasps[order], scores[order]
+
+
+def grasps_to_poses(grasps: np.ndarray, quaternion: bool = False) -> np.ndarray:
+    """Converts (N, 4, 4) grasp transforms to (N, 6) position + euler or (N, 7) position + quaternion poses."""
+    positions = grasps[:, :3, 3]
+    orientations = rotation_matrix_to_euler(grasps[:, :3, :3])
+    if quaternion:
+        orientations = euler_to_quaternion(orientations)
+    return np.concatenate((positions, orientations), axis=-1)
+
+
+def poses_to_grasps(poses: np.ndarray) -> np.ndarray:
+    """Inverse of grasps_to_poses, accepts (N, 6) position + euler or (N, 7) position + quaternion poses."""
+    poses = np.atleast_2d(poses)
+    orientations = poses[:, 3:]
+    if orientations.shape[-1] == 3:
+        orientations = euler_to_quaternion(orientations)
+    grasps = np.zeros((len(poses), 4, 4))
+    grasps[:, :3, :3] = quaternion_to_rotation_matrix(orientations)
+    grasps[:, :3, 3] = poses[:, :3]
+    grasps[:, 3, 3] = 1.0
+    return grasps
+
+
+def transform_grasps(grasps: np.ndarray, transform: np.ndarray) -> np.ndarray:
+    """Moves (N, 4, 4) grasp transforms to another frame with a single 4x4 homogeneous transform."""
+    return np.matmul(transform, grasps)
+
+
+def filter_reachable_grasps(
+    poses: np.ndarray,
+    goal_range_low: np.ndarray,
+    goal_range_high: np.ndarray,
+    margin: float = 0.0,
+    max_reach: float = PANDA_MAX_REACH,
+    reachability_index: Optional[Any] = None,
+) -> np.ndarray:
+    """Returns a boolean mask of the base frame poses that are reachable and inside the task goal range.
+
+    A ReachabilityIndex, when given, replaces the reach sphere approximation with its voxel lookups.
+    """
+    positions = poses[:, :3]
+    if reachability_index is not None:
+        reachable = reachability_index.is_reachable(positions)
+    else:
+        reachable = in_reachable_workspace(positions, max_reach=max_reach)
+    return reachable & in_goal_range(positions, goal_range_low, goal_range_high, margin)
+
+
+def select_grasp_candidates(
+    grasps: np.ndarray,
+    scores: np.ndarray,
+    transform: np.ndarray,
+    goal_range_low: np.ndarray,
+    goal_range_high: np.ndarray,
+    k: Optional[int] = 10,
+    margin: float = 0.0,
+    reachability_index: Optional[Any] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Top-k extraction, base frame transform and reachability filtering of camera frame grasps.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (M, 7) position + quaternion poses in the base frame, best first,
+        and their scores. M is zero when no candidate is reachable.
+    """
+    grasps, scores = top_k_grasps(grasps, scores, k)
+    poses = grasps_to_poses(transform_grasps(grasps, transform), quaternion=True)
+    mask = filter_reachable_grasps(
+        poses, goal_range_low, goal_range_high, margin, reachability_index=reachability_index
+    )
+    return poses[mask], scores[mask]
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import (
+    Dict,
+    Optional,
+)
+
+import numpy as np
+
+
+class GraspResultCache:
+    """Disk backed cache of grasp detection results keyed by a hash of the captured RGB and depth content.
+
+    Args:
+        directory (str): Where results and the index are stored, survives restarts.
+        max_entries (int): Least recently used results are evicted above this size.
+        max_age (float): Results older than this many seconds are evicted. None disables age eviction.
+        downsample (int): Pixel stride applied before hashing, larger values match near-duplicate scenes.
+        depth_step (float): Depth quantization in meters applied before hashing, 0 hashes raw values.
+        rgb_bits (int): Number of most significant bits of each color channel kept before hashing.
+    """
+
+    index_file_name = "index.json"
+
+    def __init__(
+        self,
+        directory: str,
+        max_entries: int = 64,
+        max_age: Optional[float] = 7 * 24 * 3600,
+        downsample: int = 1,
+        depth_step: float = 0.0,
+        rgb_bits: int = 8,
+    ) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.downsample = downsample
+        self.depth_step = depth_step
+        self.rgb_bits = rgb_bits
+        os.makedirs(self.directory, exist_ok=True)
+        self.index_path = os.path.join(self.directory, self.index_file_name)
+        self.index = self._load_index()
+
+    def key(self, rgb: np.ndarray, depth: np.ndarray) -> str:
+        rgb = np.ascontiguousarray(np.asarray(rgb)[:: self.downsample, :: self.downsample])
+        depth = np.asarray(depth, dtype=np.float64)[:: self.downsample, :: self.downsample]
+        if self.rgb_bits < 8:
+            rgb = np.right_shift(rgb.astype(np.uint8), 8 - self.rgb_bits)
+        if self.depth_step > 0:
+            depth = np.round(np.nan_to_num(depth) / self.depth_step).astype(np.int32)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str((rgb.shape, depth.shape)).encode())
+        digest.update(rgb.tobytes())
+        digest.update(np.ascontiguousarray(depth).tobytes())
+        return digest.hexdigest()
+
+    def key_from_file(self, capture_path: str) -> str:
+        """Key of a capture saved by ROSController.capture_image_and_save_info"""
+        data = np.load(capture_path, allow_pickle=True).item()
+        return self.key(data["rgb"], data["depth"])
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached result path of key. Hits do not write the index, access times are saved with the next put."""
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        now = time.time()
+        if self.max_age is not None and now - entry["created"] > self.max_age:
+            self.evict()  # drops every expired result with one index write
+            return None
+        result_path = self._result_path(key)
+        if not os.path.exists(result_path):
+            self._remove(key)
+            self._save_index()
+            return None
+        entry["last_access"] = now
+        return result_path
+
+    def put(self, key: str, result_path: str) -> str:
+        cached_path = self._result_path(key)
+        if os.path.abspath(result_path) != os.path.abspath(cached_path):
+            shutil.copyfile(result_path, cached_path + ".tmp")
+            os.replace(cached_path + ".tmp", cached_path)
+        now = time.time()
+        self.index[key] = {"created": now, "last_access": now}
+        self.evict()
+        return cached_path
+
+    def evict(self) -> None:
+        now = time.time()
+        if self.max_age is not None:
+            for key in [k for k, v in self.index.items() if now - v["created"] > self.max_age]:
+                self._remove(key)
+        if len(self.index) > self.max_entries:
+            by_access = sorted(self.index, key=lambda k: self.index[k]["last_access"])
+            for key in by_access[: len(self.index) - self.max_entries]:
+                self._remove(key)
+        self._save_index()
+
+    def clear(self) -> None:
+        for key in list(self.index):
+            self._remove(key)
+        self._save_index()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def _result_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".npz")
+
+    def _remove(self, key: str) -> None:
+        self.index.pop(key, None)
+        if os.path.exists(self._result_path(key)):
+            os.remove(self._result_path(key))
+
+    def _load_index(self) -> Dict[str, Dict[str, float]]:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, "r") as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError):
+            print(f"Grasp cache index {self.index_path} is corrupted, starting empty.")
+            return {}
+
+    def _save_index(self) -> None:
+        with open(self.index_path + ".tmp", "w") as index_file:
+            json.dump(self.index, index_file)
+        os.replace(self.index_path + ".tmp", self.index_path)
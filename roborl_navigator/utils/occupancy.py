@@ -0,0 +1,134 @@
+from typing import (
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .point_cloud import voxel_downsample
+from .workspace import goal_range_bounds
+
+
+class OccupancyMap:
+    """Log-odds voxel occupancy grid over a bounded workspace, fused from successive depth frames.
+
+    Every frame marks the voxels of its points as hits and the voxels its camera rays pass through as misses, so
+    obstacles stay in the map after leaving the camera view and moved obstacles are cleared once seen through.
+    Memory is fixed by the workspace bounds and voxel size. Nearest obstacle queries use a KD-tree of the
+    occupied voxel centers that is only rebuilt after an update changed the occupied set.
+
+    Args:
+        low (np.ndarray): Lower workspace corner in the base frame.
+        high (np.ndarray): Upper workspace corner in the base frame.
+        voxel_size (float): Edge length of a voxel in meters.
+        log_odds_hit (float): Added to a voxel containing a point, 0.85 is a 0.7 hit probability.
+        log_odds_miss (float): Added to a voxel a ray passes through, -0.4 is a 0.4 hit probability.
+        log_odds_limits (Tuple[float, float]): Clamping bounds, keep the map responsive to changes.
+        max_range (float): Points farther from the camera are dropped with their rays, e.g. the background.
+        ray_chunk_size (int): Rays traced at once, bounds the temporary memory of an update.
+    """
+
+    def __init__(
+        self,
+        low: np.ndarray,
+        high: np.ndarray,
+        voxel_size: float = 0.01,
+        log_odds_hit: float = 0.85,
+        log_odds_miss: float = -0.4,
+        log_odds_limits: Tuple[float, float] = (-2.0, 3.5),
+        max_range: float = 1.5,
+        ray_chunk_size: int = 4096,
+    ) -> None:
+        self.low = np.asarray(low, dtype=np.float64)
+        self.voxel_size = voxel_size
+        self.shape = np.ceil((np.asarray(high, dtype=np.float64) - self.low) / voxel_size).astype(int)
+        self.high = self.low + self.shape * voxel_size
+        self.log_odds_hit = log_odds_hit
+        self.log_odds_miss = log_odds_miss
+        self.log_odds_limits = log_odds_limits
+        self.max_range = max_range
+        self.ray_chunk_size = ray_chunk_size
+        self.log_odds = np.zeros(int(np.prod(self.shape)), dtype=np.float32)
+        self._tree = None
+        self._tree_points = np.zeros((0, 3))
+        self._dirty = False
+
+    @classmethod
+    def for_goal_range(cls, goal_range: float, margin: float = 0.25, voxel_size: float = 0.01) -> "OccupancyMap":
+        """Map over the Reach goal box grown by margin, down to below the table surface."""
+        low, high = goal_range_bounds(goal_range)
+        low = low - margin
+        low[2] = -0.05
+        return cls(low, high + margin, voxel_size)
+
+    def reset(self) -> None:
+        """Forgets all observations, e.g. at the start of an episode."""
+        self.log_odds.fill(0.0)
+        self._tree = None
+        self._tree_points = np.zeros((0, 3))
+        self._dirty = False
+
+    def voxel_index(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Flat voxel index of (N, 3) points and a mask of the points inside the map."""
+        cells = np.floor((points - self.low) / self.voxel_size).astype(np.int64)
+        inside = np.all((cells >= 0) & (cells < self.shape), axis=-1)
+        cells = np.where(inside[:, None], cells, 0)
+        return np.ravel_multi_index(cells.T, tuple(self.shape)), inside
+
+    def _ray_voxels(self, origin: np.ndarray, points: np.ndarray) -> np.ndarray:
+        """Flat indices of the map voxels crossed by the rays from origin to points, endpoints excluded."""
+        offsets = points - origin
+        lengths = np.linalg.norm(offsets, axis=-1)
+        n_samples = int(np.ceil(lengths.max() / (0.5 * self.voxel_size))) if len(lengths) else 0
+        if n_samples < 2:
+            return np.zeros(0, dtype=np.int64)
+        # half voxel steps along every ray, the samples within a voxel of the endpoint are left out
+        fractions = np.arange(n_samples) / n_samples
+        samples = origin + offsets[:, None, :] * fractions[None, :, None]
+        keep = fractions[None, :] * lengths[:, None] < lengths[:, None] - self.voxel_size
+        flat_index, inside = self.voxel_index(samples[keep])
+        return np.unique(flat_index[inside])
+
+    def integrate(self, points: np.ndarray, origin: np.ndarray) -> None:
+        """Fuses one frame of (N, 3) base frame points observed from the camera position origin."""
+        origin = np.asarray(origin, dtype=np.float64)
+        points = np.asarray(points, dtype=np.float64)
+        points = points[np.linalg.norm(points - origin, axis=-1) <= self.max_range]
+        points = voxel_downsample(points, self.voxel_size)
+        if len(points) == 0:
+            return
+
+        hit_index, inside = self.voxel_index(points)
+        hit_index = np.unique(hit_index[inside])
+        miss_index = np.concatenate([
+            self._ray_voxels(origin, points[start:start + self.ray_chunk_size])
+            for start in range(0, len(points), self.ray_chunk_size)
+        ])
+        # a voxel is updated once per frame, hits win over rays passing through the same voxel
+        miss_index = np.setdiff1d(miss_index, hit_index, assume_unique=False)
+
+        touched = np.concatenate((hit_index, miss_index))
+        was_occupied = self.log_odds[touched] > 0
+        self.log_odds[hit_index] += self.log_odds_hit
+        self.log_odds[miss_index] += self.log_odds_miss
+        self.log_odds[touched] = np.clip(self.log_odds[touched], *self.log_odds_limits)
+        if np.any(was_occupied != (self.log_odds[touched] > 0)):
+            self._dirty = True
+
+    def occupied_points(self) -> np.ndarray:
+        """(N, 3) centers of the occupied voxels."""
+        cells = np.stack(np.unravel_index(np.flatnonzero(self.log_odds > 0), tuple(self.shape)), axis=-1)
+        return self.low + (cells + 0.5) * self.voxel_size
+
+    def closest_dist(self, position: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Same result as BulletSim.get_closest_dist: (per axis absolute distance, [euclidean distance])."""
+        if self._dirty:
+            self._tree_points = self.occupied_points()
+            self._tree = cKDTree(self._tree_points) if len(self._tree_points) else None
+            self._dirty = False
+        if self._tree is None:
+            return None
+        position = np.asarray(position, dtype=np.float64)
+        distance, index = self._tree.query(position)
+        return np.abs(position - self._tree_points[index]), np.array([distance])
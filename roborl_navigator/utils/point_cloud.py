@@ -0,0 +1,117 @@
+from typing import (
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+
+from .camera import pixel_grid
+
+VOXEL_KEY_BITS = 21  # per axis, keys of +-1M voxels pack into one int64
+
+
+def transform_points(points: np.ndarray, transform: np.ndarray) -> np.ndarray:
+    """Applies a 4x4 homogeneous transform to (N, 3) points."""
+    return np.matmul(points, transform[:3, :3].T) + transform[:3, 3]
+
+
+def voxel_keys(points: np.ndarray, voxel_size: float) -> np.ndarray:
+    """Packs the integer voxel coordinates of (N, 3) points into one int64 key per point."""
+    cells = np.floor(points / voxel_size).astype(np.int64) + (1 << (VOXEL_KEY_BITS - 1))
+    return (cells[:, 0] << (2 * VOXEL_KEY_BITS)) | (cells[:, 1] << VOXEL_KEY_BITS) | cells[:, 2]
+
+
+def voxel_downsample(points: np.ndarray, voxel_size: float) -> np.ndarray:
+    """Replaces the points of every occupied voxel with their centroid."""
+    if len(points) == 0:
+        return points.reshape(0, 3)
+    _, inverse, counts = np.unique(voxel_keys(points, voxel_size), return_inverse=True, return_counts=True)
+    centroids = np.empty((len(counts), 3))
+    for axis in range(3):
+        centroids[:, axis] = np.bincount(inverse, weights=points[:, axis], minlength=len(counts)) / counts
+    return centroids
+
+
+def closest_point(points: np.ndarray, position: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Nearest of (N, 3) points to position and its distance."""
+    squared_distances = np.einsum("ij,ij->i", points - position, points - position)
+    index = int(np.argmin(squared_distances))
+    return points[index], float(np.sqrt(squared_distances[index]))
+
+
+class DepthPointCloud:
+    """Turns metric depth images into a voxel downsampled point cloud in the base frame for distance queries.
+
+    The pixel rays are computed once per resolution and intrinsics, a frame update is a strided back-projection,
+    a transform and a voxel downsample.
+
+    Args:
+        voxel_size (float): Edge length of the downsampling voxels in meters, None keeps every point.
+        stride (int): Pixel stride applied before back-projection.
+        min_depth (float): Closer pixels are dropped, e.g. the gripper fingers in front of a wrist camera.
+        max_depth (float): Farther pixels and invalid (0, NaN) depth readings are dropped.
+        resolution (Tuple[int, int]): (height, width) the image is nearest neighbour resampled to instead of strided.
+        search_step (int): closest_dist only searches the points of every search_step-th pixel, valid or not, in
+            row-major order, like BulletSim.return_closest_dist.
+    """
+
+    def __init__(
+        self,
+        voxel_size: Optional[float] = 0.01,
+        stride: int = 2,
+        min_depth: float = 0.1,
+        max_depth: float = 2.0,
+        resolution: Optional[Tuple[int, int]] = None,
+        search_step: int = 1,
+    ) -> None:
+        self.voxel_size = voxel_size
+        self.stride = stride
+        self.min_depth = min_depth
+        self.max_depth = max_depth
+        self.resolution = resolution
+        self.search_step = search_step
+        self.points = np.zeros((0, 3))
+        self.search_points = self.points
+        self._grid = None
+        self._grid_key = None
+
+    def _pixel_grid(self, shape: Tuple[int, int], intrinsics: np.ndarray) -> Tuple[np.ndarray, ...]:
+        key = (shape, np.asarray(intrinsics, dtype=np.float64).tobytes())
+        if key != self._grid_key:
+            height, width = shape
+            x, y = pixel_grid(height, width, intrinsics)
+            if self.resolution is None:
+                rows, cols = np.arange(0, height, self.stride), np.arange(0, width, self.stride)
+            else:
+                # the pixels BulletSim.get_point_cloud samples, a smaller camera with the same field of view
+                rows = np.arange(self.resolution[0]) * height // self.resolution[0]
+                cols = np.arange(self.resolution[1]) * width // self.resolution[1]
+            indices = (rows[:, None] * width + cols[None, :]).ravel()
+            searched = np.arange(len(indices)) % self.search_step == 0
+            self._grid = (indices, x.ravel()[indices], y.ravel()[indices], searched)
+            self._grid_key = key
+        return self._grid
+
+    def update(self, depth: np.ndarray, intrinsics: np.ndarray, camera_to_base: np.ndarray) -> np.ndarray:
+        """Replaces the cloud with the points of an (H, W) metric depth image, returns the (N, 3) cloud."""
+        indices, x, y, searched = self._pixel_grid(depth.shape[:2], intrinsics)
+        z = np.ravel(depth)[indices]
+        valid = (z > self.min_depth) & (z < self.max_depth)  # NaN compares False
+        z = z[valid]
+        points = transform_points(np.stack((x[valid] * z, y[valid] * z, z), axis=-1), camera_to_base)
+        if self.search_step > 1:
+            self.search_points = points[searched[valid]]
+        if self.voxel_size:
+            points = voxel_downsample(points, self.voxel_size)
+        self.points = points
+        if self.search_step == 1:
+            self.search_points = points
+        return self.points
+
+    def closest_dist(self, position: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Same result as BulletSim.get_closest_dist: (per axis absolute distance, [euclidean distance])."""
+        if len(self.search_points) == 0:
+            return None
+        position = np.asarray(position, dtype=np.float64)
+        point, distance = closest_point(self.search_points, position)
+        return np.abs(position - point), np.array([distance])
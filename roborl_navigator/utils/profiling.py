@@ -0,0 +1,96 @@
+import threading
+import time
+from typing import (
+    Dict,
+    Optional,
+)
+
+import numpy as np
+
+
+class _Phase:
+    """Context manager adding its wall time to one phase of a PhaseTimer.
+
+    Start times are kept on a stack per thread, the phase can be nested in itself and entered by several threads.
+    """
+
+    __slots__ = ("timer", "name", "_local")
+
+    def __init__(self, timer: "PhaseTimer", name: str) -> None:
+        self.timer = timer
+        self.name = name
+        self._local = threading.local()
+
+    def __enter__(self) -> None:
+        start_times = getattr(self._local, "start_times", None)
+        if start_times is None:
+            start_times = self._local.start_times = []
+        start_times.append(time.perf_counter())
+
+    def __exit__(self, *args) -> None:
+        self.timer.record(self.name, time.perf_counter() - self._local.start_times.pop())
+
+
+class _NoPhase:
+    """Context manager of a disabled PhaseTimer, does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *args) -> None:
+        pass
+
+
+NO_PHASE = _NoPhase()
+
+
+class PhaseTimer:
+    """Switchable wall time statistics of named code phases over a rolling window.
+
+    Phases are timed with `with timer.phase("physics"):`. A disabled timer hands out one shared no-op context
+    manager, so instrumented code costs an attribute lookup and a method call per phase.
+
+    Args:
+        enabled (bool): Whether phases are timed.
+        window (int): Number of most recent samples per phase the statistics are computed over.
+    """
+
+    def __init__(self, enabled: bool = False, window: int = 1000) -> None:
+        self.enabled = enabled
+        self.window = window
+        self._phases = {}
+        self._samples = {}
+        self._counts = {}
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return NO_PHASE
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+        return phase
+
+    def record(self, name: str, seconds: float) -> None:
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = np.zeros(self.window)
+            self._counts[name] = 0
+        samples[self._counts[name] % self.window] = seconds
+        self._counts[name] += 1
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self._counts.clear()
+
+    def stats(self, percentiles: Optional[tuple] = (50, 95, 99)) -> Dict[str, Dict[str, float]]:
+        """Mean and percentiles in ms of the last window samples and the total sample count of every phase."""
+        result = {}
+        for name, samples in self._samples.items():
+            count = self._counts[name]
+            window = samples[:min(count, self.window)] * 1000
+            result[name] = {"mean": float(window.mean()), "count": count}
+            for value, percentile in zip(np.percentile(window, percentiles), percentiles):
+                result[name][f"p{percentile}"] = float(value)
+        return result
@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+)
+
+import numpy as np
+
+
+def duration_stats(durations: Sequence[float]) -> Dict[str, Any]:
+    """Min, max, mean and all planning durations of one method in one episode."""
+    return {
+        "min": min(durations),
+        "max": max(durations),
+        "mean": float(np.mean(durations)),
+        "all": list(durations),
+    }
+
+
+def legacy_records(results: Dict[str, Dict[str, Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """Converts the {episode: {method: values}} JSON the evaluation scripts used to rewrite every episode.
+
+    The max of those files was computed with min() and is always 0, it is recomputed from the durations.
+    """
+    for episode, methods in results.items():
+        for method, values in methods.items():
+            record = {"episode": int(episode), "method": method, **values}
+            if values.get("all"):
+                record["max"] = max(values["all"])
+            yield record
+
+
+class ResultsStore:
+    """Append-only JSON Lines file of evaluation results, one record per episode and method.
+
+    Records are buffered with add() and appended by flush() in a single write followed by an fsync, so finished
+    episodes survive a crash and the file is never rewritten. A line torn by a crash during a flush is cut off
+    when the store is opened again, next_episode() then tells where to resume.
+
+    Args:
+        path (str): Path of the .jsonl file, created if missing.
+        resume (bool): Keep the records of an existing file, otherwise it is emptied.
+    """
+
+    def __init__(self, path: str, resume: bool = True) -> None:
+        self.path = path
+        self._pending = []
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if resume and os.path.exists(path):
+            self._repair()
+        else:
+            open(path, "wb").close()
+
+    def _repair(self) -> None:
+        with open(self.path, "rb+") as results_file:
+            data = results_file.read()
+            end = data.rfind(b"\n") + 1
+            if end != len(data):
+                print(f"Dropping an incomplete record at the end of {self.path}")
+                results_file.truncate(end)
+
+    def add(self, episode: int, method: str, **values: Any) -> None:
+        self._pending.append({"episode": episode, "method": method, **values})
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        self._pending.extend(records)
+
+    def flush(self) -> int:
+        """Appends the pending records, returns their number."""
+        if not self._pending:
+            return 0
+        data = "".join(json.dumps(record, default=_to_json) + "\n" for record in self._pending).encode()
+        file_descriptor = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(file_descriptor, data)
+            os.fsync(file_descriptor)
+        finally:
+            os.close(file_descriptor)
+        count = len(self._pending)
+        self._pending = []
+        return count
+
+    def records(self, method: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        return read_results(self.path, method)
+
+    def next_episode(self) -> int:
+        """Episode to resume from, one after the last flushed episode."""
+        return max((record["episode"] + 1 for record in self.records()), default=0)
+
+    def to_arrays(self, method: str, fields: Iterable[str]) -> Dict[str, np.ndarray]:
+        return results_to_arrays(self.records(method), fields)
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def read_results(path: str, method: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Streams the records of a .jsonl results store, or of a legacy .json results file, optionally of one method."""
+    if path.endswith(".json"):
+        with open(path, "r") as json_file:
+            records = legacy_records(json.load(json_file))
+            yield from (record for record in records if method is None or record["method"] == method)
+        return
+    with open(path, "r") as results_file:
+        for line in results_file:
+            if not line.endswith("\n"):
+                break  # torn by a crash during a flush
+            record = json.loads(line)
+            if method is None or record["method"] == method:
+                yield record
+
+
+def results_to_arrays(records: Iterable[Dict[str, Any]], fields: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Columns of the given scalar fields, records without a field get NaN."""
+    fields = list(fields)
+    columns = {field: [] for field in ["episode", *fields]}
+    for record in records:
+        for field, column in columns.items():
+            column.append(record.get(field, np.nan))
+    return {field: np.asarray(column) for field, column in columns.items()}
+
+
+def results_to_dataframe(path: str, method: Optional[str] = None) -> Any:
+    """Records as a pandas DataFrame, one row per episode and method."""
+    import pandas as pd
+    return pd.DataFrame.from_records(list(read_results(path, method)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Convert a legacy evaluation results JSON file to a results store.")
+    parser.add_argument("input", help="Legacy {episode: {method: values}} .json file")
+    parser.add_argument("output", help="Output .jsonl results store")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.output, resume=False)
+    store.extend(read_results(args.input))
+    print(f"Wrote {store.flush()} records to {args.output}")
@@ -0,0 +1,91 @@
+import numpy as np
+import unittest
+
+from roborl_navigator.utils.camera import (
+    backproject_depth,
+    crop_capture,
+    project_points,
+    workspace_roi,
+)
+from roborl_navigator.utils.grasp import (
+    load_grasp_predictions,
+    select_grasp_candidates,
+)
+from roborl_navigator.utils.path_helper import get_assets_path
+
+
+class TestCaptureCropping(unittest.TestCase):
+
+    def setUp(self):
+        # RealSense D435 like intrinsics for the stored 1280x720 captures
+        self.intrinsics = np.array([
+            [912.0, 0.0, 640.0],
+            [0.0, 912.0, 360.0],
+            [0.0, 0.0, 1.0],
+        ])
+        rgb = np.load(get_assets_path(["assets", "image_captures", "rgb.npy"]))
+        height, width = rgb.shape[:2]
+        v, u = np.mgrid[0:height, 0:width]
+        self.data = {
+            "rgb": rgb,
+            "depth": 0.6 + 0.0002 * u + 0.0001 * v,
+            "label": np.zeros((height, width), dtype=np.uint8),
+            "K": self.intrinsics,
+        }
+
+    def test_cropped_point_cloud_matches_full_frame(self):
+        roi = (300, 200, 901, 561)
+        full_points = backproject_depth(self.data["depth"], self.intrinsics)
+        for downsample in [1, 2, 3]:
+            cropped = crop_capture(self.data, roi, downsample)
+            self.assertEqual(cropped["depth"].shape, cropped["rgb"].shape[:2])
+            cropped_points = backproject_depth(cropped["depth"], cropped["K"])
+            expected = full_points[roi[1]:roi[3]:downsample, roi[0]:roi[2]:downsample]
+            np.testing.assert_allclose(cropped_points, expected, atol=1e-6)
+
+    @staticmethod
+    def detect(capture, pixels, grasps, contact_points):
+        """Stand-in for the GraspNet server, moves the stored grasps onto the capture points at the given pixels."""
+        points = backproject_depth(capture["depth"], capture["K"])[pixels[:, 1], pixels[:, 0]]
+        detections = grasps.copy()
+        detections[:, :3, 3] += points - contact_points
+        return detections
+
+    def test_stored_grasps_are_equivalent_after_cropping(self):
+        # camera 1 m above the table looking down
+        camera_to_world = np.eye(4)
+        camera_to_world[:3, :3] = np.diag([1.0, -1.0, -1.0])
+        camera_to_world[:3, 3] = [0.5, 0.0, 1.0]
+        low, high = np.array([0.0, -0.5, 0.0]), np.array([1.0, 0.5, 0.6])
+
+        for file_name in ["predictions.npz", "predictions_data.npz"]:
+            path = get_assets_path(["assets", "grasping_pose_results", file_name])
+            grasps, scores = load_grasp_predictions(path)
+            contact_points = np.load(path, allow_pickle=True)["contact_pts"].item()[-1].astype(np.float64)
+            roi = workspace_roi(
+                contact_points.min(axis=0), contact_points.max(axis=0), np.eye(4), self.intrinsics, (720, 1280)
+            )
+            self.assertLess((roi[2] - roi[0]) * (roi[3] - roi[1]), 1280 * 720)
+
+            for downsample in [1, 2]:
+                cropped = crop_capture(self.data, roi, downsample)
+                # the server only sees the cropped frame, detections land on its pixels
+                height, width = cropped["depth"].shape
+                pixels = np.rint(project_points(contact_points, cropped["K"])).astype(int)
+                pixels = np.clip(pixels, 0, [width - 1, height - 1])
+                full_pixels = pixels * downsample + roi[:2]
+
+                full_poses, full_scores = select_grasp_candidates(
+                    self.detect(self.data, full_pixels, grasps, contact_points),
+                    scores, camera_to_world, low, high, k=None,
+                )
+                cropped_poses, cropped_scores = select_grasp_candidates(
+                    self.detect(cropped, pixels, grasps, contact_points),
+                    scores, camera_to_world, low, high, k=None,
+                )
+                self.assertGreater(len(full_poses), 0)
+                np.testing.assert_array_equal(cropped_scores, full_scores)
+                np.testing.assert_allclose(cropped_poses, full_poses, atol=1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+import unittest
+
+from roborl_navigator.utils.grasp_cache import GraspResultCache
+from roborl_navigator.utils.path_helper import get_assets_path
+
+
+class TestGraspResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, "cache")
+        self.result_path = get_assets_path(["assets", "grasping_pose_results", "predictions.npz"])
+        rng = np.random.default_rng(0)
+        self.rgb = rng.integers(0, 255, (72, 128, 3), dtype=np.uint8)
+        self.depth = rng.uniform(0.3, 1.0, (72, 128))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_hit_and_persistence(self):
+        cache = GraspResultCache(self.directory)
+        key = cache.key(self.rgb, self.depth)
+        self.assertIsNone(cache.get(key))
+        cache.put(key, self.result_path)
+
+        reloaded = GraspResultCache(self.directory)
+        cached_path = reloaded.get(key)
+        self.assertIsNotNone(cached_path)
+        with open(cached_path, "rb") as cached, open(self.result_path, "rb") as original:
+            self.assertEqual(cached.read(), original.read())
+
+    def test_hits_do_not_write_the_index(self):
+        cache = GraspResultCache(self.directory)
+        key = cache.key(self.rgb, self.depth)
+        cache.put(key, self.result_path)
+        index_stat = os.stat(cache.index_path)
+        for _ in range(10):
+            self.assertIsNotNone(cache.get(key))
+        self.assertIsNone(cache.get("missing"))
+        self.assertEqual(os.stat(cache.index_path), index_stat)
+
+    def test_near_duplicate_matching(self):
+        noisy_depth = self.depth + 1e-4
+        exact = GraspResultCache(self.directory)
+        self.assertNotEqual(exact.key(self.rgb, self.depth), exact.key(self.rgb, noisy_depth))
+        coarse = GraspResultCache(self.directory, downsample=4, depth_step=0.01, rgb_bits=4)
+        depth = np.round(self.depth, 2)
+        self.assertEqual(coarse.key(self.rgb, depth), coarse.key(self.rgb, depth + 1e-4))
+
+    def test_eviction(self):
+        cache = GraspResultCache(self.directory, max_entries=2)
+        keys = [cache.key(self.rgb, self.depth + i) for i in range(3)]
+        for key in keys:
+            cache.put(key, self.result_path)
+            time.sleep(0.01)
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn(keys[0], cache)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, keys[0] + ".npz")))
+
+        cache = GraspResultCache(self.directory, max_age=0.0)
+        time.sleep(0.01)
+        self.assertIsNone(cache.get(keys[-1]))
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
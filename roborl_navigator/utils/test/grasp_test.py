@@ -0,0 +1,76 @@
+import math
+
+import numpy as np
+import unittest
+
+from pybullet import getQuaternionFromEuler
+from roborl_navigator.utils.grasp import (
+    filter_reachable_grasps,
+    grasps_to_poses,
+    load_grasp_predictions,
+    poses_to_grasps,
+    select_grasp_candidates,
+    top_k_grasps,
+)
+from roborl_navigator.utils.path_helper import get_assets_path
+from roborl_navigator.utils.workspace import goal_range_bounds
+
+
+class TestGrasp(unittest.TestCase):
+
+    def setUp(self):
+        path = get_assets_path(["assets", "grasping_pose_results", "predictions.npz"])
+        self.grasps, self.scores = load_grasp_predictions(path)
+
+    def test_top_k_sorted(self):
+        grasps, scores = top_k_grasps(self.grasps, self.scores, k=10)
+        self.assertEqual(grasps.shape, (10, 4, 4))
+        np.testing.assert_allclose(scores, np.sort(self.scores)[::-1][:10])
+        np.testing.assert_allclose(grasps[0], self.grasps[self.scores.argmax()])
+
+    def test_poses_match_scalar_conversion(self):
+        pred_grasp = self.grasps[self.scores.argmax()]
+        expected = np.array((
+            pred_grasp[0][3],
+            pred_grasp[1][3],
+            pred_grasp[2][3],
+            math.atan2(pred_grasp[2][1], pred_grasp[2][2]),
+            math.asin(-pred_grasp[2][0]),
+            math.atan2(pred_grasp[1][0], pred_grasp[0][0]),
+        ))
+        poses = grasps_to_poses(self.grasps)
+        np.testing.assert_allclose(poses[self.scores.argmax()], expected, atol=1e-9)
+
+        poses = grasps_to_poses(self.grasps, quaternion=True)
+        pb_quaternion = getQuaternionFromEuler(expected[3:])
+        np.testing.assert_allclose(poses[self.scores.argmax()][3:], pb_quaternion, atol=1e-3)
+
+    def test_pose_round_trip(self):
+        poses = grasps_to_poses(self.grasps, quaternion=True)
+        np.testing.assert_allclose(grasps_to_poses(poses_to_grasps(poses), quaternion=True), poses, atol=1e-6)
+        euler_poses = grasps_to_poses(self.grasps)
+        np.testing.assert_allclose(poses_to_grasps(euler_poses), poses_to_grasps(poses), atol=1e-6)
+
+    def test_reachability_filter(self):
+        low, high = goal_range_bounds(0.2)
+        poses = np.array([
+            [0.5, 0.0, 0.08, 0.0, 0.0, 0.0, 1.0],
+            [0.5, 0.0, -0.1, 0.0, 0.0, 0.0, 1.0],
+            [1.5, 0.0, 0.08, 0.0, 0.0, 0.0, 1.0],
+        ])
+        np.testing.assert_array_equal(filter_reachable_grasps(poses, low, high), [True, False, False])
+
+    def test_select_candidates(self):
+        # place the camera frame grasps on top of the goal range
+        transform = np.eye(4)
+        transform[:3, 3] = np.array([0.5, 0.0, 0.1]) - self.grasps[:, :3, 3].mean(axis=0)
+        low, high = goal_range_bounds(0.3)
+        poses, scores = select_grasp_candidates(self.grasps, self.scores, transform, low, high, k=20)
+        self.assertGreater(len(poses), 0)
+        self.assertEqual(poses.shape[1], 7)
+        self.assertTrue(np.all(np.diff(scores) <= 0))
+        self.assertTrue(np.all(filter_reachable_grasps(poses, low, high)))
+
+
+if __name__ == '__main__':
+    unittest.main()
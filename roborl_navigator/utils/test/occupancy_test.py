@@ -0,0 +1,54 @@
+import numpy as np
+import unittest
+
+from roborl_navigator.utils.occupancy import OccupancyMap
+
+
+def wall(x: float, y_range=(-0.1, 0.1), z_range=(0.0, 0.2), step=0.005) -> np.ndarray:
+    y, z = np.meshgrid(np.arange(*y_range, step), np.arange(*z_range, step))
+    return np.stack((np.full(y.size, x), y.ravel(), z.ravel()), axis=-1)
+
+
+class TestOccupancyMap(unittest.TestCase):
+
+    def setUp(self):
+        self.map = OccupancyMap(np.array([0.0, -0.5, -0.05]), np.array([1.0, 0.5, 0.5]), voxel_size=0.01)
+        self.origin = np.array([0.0, 0.0, 0.1])
+
+    def test_hits_and_free_space(self):
+        self.map.integrate(wall(0.5), self.origin)
+        _, distance = self.map.closest_dist(np.array([0.4, 0.0, 0.1]))
+        self.assertAlmostEqual(distance[0], 0.1, delta=0.01)
+        # voxels between the camera and the wall were seen free
+        index, _ = self.map.voxel_index(np.array([[0.3, 0.0, 0.1]]))
+        self.assertLess(self.map.log_odds[index[0]], 0)
+
+    def test_obstacles_persist_out_of_view(self):
+        self.map.integrate(wall(0.5), self.origin)
+        # a frame looking elsewhere leaves the wall in the map
+        self.map.integrate(wall(0.5, y_range=(0.3, 0.45)), self.origin)
+        _, distance = self.map.closest_dist(np.array([0.4, 0.0, 0.1]))
+        self.assertAlmostEqual(distance[0], 0.1, delta=0.01)
+
+    def test_moved_obstacle_is_cleared(self):
+        self.map.integrate(wall(0.5), self.origin)
+        for _ in range(5):
+            # the obstacle moved away, rays now pass through its old voxels to a wall behind
+            self.map.integrate(wall(0.8, y_range=(-0.25, 0.25), z_range=(-0.1, 0.4)), self.origin)
+        _, distance = self.map.closest_dist(np.array([0.4, 0.0, 0.1]))
+        self.assertAlmostEqual(distance[0], 0.4, delta=0.01)
+
+    def test_reset(self):
+        self.map.integrate(wall(0.5), self.origin)
+        self.map.reset()
+        self.assertIsNone(self.map.closest_dist(np.array([0.4, 0.0, 0.1])))
+        self.assertEqual(len(self.map.occupied_points()), 0)
+
+    def test_points_outside_the_map_only_clear(self):
+        self.map.integrate(wall(1.5), self.origin)
+        self.assertEqual(len(self.map.occupied_points()), 0)
+        self.assertTrue(np.any(self.map.log_odds < 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import numpy as np
+import unittest
+
+from roborl_navigator.utils.camera import pixel_grid
+from roborl_navigator.utils.point_cloud import (
+    DepthPointCloud,
+    closest_point,
+    transform_points,
+    voxel_downsample,
+)
+
+
+class TestPointCloud(unittest.TestCase):
+
+    def setUp(self):
+        self.intrinsics = np.array([
+            [300.0, 0.0, 160.0],
+            [0.0, 300.0, 120.0],
+            [0.0, 0.0, 1.0],
+        ])
+        # camera 0.6 m above the table looking down, optical z along world -z
+        self.camera_to_base = np.eye(4)
+        self.camera_to_base[:3, :3] = np.diag([1.0, -1.0, -1.0])
+        self.camera_to_base[:3, 3] = [0.5, 0.0, 0.6]
+
+    def test_voxel_downsample(self):
+        points = np.random.default_rng(0).uniform(-0.5, 0.5, (10_000, 3))
+        downsampled = voxel_downsample(points, 0.1)
+        self.assertLessEqual(len(downsampled), 1000)
+        # centroids stay inside their voxel and every voxel is kept once
+        cells = np.floor(downsampled / 0.1)
+        self.assertEqual(len(np.unique(cells, axis=0)), len(downsampled))
+        self.assertEqual(len(np.unique(np.floor(points / 0.1), axis=0)), len(downsampled))
+        np.testing.assert_allclose(voxel_downsample(points[:1], 0.1), points[:1])
+
+    def test_table_distance(self):
+        depth = np.full((240, 320), 0.6, dtype=np.float32)
+        depth[:10] = 0.0  # invalid readings
+        depth[10:20] = np.nan
+        cloud = DepthPointCloud(voxel_size=0.01, stride=2)
+        points = cloud.update(depth, self.intrinsics, self.camera_to_base)
+        np.testing.assert_allclose(points[:, 2], 0.0, atol=1e-6)
+        vector, distance = cloud.closest_dist(np.array([0.5, 0.0, 0.2]))
+        np.testing.assert_allclose(distance, [0.2], atol=0.01)
+        self.assertAlmostEqual(vector[2], 0.2, delta=1e-6)
+
+    def test_bullet_sampling(self):
+        intrinsics = np.array([[900.0, 0.0, 640.0], [0.0, 900.0, 360.0], [0.0, 0.0, 1.0]])
+        depth = np.random.default_rng(0).uniform(0.3, 1.0, (720, 1280)).astype(np.float32)
+        depth[::7, ::3] = 0.0
+        cloud = DepthPointCloud(voxel_size=None, resolution=(72, 128), search_step=50)
+        points = cloud.update(depth, intrinsics, self.camera_to_base)
+
+        # every 10th pixel of the 1280x720 frame, then every 50th of those like BulletSim.return_closest_dist
+        x, y = pixel_grid(720, 1280, intrinsics)
+        z, x, y = (array[::10, ::10].ravel()[::50] for array in (depth, x, y))
+        valid = z > 0.0
+        expected = transform_points(np.stack((x * z, y * z, z), axis=-1)[valid], self.camera_to_base)
+        self.assertEqual(len(points), np.count_nonzero(depth[::10, ::10]))
+        np.testing.assert_allclose(cloud.search_points, expected, rtol=1e-6)
+
+        position = np.array([0.5, 0.1, 0.3])
+        distance = np.min(np.linalg.norm(expected - position, axis=-1))
+        self.assertAlmostEqual(cloud.closest_dist(position)[1][0], distance, places=6)
+
+    def test_closest_point(self):
+        points = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 2.0, 0.0]])
+        point, distance = closest_point(points, np.array([0.9, 0.1, 0.0]))
+        np.testing.assert_array_equal(point, [1.0, 0.0, 0.0])
+        self.assertAlmostEqual(distance, np.sqrt(0.02))
+        self.assertIsNone(DepthPointCloud().closest_dist(np.zeros(3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import threading
+import time
+
+import numpy as np
+import unittest
+
+from roborl_navigator.utils import PhaseTimer
+
+
+class TestPhaseTimer(unittest.TestCase):
+
+    def test_disabled_timer_records_nothing(self):
+        timer = PhaseTimer()
+        with timer.phase("physics"):
+            pass
+        self.assertEqual(timer.stats(), {})
+
+    def test_stats(self):
+        timer = PhaseTimer(enabled=True)
+        for _ in range(3):
+            with timer.phase("sleep"):
+                time.sleep(0.002)
+        stats = timer.stats()["sleep"]
+        self.assertEqual(stats["count"], 3)
+        self.assertGreaterEqual(stats["mean"], 2.0)
+        self.assertLessEqual(stats["p50"], stats["p99"])
+
+    def test_nested_phase(self):
+        timer = PhaseTimer(enabled=True)
+        with timer.phase("step"):
+            time.sleep(0.01)
+            with timer.phase("step"):
+                pass
+        stats = timer.stats(percentiles=(0, 100))["step"]
+        self.assertEqual(stats["count"], 2)
+        self.assertLess(stats["p0"], 5.0)
+        self.assertGreaterEqual(stats["p100"], 10.0)
+
+    def test_concurrent_phase(self):
+        timer = PhaseTimer(enabled=True)
+        entered = threading.Event()
+
+        def long_request():
+            with timer.phase("request"):
+                entered.set()
+                time.sleep(0.02)
+
+        def short_request():
+            entered.wait()
+            time.sleep(0.01)
+            with timer.phase("request"):
+                pass
+
+        threads = [threading.Thread(target=long_request), threading.Thread(target=short_request)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # the long request keeps its own start time while the short one runs
+        stats = timer.stats(percentiles=(0, 100))["request"]
+        self.assertEqual(stats["count"], 2)
+        self.assertLess(stats["p0"], 5.0)
+        self.assertGreaterEqual(stats["p100"], 20.0)
+
+    def test_rolling_window(self):
+        timer = PhaseTimer(enabled=True, window=4)
+        for seconds in [1.0] * 10 + [0.001] * 4:
+            timer.record("phase", seconds)
+        stats = timer.stats()["phase"]
+        self.assertEqual(stats["count"], 14)
+        np.testing.assert_allclose(stats["mean"], 1.0)
+        timer.reset()
+        self.assertEqual(timer.stats(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
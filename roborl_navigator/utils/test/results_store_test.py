@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from roborl_navigator.utils import (
+    ResultsStore,
+    duration_stats,
+    read_results,
+)
+
+
+class TestResultsStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "results.jsonl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_duration_stats_max(self):
+        stats = duration_stats([120, 69, 222])
+        self.assertEqual((stats["min"], stats["max"]), (69, 222))
+        self.assertAlmostEqual(stats["mean"], 137.0)
+
+    def test_flush_appends_records(self):
+        store = ResultsStore(self.path)
+        store.add(0, "rrt", **duration_stats([100, 200]))
+        store.add(0, "rl", total=np.float64(5.0), steps=np.int64(1))
+        self.assertEqual(store.flush(), 2)
+        self.assertEqual(store.flush(), 0)
+        store.add(1, "rrt", **duration_stats([150]))
+        store.flush()
+        with open(self.path, "r") as results_file:
+            self.assertEqual(len(results_file.readlines()), 3)
+        self.assertEqual([record["episode"] for record in store.records("rrt")], [0, 1])
+        self.assertEqual(next(store.records("rl"))["steps"], 1)
+
+    def test_resume(self):
+        store = ResultsStore(self.path)
+        self.assertEqual(store.next_episode(), 0)
+        for episode in range(3):
+            store.add(episode, "rl", total=1.0)
+            store.flush()
+        store.add(3, "rl", total=1.0)  # never flushed
+        self.assertEqual(ResultsStore(self.path).next_episode(), 3)
+        self.assertEqual(ResultsStore(self.path, resume=False).next_episode(), 0)
+
+    def test_torn_record_is_dropped(self):
+        store = ResultsStore(self.path)
+        store.add(0, "rl", total=1.0)
+        store.flush()
+        with open(self.path, "a") as results_file:
+            results_file.write('{"episode": 1, "meth')
+        self.assertEqual(len(list(read_results(self.path))), 1)
+        store = ResultsStore(self.path)
+        self.assertEqual(store.next_episode(), 1)
+        store.add(1, "rl", total=2.0)
+        store.flush()
+        self.assertEqual([record["total"] for record in store.records()], [1.0, 2.0])
+
+    def test_to_arrays(self):
+        store = ResultsStore(self.path)
+        store.add(0, "rl", total=4.0, steps=1)
+        store.add(1, "rl")
+        store.flush()
+        columns = store.to_arrays("rl", ["total"])
+        np.testing.assert_array_equal(columns["episode"], [0, 1])
+        self.assertEqual(columns["total"][0], 4.0)
+        self.assertTrue(np.isnan(columns["total"][1]))
+
+    def test_legacy_json(self):
+        legacy_path = os.path.join(self.directory.name, "results.json")
+        legacy = {"0": {"rl": {"total": 5.0}, "rrt": {"min": 69, "max": 0, "mean": 100.0, "all": [69, 131]}}}
+        with open(legacy_path, "w") as json_file:
+            json.dump(legacy, json_file)
+        records = list(read_results(legacy_path))
+        self.assertEqual([(record["episode"], record["method"]) for record in records], [(0, "rl"), (0, "rrt")])
+        self.assertEqual(records[1]["max"], 131)
+
+
+if __name__ == '__main__':
+    unittest.main()
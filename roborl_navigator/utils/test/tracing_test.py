@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from roborl_navigator.utils import (
+    Tracer,
+    traced,
+    tracer,
+)
+
+
+class TestTracer(unittest.TestCase):
+
+    def test_nested_spans(self):
+        trace = Tracer(enabled=True)
+        with trace.span("outer", "test", step=1):
+            with trace.span("inner", "test"):
+                pass
+        inner, outer = trace.events
+        self.assertEqual((outer["name"], inner["name"]), ("outer", "inner"))
+        self.assertEqual(outer["ph"], "X")
+        self.assertEqual(outer["args"], {"step": 1})
+        self.assertLessEqual(outer["ts"], inner["ts"])
+        self.assertGreaterEqual(outer["ts"] + outer["dur"], inner["ts"] + inner["dur"])
+
+    def test_spans_keep_thread_ids(self):
+        trace = Tracer(enabled=True)
+
+        def work():
+            with trace.span("worker"):
+                pass
+
+        thread = threading.Thread(target=work, name="worker_thread")
+        thread.start()
+        thread.join()
+        with trace.span("main"):
+            pass
+        events = trace.trace_events()
+        spans = {event["name"]: event for event in events if event["ph"] == "X"}
+        self.assertNotEqual(spans["worker"]["tid"], spans["main"]["tid"])
+        thread_names = {event["tid"]: event["args"]["name"] for event in events if event["ph"] == "M"}
+        self.assertEqual(thread_names[spans["worker"]["tid"]], "worker_thread")
+
+    def test_disabled_tracer_records_nothing(self):
+        trace = Tracer()
+        with trace.span("ignored"):
+            pass
+        trace.instant("ignored")
+        self.assertEqual(trace.trace_events(), [])
+
+    def test_traced_decorator(self):
+        @traced(category="test")
+        def add(a, b):
+            return a + b
+
+        tracer.clear()
+        tracer.enable()
+        try:
+            self.assertEqual(add(1, 2), 3)
+        finally:
+            tracer.disable()
+        self.assertEqual(add(1, 2), 3)
+        self.assertEqual([event["cat"] for event in tracer.events], ["test"])
+        self.assertTrue(tracer.events[0]["name"].endswith("add"))
+        tracer.clear()
+
+    def test_save(self):
+        trace = Tracer(enabled=True)
+        with trace.span("step"):
+            pass
+        with tempfile.TemporaryDirectory() as directory:
+            path = trace.save(os.path.join(directory, "trace.json"))
+            with open(path, "r") as trace_file:
+                data = json.load(trace_file)
+        self.assertEqual(data["displayTimeUnit"], "ms")
+        self.assertEqual([event["ph"] for event in data["traceEvents"]], ["M", "X"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import numpy as np
+import unittest
+
+from roborl_navigator.utils.trajectory import (
+    PANDA_MAX_JOINT_ACCELERATION,
+    PANDA_MAX_JOINT_VELOCITY,
+    interpolate_waypoints,
+    time_parameterize,
+)
+
+
+class TestTimeParameterization(unittest.TestCase):
+
+    def test_limits_respected(self):
+        rng = np.random.default_rng(0)
+        waypoints = np.cumsum(rng.uniform(-0.05, 0.05, (51, 7)), axis=0)
+        times, velocities = time_parameterize(waypoints, velocity_scaling=0.5, acceleration_scaling=0.5)
+
+        self.assertEqual(times.shape, (51,))
+        self.assertEqual(velocities.shape, (51, 7))
+        self.assertEqual(times[0], 0.0)
+        self.assertTrue(np.all(np.diff(times) > 0))
+        np.testing.assert_array_equal(velocities[0], 0.0)
+        np.testing.assert_array_equal(velocities[-1], 0.0)
+
+        segment_velocity = np.abs(np.diff(waypoints, axis=0)) / np.diff(times)[:, None]
+        self.assertTrue(np.all(segment_velocity <= PANDA_MAX_JOINT_VELOCITY * 0.5 + 1e-9))
+        self.assertTrue(np.all(np.abs(velocities) <= PANDA_MAX_JOINT_VELOCITY * 0.5 + 1e-9))
+
+    def test_short_moves_are_acceleration_bound(self):
+        waypoints = np.zeros((2, 7))
+        waypoints[1, 1] = 0.01
+        times, _ = time_parameterize(waypoints, 1.0, 1.0)
+        self.assertAlmostEqual(times[-1], 2.0 * np.sqrt(0.01 / PANDA_MAX_JOINT_ACCELERATION[1]))
+
+    def test_interpolate_waypoints(self):
+        waypoints = np.zeros((3, 7))
+        waypoints[1, 0] = 0.1
+        waypoints[2, 0] = 0.105
+        states = interpolate_waypoints(waypoints, max_step=0.01)
+        self.assertEqual(len(states), 10 + 1 + 1)
+        np.testing.assert_allclose(states[:11, 0], np.linspace(0.0, 0.1, 11))
+        np.testing.assert_array_equal(states[-1], waypoints[-1])
+        self.assertTrue(np.all(np.abs(np.diff(states, axis=0)) <= 0.01 + 1e-12))
+        np.testing.assert_array_equal(interpolate_waypoints(waypoints[:1]), waypoints[:1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
+
+
+class Tracer:
+    """Records nested, per-thread timing spans and writes them as Chrome / Perfetto trace JSON.
+
+    Spans are "complete" events of the Trace Event Format: the viewer nests spans of a thread by their start and
+    duration and shows every thread on its own track, so concurrent work (e.g. a planner portfolio) is visible.
+    Open the file in chrome://tracing or https://ui.perfetto.dev. Recording is off until enable() is called.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.events = []
+        self._thread_names = {}
+        self._lock = threading.Lock()
+        self._start_time = time.perf_counter()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self.events = []
+            self._thread_names = {}
+        self._start_time = time.perf_counter()
+
+    def _timestamp(self) -> float:
+        return (time.perf_counter() - self._start_time) * 1e6  # trace timestamps are in microseconds
+
+    def _add(self, event: Dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        event["pid"] = os.getpid()
+        event["tid"] = thread.ident
+        with self._lock:
+            if thread.ident not in self._thread_names:
+                self._thread_names[thread.ident] = thread.name
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name: str, category: str = "", **args: Any) -> Iterator[None]:
+        """Records the wall time of the with block, args are shown with the span in the viewer."""
+        if not self.enabled:
+            yield
+            return
+        start = self._timestamp()
+        try:
+            yield
+        finally:
+            event = {"name": name, "cat": category, "ph": "X", "ts": start, "dur": self._timestamp() - start}
+            if args:
+                event["args"] = args
+            self._add(event)
+
+    def instant(self, name: str, category: str = "", **args: Any) -> None:
+        """Records a point in time, e.g. a state change."""
+        if self.enabled:
+            self._add({"name": name, "cat": category, "ph": "i", "s": "t", "ts": self._timestamp(), "args": args})
+
+    def trace_events(self) -> List[Dict[str, Any]]:
+        """Recorded events preceded by the thread name metadata events."""
+        with self._lock:
+            events = list(self.events)
+            thread_names = dict(self._thread_names)
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+            for tid, name in thread_names.items()
+        ]
+        return metadata + events
+
+    def save(self, path: str) -> str:
+        with open(path, "w") as trace_file:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, trace_file)
+        print(f"Trace saved: {path} ({len(self.events)} spans)")
+        return path
+
+
+tracer = Tracer()  # process wide tracer used by the ROS controller, robot and production runners
+
+
+def traced(name: Optional[str] = None, category: str = "") -> Callable:
+    """Decorator recording every call of a function as a span of the process wide tracer."""
+    def decorator(function: Callable) -> Callable:
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not tracer.enabled:
+                return function(*args, **kwargs)
+            with tracer.span(span_name, category):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,55 @@
+from typing import (
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+
+# Franka Emika Panda joint velocity (rad/s) and acceleration (rad/s^2) limits
+PANDA_MAX_JOINT_VELOCITY = np.array([2.175, 2.175, 2.175, 2.175, 2.61, 2.61, 2.61])
+PANDA_MAX_JOINT_ACCELERATION = np.array([15.0, 7.5, 10.0, 12.5, 15.0, 20.0, 20.0])
+
+
+def time_parameterize(
+    waypoints: np.ndarray,
+    velocity_scaling: float = 0.3,
+    acceleration_scaling: float = 0.3,
+    max_velocity: Optional[np.ndarray] = None,
+    max_acceleration: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Times (T, 7) joint waypoints so every segment respects scaled velocity and acceleration limits.
+
+    Each segment gets the duration of its slowest joint, assuming it accelerates from rest when the move is
+    too short to reach the velocity limit. Velocities are finite differences, zero at both ends.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (T,) time from start in seconds and (T, 7) joint velocities.
+    """
+    waypoints = np.asarray(waypoints, dtype=np.float64)
+    max_velocity = (PANDA_MAX_JOINT_VELOCITY if max_velocity is None else max_velocity) * velocity_scaling
+    max_acceleration = (
+        PANDA_MAX_JOINT_ACCELERATION if max_acceleration is None else max_acceleration
+    ) * acceleration_scaling
+
+    delta = np.abs(np.diff(waypoints, axis=0))
+    durations = np.maximum(delta / max_velocity, 2.0 * np.sqrt(delta / max_acceleration)).max(axis=-1)
+    durations = np.maximum(durations, 1e-3)
+    times = np.concatenate(([0.0], np.cumsum(durations)))
+
+    velocities = np.zeros_like(waypoints)
+    if len(waypoints) > 2:
+        velocities[1:-1] = (waypoints[2:] - waypoints[:-2]) / (times[2:] - times[:-2])[:, None]
+        velocities[1:-1] = np.clip(velocities[1:-1], -max_velocity, max_velocity)
+    return times, velocities
+
+
+def interpolate_waypoints(waypoints: np.ndarray, max_step: float = 0.01) -> np.ndarray:
+    """Inserts linearly interpolated states so no joint moves more than max_step (rad) between two rows."""
+    waypoints = np.asarray(waypoints, dtype=np.float64)
+    if len(waypoints) < 2:
+        return waypoints
+    steps = np.maximum(np.ceil(np.abs(np.diff(waypoints, axis=0)).max(axis=-1) / max_step).astype(int), 1)
+    segment = np.repeat(np.arange(len(steps)), steps)
+    fraction = (np.arange(len(segment)) - np.repeat(np.cumsum(steps) - steps, steps)) / np.repeat(steps, steps)
+    states = waypoints[segment] + (waypoints[segment + 1] - waypoints[segment]) * fraction[:, None]
+    return np.concatenate((states, waypoints[-1:]))
@@ -0,0 +1,46 @@
+from typing import (
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+
+# Panda shoulder (joint 2) height and maximum reach measured from it
+PANDA_SHOULDER_POSITION = np.array([0.0, 0.0, 0.333])
+PANDA_MAX_REACH = 0.855
+
+
+def goal_range_bounds(goal_range: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the (low, high) corners of the goal box used by the Reach task."""
+    low = np.array([0.5 - (goal_range / 2), -goal_range / 2, 0.05])
+    high = np.array([0.5 + (goal_range / 2), goal_range / 2, goal_range / 2])
+    return low, high
+
+
+def obstacle_range_bounds(obstacle_range: float, height: float = 0.05) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the (low, high) corners of the table area the Reach task places obstacles in, both at height."""
+    low = np.array([0.5 - (obstacle_range / 2), -obstacle_range / 2, height])
+    high = np.array([0.5 + (obstacle_range / 2), obstacle_range / 2, height])
+    return low, high
+
+
+def in_reachable_workspace(
+    positions: np.ndarray,
+    max_reach: float = PANDA_MAX_REACH,
+    min_height: float = 0.0,
+) -> np.ndarray:
+    """Checks (N, 3) positions against the Panda reach sphere and the table surface. This function is vectorized."""
+    positions = np.atleast_2d(positions)
+    reach = np.linalg.norm(positions[:, :3] - PANDA_SHOULDER_POSITION, axis=-1)
+    return (reach <= max_reach) & (positions[:, 2] >= min_height)
+
+
+def in_goal_range(
+    positions: np.ndarray,
+    low: np.ndarray,
+    high: np.ndarray,
+    margin: Optional[float] = 0.0,
+) -> np.ndarray:
+    """Checks (N, 3) positions against an axis aligned box grown by margin. This function is vectorized."""
+    positions = np.atleast_2d(positions)
+    return np.all((positions[:, :3] >= low - margin) & (positions[:, :3] <= high + margin), axis=-1)
@@ -0,0 +1,40 @@
+import timeit
+
+import numpy as np
+
+from roborl_navigator.utils import (
+    grasps_to_poses,
+    poses_to_grasps,
+    transform_grasps,
+)
+
+"""
+BENCHMARK Camera to World Transform of Grasp Candidates
+
+Compares transforming candidates one by one (the former transform_camera_to_world path, without the tf
+round-trip) against a single matrix multiply with the cached camera to world transform.
+"""
+
+repeat = 200
+camera_to_world = np.eye(4)
+camera_to_world[:3, :3] = np.array([[0.0, -1.0, 0.0], [-1.0, 0.0, 0.0], [0.0, 0.0, -1.0]])
+camera_to_world[:3, 3] = np.array([0.5, 0.0, 0.6])
+
+
+def per_pose(cv_poses):
+    results = []
+    for pose in cv_poses:
+        results.append(grasps_to_poses(transform_grasps(poses_to_grasps(pose), camera_to_world), True)[0])
+    return np.array(results)
+
+
+def batched(cv_poses):
+    return grasps_to_poses(transform_grasps(poses_to_grasps(cv_poses), camera_to_world), True)
+
+
+for n in [1, 10, 100]:
+    cv_poses = np.concatenate((np.random.uniform(-0.3, 0.3, (n, 3)), np.random.uniform(-np.pi, np.pi, (n, 3))), axis=-1)
+    np.testing.assert_allclose(per_pose(cv_poses), batched(cv_poses), atol=1e-9)
+    per_pose_time = min(timeit.repeat(lambda: per_pose(cv_poses), number=repeat, repeat=5)) / repeat * 1e6
+    batched_time = min(timeit.repeat(lambda: batched(cv_poses), number=repeat, repeat=5)) / repeat * 1e6
+    print(f"{n:>4} candidates | per pose: {per_pose_time:9.1f} us | batched: {batched_time:7.1f} us")
@@ -0,0 +1,163 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+
+from roborl_navigator.environment.env_panda_bullet import PandaBulletEnv
+from roborl_navigator.utils import (
+    PandaConverter,
+    distance,
+)
+
+"""
+BENCHMARK Simulation, Perception, Reward and Conversion Hot Paths
+
+Times PandaBulletEnv construction, reset and step, the BulletSim camera, point cloud and closest point search,
+Reach.compute_reward at HER batch sizes, PandaConverter and distance. Warm-up calls are excluded, every
+benchmark reports per call statistics over its repeats in microseconds.
+
+    PYTHONPATH=. python -m test.benchmark.hot_paths_benchmark --output baseline.json
+    PYTHONPATH=. python -m test.benchmark.hot_paths_benchmark --baseline baseline.json --output current.json
+"""
+
+Benchmark = Tuple[Callable[[], Any], int, int]  # function, calls per repeat, repeats
+
+
+def measure(function: Callable[[], Any], number: int, repeat: int, warmup: int = 3) -> Dict[str, float]:
+    for _ in range(warmup):
+        function()
+    durations = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for _ in range(number):
+            function()
+        durations.append((time.perf_counter() - start_time) / number * 1e6)
+    return {
+        "median_us": statistics.median(durations),
+        "min_us": min(durations),
+        "mean_us": statistics.mean(durations),
+        "stdev_us": statistics.stdev(durations) if len(durations) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def create_benchmarks(env: PandaBulletEnv) -> Dict[str, Benchmark]:
+    rng = np.random.default_rng(0)
+    sim, task = env.sim, env.task
+    env.reset(seed=0)
+    action = np.full(7, 0.1, dtype=np.float32)
+    image, view_matrix, projection_matrix, _ = sim.take_image()
+    points = sim.get_point_cloud(view_matrix, projection_matrix, image)
+    ee_position = env.robot.get_ee_position()
+
+    converter = PandaConverter()
+    limits = np.array(converter.real_panda_limits)
+    joint_values = rng.uniform(limits[:, 0], limits[:, 1], (2048, 7))
+
+    def env_construction():
+        PandaBulletEnv(render_mode="rgb_array").close()
+
+    benchmarks = {
+        "env/construction": (env_construction, 1, 3),
+        "env/reset": (lambda: env.reset(), 10, 5),
+        "env/step": (lambda: env.step(action), 20, 5),
+        "sim/take_image": (sim.take_image, 20, 5),
+        "sim/get_point_cloud": (lambda: sim.get_point_cloud(view_matrix, projection_matrix, image), 50, 5),
+        "sim/return_closest_dist": (lambda: sim.return_closest_dist(ee_position, points), 50, 5),
+        "converter/real_to_bullet_1": (lambda: converter.real_to_bullet(joint_values[0]), 2000, 5),
+        "converter/real_to_bullet_2048": (lambda: converter.real_to_bullet(joint_values), 200, 5),
+        "converter/bullet_to_real_2048": (lambda: converter.bullet_to_real(joint_values), 200, 5),
+    }
+    for batch_size in [1, 256, 2048]:
+        achieved = rng.uniform(-1, 1, (batch_size, 3)).astype(np.float32)
+        desired = rng.uniform(-1, 1, (batch_size, 3)).astype(np.float32)
+        # HER relabels with the default obstacle distance, as the replay buffer keeps no per step distance
+        infos = [{}] * batch_size
+        benchmarks[f"reach/compute_reward_{batch_size}"] = (
+            lambda a=achieved, d=desired, i=infos: task.compute_reward(a, d, i), 200, 5
+        )
+        benchmarks[f"distance/position_{batch_size}"] = (lambda a=achieved, d=desired: distance(a, d), 1000, 5)
+    achieved = rng.uniform(-1, 1, (256, 5))
+    desired = rng.uniform(-1, 1, (256, 5))
+    benchmarks["distance/orientation_256"] = (lambda: distance(achieved, desired, True), 20, 5)
+    return benchmarks
+
+
+def run(name_filter: Optional[str] = None, repeat_scale: float = 1.0) -> Dict[str, Dict[str, float]]:
+    env = PandaBulletEnv(render_mode="rgb_array")
+    try:
+        results = {}
+        for name, (function, number, repeat) in create_benchmarks(env).items():
+            if name_filter and name_filter not in name:
+                continue
+            results[name] = measure(function, number, max(int(repeat * repeat_scale), 1))
+            print(f"{name:<34} {results[name]['median_us']:>14,.1f} us  (min {results[name]['min_us']:,.1f})")
+    finally:
+        env.close()
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float
+) -> List[str]:
+    """Prints the median ratio to the baseline of every benchmark, returns the names slower than 1 + threshold."""
+    regressions = []
+    print(f"\n{'benchmark':<34} {'baseline us':>14} {'current us':>14} {'ratio':>7}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<34} {'-':>14} {result['median_us']:>14,.1f}")
+            continue
+        ratio = result["median_us"] / baseline[name]["median_us"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  SLOWER"
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{name:<34} {baseline[name]['median_us']:>14,.1f} {result['median_us']:>14,.1f} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the simulation, perception, reward and conversion paths.")
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against the JSON results of an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative median change reported as changed")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--repeat-scale", type=float, default=1.0, help="Multiplies the number of repeats")
+    args = parser.parse_args()
+
+    benchmark_results = run(args.filter, args.repeat_scale)
+    if args.output:
+        with open(args.output, "w") as json_file:
+            json.dump({
+                "meta": {
+                    "created": datetime.now().isoformat(timespec="seconds"),
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "platform": platform.platform(),
+                    "processor": platform.processor(),
+                },
+                "benchmarks": benchmark_results,
+            }, json_file, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r") as json_file:
+            baseline_results = json.load(json_file)["benchmarks"]
+        slower = compare(benchmark_results, baseline_results, args.threshold)
+        if slower:
+            print(f"\n{len(slower)} benchmark(s) slower than the baseline: {', '.join(slower)}")
+            sys.exit(1)
@@ -0,0 +1,50 @@
+import time
+
+import numpy as np
+
+from roborl_navigator.robot.joint_streamer import (
+    IntegratingJointController,
+    JointCommandStreamer,
+)
+
+"""
+BENCHMARK Streaming Joint Command Interface
+
+Streams setpoints to the local stand-in controller and measures the achieved control frequency and the
+command-to-motion latency, i.e. the time between set_target and the first measurable joint motion.
+"""
+
+start = np.array([0.0, 0.4, 0.0, -1.78, 0.0, 2.24, 0.77])
+motion_threshold = 1e-4  # rad
+
+for rate in [100.0, 250.0, 500.0, 1000.0]:
+    controller = IntegratingJointController(start, mode="position")
+    latencies = []
+    with JointCommandStreamer(controller, rate=rate) as streamer:
+        for trial in range(20):
+            before = controller.get_joint_angles()
+            target = before + np.random.uniform(-0.05, 0.05, 7)
+            command_time = time.perf_counter()
+            streamer.set_target(target)
+            while np.max(np.abs(controller.get_joint_angles() - before)) < motion_threshold:
+                time.sleep(0.0001)
+            latencies.append((time.perf_counter() - command_time) * 1000)
+            while not streamer.reached():
+                time.sleep(0.001)
+
+        # non-blocking policy loop: observation read + stand-in inference + new target, no waiting on motion
+        policy_steps = 0
+        loop_start = time.perf_counter()
+        while time.perf_counter() - loop_start < 1.0:
+            joint_angles = controller.get_joint_angles()
+            streamer.set_target(joint_angles + np.random.uniform(-1, 1, 7) * 0.05)
+            policy_steps += 1
+        statistics = streamer.statistics()
+
+    latencies = np.array(latencies)
+    print(
+        f"rate {rate:6.0f} Hz | achieved {statistics['frequency']:7.1f} Hz | "
+        f"period p99 {statistics['period_p99'] * 1000:6.2f} ms | "
+        f"command-to-motion p50 {np.percentile(latencies, 50):5.2f} ms p99 {np.percentile(latencies, 99):5.2f} ms | "
+        f"policy loop {policy_steps} steps/s"
+    )
@@ -0,0 +1,94 @@
+import argparse
+import time
+from typing import (
+    Callable,
+    Dict,
+)
+
+import numpy as np
+
+from roborl_navigator.environment.env_panda_bullet import PandaBulletEnv
+from roborl_navigator.policy import (
+    NumpyPolicy,
+    export_sb3_actor,
+    policy_from_state_dict,
+)
+
+"""
+BENCHMARK NumPy TD3 Actor Inference Latency
+
+Per call latency percentiles of NumpyPolicy.predict for single and batched dict observations. With a saved
+model.zip the Stable Baselines3 model.predict of the same model is timed as well and the actions are compared.
+Without a model an actor of the default TD3 architecture (400, 300) with random weights is timed.
+
+    PYTHONPATH=. python -m test.benchmark.numpy_policy_benchmark
+    PYTHONPATH=. python -m test.benchmark.numpy_policy_benchmark --model models/TD3/model.zip
+"""
+
+
+def latency_percentiles(function: Callable[[], object], calls: int, warmup: int = 20) -> Dict[str, float]:
+    for _ in range(warmup):
+        function()
+    durations = np.empty(calls)
+    for i in range(calls):
+        start_time = time.perf_counter()
+        function()
+        durations[i] = time.perf_counter() - start_time
+    p50, p95, p99 = np.percentile(durations * 1e6, (50, 95, 99))
+    return {"p50": p50, "p95": p95, "p99": p99, "mean": durations.mean() * 1e6}
+
+
+def random_policy(env: PandaBulletEnv, seed: int = 0) -> NumpyPolicy:
+    rng = np.random.default_rng(seed)
+    layer_sizes = [sum(int(np.prod(space.shape)) for space in env.observation_space.values()), 400, 300, 7]
+    state_dict = {}
+    for i, (n_in, n_out) in enumerate(zip(layer_sizes[:-1], layer_sizes[1:])):
+        state_dict[f"actor.mu.{2 * i}.weight"] = rng.normal(0, 1 / np.sqrt(n_in), (n_out, n_in))
+        state_dict[f"actor.mu.{2 * i}.bias"] = np.zeros(n_out)
+    return policy_from_state_dict(state_dict, env.observation_space, env.action_space)
+
+
+def print_row(name: str, batch_size: int, stats: Dict[str, float]) -> None:
+    print(
+        f"{name:<10} {batch_size:>6} {stats['p50']:>10.1f} {stats['p95']:>10.1f} {stats['p99']:>10.1f}"
+        f" {stats['p50'] / batch_size:>14.2f}"
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark NumPy TD3 actor inference latency.")
+    parser.add_argument("--model", help="Saved Stable Baselines3 model.zip or exported .npz actor")
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    env = PandaBulletEnv(render_mode="rgb_array", orientation_task=False)
+    sb3_model = None
+    if args.model and args.model.endswith(".zip"):
+        from stable_baselines3 import (
+            HerReplayBuffer,
+            TD3,
+        )
+        policy = export_sb3_actor(args.model)
+        sb3_model = TD3.load(args.model, env=env, replay_buffer_class=HerReplayBuffer, device="cpu")
+    elif args.model:
+        policy = NumpyPolicy.load(args.model)
+    else:
+        policy = random_policy(env)
+
+    rng = np.random.default_rng(0)
+    observations = [env.reset(seed=int(seed))[0] for seed in rng.integers(0, 2 ** 31, 256)]
+    env.close()
+
+    print(f"{'runtime':<10} {'batch':>6} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} {'p50 us / obs':>14}")
+    for batch_size in [1, 16, 64, 256]:
+        if batch_size == 1:
+            batch = observations[0]
+        else:
+            batch = {key: np.stack([o[key] for o in observations[:batch_size]]) for key in observations[0]}
+        calls = max(args.calls // batch_size, 50)
+        print_row("numpy", batch_size, latency_percentiles(lambda: policy.predict(batch), calls))
+        if sb3_model is not None:
+            sb3_predict = lambda: sb3_model.predict(batch, deterministic=True)[0]  # noqa: E731
+            max_difference = np.abs(policy.predict(batch)[0] - sb3_predict()).max()
+            print_row("sb3", batch_size, latency_percentiles(sb3_predict, calls))
+            print(f"{'':<10} max action difference {max_difference:.2e}")
@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+
+from roborl_navigator.robot.bullet_panda_robot import BulletPanda
+from roborl_navigator.robot.panda_kinematics import (
+    ee_poses,
+    jacobian,
+)
+from roborl_navigator.simulation.bullet import BulletSim
+from roborl_navigator.utils import PandaConverter
+
+"""
+BENCHMARK Batched Panda Forward Kinematics and Jacobian
+
+Compares the NumPy kinematics against setting joints and reading link states in Bullet one by one.
+"""
+
+limits = np.array(PandaConverter().real_panda_limits)
+
+
+def best_of(function, repeat=3):
+    durations = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start_time)
+    return min(durations)
+
+
+sim = BulletSim(render_mode="rgb_array")
+robot = BulletPanda(sim)
+
+
+def bullet_poses(joint_angles):
+    for joint_values in joint_angles:
+        robot.set_joint_angles(joint_values)
+        robot.get_ee_position()
+        robot.get_ee_orientation()
+
+
+for n in [1, 100, 10_000, 1_000_000]:
+    joint_angles = np.random.uniform(limits[:, 0], limits[:, 1], (n, 7))
+    fk_time = best_of(lambda: ee_poses(joint_angles))
+    jacobian_time = best_of(lambda: jacobian(joint_angles), repeat=1 if n > 10_000 else 3)
+    line = f"N={n:>9,} | FK {fk_time * 1e3:9.2f} ms ({n / fk_time:12,.0f} poses/s)"
+    line += f" | Jacobian {jacobian_time * 1e3:9.2f} ms"
+    if n <= 10_000:
+        bullet_time = best_of(lambda: bullet_poses(joint_angles), repeat=1)
+        line += f" | Bullet {bullet_time * 1e3:9.2f} ms"
+    print(line)
+
+sim.close()
@@ -0,0 +1,131 @@
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Connection
+from typing import (
+    Dict,
+    List,
+)
+
+import numpy as np
+
+from roborl_navigator.policy import (
+    NumpyPolicy,
+    load_policy,
+)
+from roborl_navigator.policy.server import (
+    Address,
+    PolicyClient,
+    PolicyServer,
+    parse_address,
+)
+
+"""
+BENCHMARK Policy Server Dynamic Batching
+
+Runs a PolicyServer in its own process and 1 to 64 concurrent client threads, each sending single observations
+back to back. Reports client side throughput and p50/p99 latency next to the server side mean batch size and
+latency. Without a model an actor of the default TD3 architecture (400, 300) with random weights is served.
+
+    PYTHONPATH=. python -m test.benchmark.policy_server_benchmark
+    PYTHONPATH=. python -m test.benchmark.policy_server_benchmark --model models/TD3/model.zip --max-wait-ms 1
+"""
+
+OBSERVATION_SIZES = {"achieved_goal": 3, "desired_goal": 3, "obstacle_dist_vector": 3, "robot_pos": 7}
+
+
+def random_policy(seed: int = 0) -> NumpyPolicy:
+    rng = np.random.default_rng(seed)
+    layer_sizes = [sum(OBSERVATION_SIZES.values()), 400, 300, 7]
+    return NumpyPolicy(
+        kernels=[rng.normal(0, 1 / np.sqrt(n_in), (n_in, n_out)) for n_in, n_out in zip(layer_sizes, layer_sizes[1:])],
+        biases=[np.zeros(n_out) for n_out in layer_sizes[1:]],
+        observation_keys=list(OBSERVATION_SIZES),
+        observation_sizes=list(OBSERVATION_SIZES.values()),
+        action_low=-np.ones(7),
+        action_high=np.ones(7),
+    )
+
+
+def serve(model_path: str, address: Address, max_batch_size: int, max_wait: float, commands: Connection) -> None:
+    policy = load_policy(model_path) if model_path else random_policy()
+    with PolicyServer(policy, address, max_batch_size=max_batch_size, max_wait=max_wait) as server:
+        commands.send(server.address)
+        while True:
+            command = commands.recv()
+            if command == "stop":
+                break
+            commands.send(server.stats())
+            if command == "reset":
+                server.reset_stats()
+
+
+def run_clients(address: Address, n_clients: int, n_requests: int) -> Dict[str, float]:
+    rng = np.random.default_rng(n_clients)
+    latencies: List[np.ndarray] = []
+    barrier = threading.Barrier(n_clients + 1)
+
+    def client_loop():
+        observation = {key: rng.uniform(-1, 1, size).astype(np.float32) for key, size in OBSERVATION_SIZES.items()}
+        durations = np.empty(n_requests)
+        with PolicyClient(address) as client:
+            barrier.wait()
+            for i in range(n_requests):
+                start_time = time.perf_counter()
+                client.predict(observation)
+                durations[i] = time.perf_counter() - start_time
+        latencies.append(durations)
+
+    threads = [threading.Thread(target=client_loop) for _ in range(n_clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall_time = time.perf_counter() - start_time
+    all_latencies = np.concatenate(latencies) * 1000
+    return {
+        "requests_per_sec": len(all_latencies) / wall_time,
+        "p50": float(np.percentile(all_latencies, 50)),
+        "p99": float(np.percentile(all_latencies, 99)),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the policy server with concurrent clients.")
+    parser.add_argument("--model", help="model.zip saved by Trainer or its exported .npz actor")
+    parser.add_argument("--address", help="Unix socket path or host:port, a temporary Unix socket by default")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--requests", type=int, default=4000, help="Requests per client count, split over clients")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        server_address = parse_address(args.address) if args.address else os.path.join(directory, "policy.sock")
+        commands, server_commands = multiprocessing.Pipe()
+        server_process = multiprocessing.Process(
+            target=serve,
+            args=(args.model, server_address, args.max_batch_size, args.max_wait_ms / 1000, server_commands),
+        )
+        server_process.start()
+        server_address = commands.recv()
+
+        print(f"{'clients':>7} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'batch':>7} {'server p50':>11} {'p99':>8}")
+        for n_clients in args.clients:
+            commands.send("reset")
+            commands.recv()
+            client_stats = run_clients(server_address, n_clients, max(args.requests // n_clients, 10))
+            commands.send("stats")
+            server_stats = commands.recv()
+            print(
+                f"{n_clients:>7} {client_stats['requests_per_sec']:>10,.0f} {client_stats['p50']:>8.2f}"
+                f" {client_stats['p99']:>8.2f} {server_stats['mean_batch_size']:>7.1f}"
+                f" {server_stats['latency_ms']['p50']:>11.2f} {server_stats['latency_ms']['p99']:>8.2f}"
+            )
+        commands.send("stop")
+        server_process.join()
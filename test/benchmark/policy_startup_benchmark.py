@@ -0,0 +1,81 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+
+"""
+BENCHMARK Policy Time to First Action
+
+Starts fresh Python processes which load a policy and predict one action, and reports the time from process start
+to the first action. The NumPy path loads the memory mapped exported actor with load_policy, the Stable Baselines3
+path imports stable_baselines3 and runs TD3.load with the HER replay buffer class like the production scripts did.
+
+    PYTHONPATH=. python -m test.benchmark.policy_startup_benchmark
+    PYTHONPATH=. python -m test.benchmark.policy_startup_benchmark --model models/TD3/model.zip --sb3
+"""
+
+NUMPY_SCRIPT = """
+from roborl_navigator.policy import load_policy, process_uptime
+import numpy as np
+policy = load_policy({path!r})
+policy.predict({{key: np.zeros(size, dtype=np.float32) for key, size in zip(policy.observation_keys,
+                                                                          policy.observation_sizes)}})
+print(process_uptime())
+"""
+
+SB3_SCRIPT = """
+from stable_baselines3 import HerReplayBuffer, TD3
+from roborl_navigator.environment.env_panda_bullet import PandaBulletEnv
+from roborl_navigator.policy import process_uptime
+env = PandaBulletEnv(render_mode="rgb_array", orientation_task=False)
+model = TD3.load({path!r}, env=env, replay_buffer_class=HerReplayBuffer)
+model.predict(env.reset()[0])
+print(process_uptime())
+"""
+
+
+def time_to_first_action(script: str, runs: int) -> list:
+    times = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+        times.append(float(output.strip().splitlines()[-1]))
+    return times
+
+
+def create_random_actor(path: str) -> None:
+    import numpy as np
+    from roborl_navigator.policy import NumpyPolicy
+
+    rng = np.random.default_rng(0)
+    layer_sizes = [16, 400, 300, 7]
+    NumpyPolicy(
+        kernels=[rng.normal(0, 0.05, (n_in, n_out)) for n_in, n_out in zip(layer_sizes[:-1], layer_sizes[1:])],
+        biases=[np.zeros(n_out) for n_out in layer_sizes[1:]],
+        observation_keys=["achieved_goal", "desired_goal", "obstacle_dist_vector", "robot_pos"],
+        observation_sizes=[3, 3, 3, 7],
+        action_low=-np.ones(7),
+        action_high=np.ones(7),
+    ).save(path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the time from process start to the first policy action.")
+    parser.add_argument("--model", help="Saved model.zip or exported .npz actor, a random actor by default")
+    parser.add_argument("--sb3", action="store_true", help="Also time TD3.load of the model.zip")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    if args.sb3 and not (args.model or "").endswith(".zip"):
+        parser.error("--sb3 needs a saved model.zip")
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = args.model
+        if model_path is None:
+            model_path = directory + "/actor.npz"
+            create_random_actor(model_path)
+        runtimes = {"numpy": time_to_first_action(NUMPY_SCRIPT.format(path=model_path), args.runs)}
+        if args.sb3:
+            runtimes["sb3"] = time_to_first_action(SB3_SCRIPT.format(path=model_path), args.runs)
+
+    for name, times in runtimes.items():
+        print(f"{name:<6} time to first action: median {statistics.median(times):.2f} s, min {min(times):.2f} s")
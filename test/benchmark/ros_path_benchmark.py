@@ -0,0 +1,60 @@
+import time
+
+import numpy as np
+
+from roborl_navigator.simulation.bullet.bullet_ros import (
+    install_bullet_ros,
+    uninstall_bullet_ros,
+)
+
+"""
+BENCHMARK ROS Path on the Bullet Stand-in
+
+Runs ROSSim and ROSRobot on the Bullet backed MoveIt/Gazebo stand-in with latencies close to a local ROS
+setup, and measures the per-step cost of the actuation modes and of a Gazebo model update.
+"""
+
+latencies = {
+    "service_latency": 0.002,
+    "topic_latency": 0.0005,
+    "planning_latency": 0.03,
+    "execution_time_scale": 1.0,
+}
+install_bullet_ros(**latencies)
+from roborl_navigator.robot.ros_panda_robot import ROSRobot  # noqa: E402
+from roborl_navigator.simulation.ros.ros_sim import ROSSim  # noqa: E402
+
+sim = ROSSim()
+sim.create_scene()
+n_steps = 30
+
+start_time = time.perf_counter()
+sim.set_base_pose("target", np.array([0.5, 0.0, 0.1]), np.array([0.0, 0.0, 0.0, 1.0]))
+print(f"ROSSim.set_base_pose: {(time.perf_counter() - start_time) * 1000:7.1f} ms")
+
+for name, kwargs in [
+    ("plan + execute", {}),
+    ("direct joint goals", {"direct_joint_threshold": 0.1}),
+    ("streaming 250 Hz", {"streaming_rate": 250.0}),
+]:
+    robot = ROSRobot(sim, **kwargs)
+    robot.set_joint_neutral()
+    if robot.streamer is not None:
+        while not robot.streamer.reached():
+            time.sleep(0.001)
+    step_times = []
+    for _ in range(n_steps):
+        action = np.random.uniform(-1, 1, 7).astype(np.float32)
+        start_time = time.perf_counter()
+        robot.set_action(action)
+        robot.get_obs()
+        step_times.append((time.perf_counter() - start_time) * 1000)
+    if robot.streamer is not None:
+        robot.streamer.stop()
+    step_times = np.array(step_times)
+    print(
+        f"{name:20s} | step p50 {np.percentile(step_times, 50):7.1f} ms p99 {np.percentile(step_times, 99):7.1f} ms"
+        f" | last planning {robot.planning_time:6.1f} ms execution {robot.execution_time:6.1f} ms"
+    )
+
+uninstall_bullet_ros()
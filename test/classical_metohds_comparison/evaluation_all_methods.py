@@ -1,5 +1,3 @@
-import json
-
 import gymnasium as gym
 import numpy as np
 import time
@@ -10,9 +8,13 @@ from stable_baselines3 import (
 )
 from production.ros_controller import ROSController
 import roborl_navigator.environment
+from roborl_navigator.utils import (
+    ResultsStore,
+    duration_stats,
+)
 
 
-save_path = '/assets/evaluation_results/performance_results_of_rl_rrt_prm.json'
+save_path = '/assets/evaluation_results/performance_results_of_rl_rrt_prm.jsonl'
 env = gym.make("RoboRL-Navigator-Panda-ROS", orientation_task=False, distance_threshold=0.08)
 m_path = '/models/roborl-navigator/TD3_Bullet_0.05_Threshold_200K/model.zip'
 model = TD3.load(m_path, env=env, replay_buffer_class=HerReplayBuffer)
@@ -21,12 +23,12 @@ ros_controller = ROSController()
 observation = model.env.reset()
 model.predict(observation)  # to initialize
 
-results = {}
+store = ResultsStore(save_path)  # resumes after the last flushed episode of an interrupted run
 planner_iteration = 50
 
-for episode in range(100):
+for episode in range(store.next_episode(), 100):
     print(f"Episode: {episode}")
-    results[episode] = {'rl': {}}
+    rl_result = {}
     pass_episode = False
 
     target_position = observation["desired_goal"][:3][0]
@@ -34,27 +36,38 @@ for episode in range(100):
     pose = ros_controller.create_pose(target_position)
 
     for planner in ['rrt', 'prm']:
-        planner_min = 1000
-        planner_max = 0
         planner_all = []
         for _ in range(planner_iteration):
             duration = ros_controller.get_pose_goal_plan_with_duration(pose, planner)[1]
             if duration < 500:
                 planner_all.append(duration)
-                planner_min = min(planner_min, duration)
-                planner_max = min(planner_max, duration)
             else:
                 pass_episode = True
                 break
         if pass_episode:
             break
-        planner_mean = np.mean(np.array(planner_all))
-        results[episode][planner] = {
-            "min": planner_min,
-            "max": planner_max,
-            "mean": planner_mean,
-            "all": planner_all,
-        }
+        store.add(episode, planner, **duration_stats(planner_all))
+
+    ik_all = []
+    ik_failures = 0
+    for _ in range(0 if pass_episode else planner_iteration):
+        plan, duration = ros_controller.get_pose_goal_plan_with_duration(pose, 'ik')
+        if plan[0]:
+            ik_all.append(duration)
+        else:
+            ik_failures += 1
+    if ik_all:
+        store.add(episode, 'ik', **duration_stats(ik_all), failures=ik_failures)
+
+    portfolio_all = []
+    portfolio_winners = []
+    for _ in range(0 if pass_episode else planner_iteration):
+        plan, duration, info = ros_controller.get_pose_goal_plan_portfolio(pose, mode="first", deadline=0.5)
+        if plan is not None:
+            portfolio_all.append(duration)
+            portfolio_winners.append(info["planner"])
+    if portfolio_all:
+        store.add(episode, 'portfolio', **duration_stats(portfolio_all), winners=portfolio_winners)
 
     rl_episode_total = 0.0
     for _ in range(50):  # 50 is episode timeout limit
@@ -69,14 +82,17 @@ for episode in range(100):
         success = info[0].get('is_success', False)
         if terminated or success:
             print(f"RL Total Training Time of Episode: {rl_episode_total}")
-            results[episode]['rl']['total'] = rl_episode_total
-            results[episode]['rl']['steps'] = _
+            rl_result = {"total": rl_episode_total, "steps": _}
             time.sleep(3)
             break
+    store.add(episode, 'rl', **rl_result)
+    store.flush()  # one append per episode, records of finished episodes survive a crash
     observation = model.env.reset()
-    with open(save_path, "w") as json_file:
-        json.dump(results, json_file)
 
 print("\n\n\n")
-print(results)
+for method in ['rrt', 'prm', 'ik', 'portfolio']:
+    means = store.to_arrays(method, ["mean"])["mean"]
+    if len(means):
+        print(f"{method}: {len(means)} episodes, mean {means.mean():.1f} ms")
+print(ros_controller.get_planner_portfolio().summary())
 print("\n\n\n")
@@ -0,0 +1,77 @@
+import numpy as np
+import time
+
+from stable_baselines3 import (
+    HerReplayBuffer,
+    TD3,
+)
+from production.ros_controller import ROSController
+from roborl_navigator.environment.env_panda_ros import PandaROSEnv
+from roborl_navigator.environment.plan_ahead import PolicyRollout
+from roborl_navigator.utils import ResultsStore
+
+"""
+Compare end-to-end reach latency of step by step execution (one MoveIt plan + execution per policy step)
+against plan-ahead execution (policy rolled out in Bullet, executed as a single trajectory).
+"""
+
+save_path = '/assets/evaluation_results/performance_results_of_rl_plan_ahead.jsonl'
+env = PandaROSEnv(orientation_task=False, distance_threshold=0.05)
+m_path = '/models/roborl-navigator/TD3_Bullet_0.05_Threshold_200K/model.zip'
+model = TD3.load(m_path, env=env, replay_buffer_class=HerReplayBuffer)
+rollout = PolicyRollout(model, orientation_task=False, distance_threshold=0.05)
+ros_controller = ROSController()
+
+observation, _ = env.reset()
+model.predict(observation)  # to initialize
+
+store = ResultsStore(save_path)  # resumes after the last flushed episode of an interrupted run
+
+for episode in range(store.next_episode(), 100):
+    print(f"Episode: {episode}")
+    goal = env.task.get_goal()
+    ros_controller.set_target_pose(goal[:3], np.array([0.0, 0.0, 0.0, 1.0]))
+
+    # Step by step execution
+    start_time = time.time()
+    planning_total = 0.0
+    execution_total = 0.0
+    for step in range(50):  # 50 is episode timeout limit
+        action = model.predict(observation, deterministic=True)[0]
+        observation, reward, terminated, truncated, info = env.step(action)
+        planning_total += info["planning_time"]
+        execution_total += info["execution_time"]
+        if terminated or truncated:
+            break
+    store.add(
+        episode,
+        'step_by_step',
+        total=round((time.time() - start_time) * 1000),
+        planning=round(planning_total),
+        execution=round(execution_total),
+        steps=step + 1,
+        success=bool(info["is_success"]),
+    )
+
+    # Plan-ahead execution from the same start pose
+    env.robot.set_joint_neutral()
+    start_time = time.time()
+    observation, reward, terminated, truncated, info = env.plan_ahead_step(rollout)
+    store.add(
+        episode,
+        'plan_ahead',
+        total=round((time.time() - start_time) * 1000),
+        planning=round(info["planning_time"]),
+        execution=round(info["execution_time"]),
+        steps=info["steps"],
+        success=bool(info["is_success"]),
+    )
+    store.flush()
+
+    observation, _ = env.reset()
+
+for mode in ['step_by_step', 'plan_ahead']:
+    columns = store.to_arrays(mode, ["total", "success"])
+    totals, successes = columns["total"], columns["success"]
+    print(f"{mode}: mean {totals.mean():.0f} ms, median {np.median(totals):.0f} ms")
+    print(f"{mode}: success rate {successes.mean():.2f}")
@@ -1,17 +1,19 @@
-import gymnasium as gym
-
 from stable_baselines3 import (
     DDPG,
     HerReplayBuffer,
     SAC,
     TD3,
 )
-from train.trainer import Trainer
+from train.trainer import (
+    Trainer,
+    make_vec_env,
+)
 import roborl_navigator.environment
 
-env = gym.make(
-    "RoboRL-Navigator-Panda-Bullet",
-    render_mode="human",
+env = make_vec_env(
+    n_envs=4,
+    seed=0,
+    render_mode="rgb_array",
     orientation_task=False,
     distance_threshold=0.05,
     goal_range=0.2,
@@ -0,0 +1,62 @@
+import time
+from typing import (
+    Dict,
+    List,
+)
+
+import numpy as np
+from stable_baselines3.common.callbacks import BaseCallback
+
+
+class PerfLoggerCallback(BaseCallback):
+    """Records env phase timings and throughput as perf/* keys of the model logger.
+
+    Phase statistics come from BaseEnv.get_perf_stats of every training env and are averaged over the envs,
+    they are only present while profiling is enabled. The values are refreshed every log_interval env steps and
+    written out by the logger with the next dump.
+
+    Args:
+        log_interval (int): Env steps between two refreshes.
+    """
+
+    def __init__(self, log_interval: int = 1000, verbose: int = 0) -> None:
+        super().__init__(verbose)
+        self.log_interval = log_interval
+        self._last_time = 0.0
+        self._last_timesteps = 0
+        self._last_updates = 0
+
+    def _on_training_start(self) -> None:
+        self._last_time = time.perf_counter()
+        self._last_timesteps = self.num_timesteps
+        self._last_updates = getattr(self.model, "_n_updates", 0)
+
+    def _on_step(self) -> bool:
+        if self.num_timesteps - self._last_timesteps >= self.log_interval:
+            self.record_perf()
+        return True
+
+    def record_perf(self) -> None:
+        now = time.perf_counter()
+        elapsed = max(now - self._last_time, 1e-9)
+        n_updates = getattr(self.model, "_n_updates", 0)
+        self.logger.record("perf/env_steps_per_sec", (self.num_timesteps - self._last_timesteps) / elapsed)
+        self.logger.record("perf/gradient_steps_per_sec", (n_updates - self._last_updates) / elapsed)
+        self._last_time, self._last_timesteps, self._last_updates = now, self.num_timesteps, n_updates
+
+        for phase, stats in self.merge_stats(self.training_env.env_method("get_perf_stats")).items():
+            for name, value in stats.items():
+                self.logger.record(f"perf/{phase}_{name}_ms", value)
+
+    @staticmethod
+    def merge_stats(env_stats: List[Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, float]]:
+        """Averages the per env phase statistics, sample counts are left out."""
+        merged = {}
+        for stats in env_stats:
+            for phase, values in stats.items():
+                for name, value in values.items():
+                    if name != "count":
+                        merged.setdefault(phase, {}).setdefault(name, []).append(value)
+        return {
+            phase: {name: float(np.mean(values)) for name, values in stats.items()} for phase, stats in merged.items()
+        }
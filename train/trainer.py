@@ -1,22 +1,54 @@
 from typing import (
+    Any,
     Optional,
     TypeVar,
 )
 
 from stable_baselines3.common.base_class import BaseAlgorithm
 from stable_baselines3.common.logger import configure
+from stable_baselines3.common.monitor import Monitor
+from stable_baselines3.common.vec_env import (
+    DummyVecEnv,
+    SubprocVecEnv,
+    VecEnv,
+)
 
+from train.perf_callback import PerfLoggerCallback
 from roborl_navigator.utils import (
     create_directory_if_not_exists,
     get_model_directory,
 )
+from roborl_navigator.environment.vector_env import make_env_fns
 
 ModelType = TypeVar('ModelType', bound=BaseAlgorithm)
 
 
+def make_vec_env(
+    n_envs: int = 1,
+    seed: Optional[int] = None,
+    env_id: str = "RoboRL-Navigator-Panda-Bullet",
+    subprocess: bool = True,
+    **env_kwargs: Any,
+) -> VecEnv:
+    """Training vector env of n_envs monitored environments, each seeded with its own SeedSequence spawned stream.
+
+    SB3 resets its envs with the seeds of VecEnv.seed, which are seed + index and None otherwise, so the envs are left
+    unseeded there and continue the streams make_env_fns seeded them with.
+    """
+    env_fns = make_env_fns(n_envs, seed, env_id, wrapper=Monitor, **env_kwargs)
+    return SubprocVecEnv(env_fns) if subprocess and n_envs > 1 else DummyVecEnv(env_fns)
+
+
 class Trainer:
 
-    def __init__(self, model: ModelType, target_step: int = 5_000, directory_path: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        model: ModelType,
+        target_step: int = 5_000,
+        directory_path: Optional[str] = None,
+        profile: bool = False,
+        perf_log_interval: int = 1000,
+    ) -> None:
         self.model = model
         if not directory_path:
             directory_path = get_model_directory()
@@ -29,10 +61,15 @@ class Trainer:
         self.logger = configure(self.log_path, ["stdout", "csv", "tensorboard"])
         self.model.set_logger(self.logger)
 
+        # perf/* throughput is always logged, per phase env timings only when profiling
+        self.model.get_env().env_method("set_profiling", profile)
+        self.perf_callback = PerfLoggerCallback(log_interval=perf_log_interval)
+
     def train(self) -> None:
         self.model.learn(
             total_timesteps=int(self.target_training_step),
             log_interval=10,  # episode number
+            callback=self.perf_callback,
         )
         self.model.save(self.save_directory + '/model')
         self.model.save_replay_buffer(self.save_directory + '/replay_buffer')